@@ -1,25 +1,100 @@
 """Ponto de entrada da aplicacao FastAPI."""
+import time
+
+# Marco zero da medição de startup (antes dos imports pesados abaixo)
+_INICIO = time.perf_counter()
+
+import asyncio
+import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
 
 # VOLTE A USAR 'from app.'
 from app.config import get_settings
-from database import engine, create_tables
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from database import dispose_engines, get_db, ping, pool_status, replicas, schema_version, warm_pools
 from app.schemas import HealthResponse, MessageResponse
-from app.routes import turmas, alunos, disciplinas, professores, tarefas, auth
+from app.routes import turmas, alunos, disciplinas, professores, tarefas, resumos, auth
+from app.metrics import MetricsMiddleware, metrics
+from app.profiler import QueryProfilerMiddleware
+from app.replicas import ReplicaRoutingMiddleware
+from app.reference_cache import CONJUNTOS, reference_cache
+from auth import password_executor, principal_cache
+from migrate import upgrade as aplicar_migrations
+from migrations import versao_mais_recente
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Segundos gastos em cada fase do startup deste worker (também no /metrics)
+inicializacao: dict[str, float] = {}
+
+async def _verificar_schema() -> None:
+    """
+    Confere a versão do schema com uma única query, em vez de inspecionar
+    todas as tabelas a cada boot. As migrations rodam à parte, com
+    `python migrate.py`: banco atrasado impede o start, a não ser com
+    AUTO_MIGRATE=true (banco local), que aplica as pendentes aqui.
+    """
+    versao = await schema_version()
+    esperada = versao_mais_recente()
+    if versao >= esperada:
+        print(f"✅ Schema na versão {versao}")
+        return
+    if not settings.auto_migrate:
+        raise RuntimeError(f"Banco na versão {versao}, o código espera a {esperada}: rode `python migrate.py`")
+    print(f"⏫ Banco na versão {versao}, o código espera a {esperada}: aplicando migrations (AUTO_MIGRATE)")
+    versao = await run_in_threadpool(aplicar_migrations)
+    if versao < esperada:
+        raise RuntimeError(f"Migrations pararam na versão {versao}, o código espera a {esperada}")
+    print(f"✅ Schema na versão {versao}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gerencia o ciclo de vida da aplicacao."""
     print("🚀 Iniciando aplicacao...")
-    create_tables()
-    print("✅ Tabelas criadas/verificadas")
+    marco = time.perf_counter()
+    inicializacao["importacao"] = marco - _INICIO
+
+    def fase(nome: str) -> None:
+        nonlocal marco
+        agora = time.perf_counter()
+        inicializacao[nome] = agora - marco
+        marco = agora
+
+    await _verificar_schema()
+    fase("schema")
+    vigia = None
+    if replicas:
+        # Primeira medição antes de aceitar requisições; depois, periódica
+        await replicas.verificar(settings.db_replica_check_seconds)
+        vigia = asyncio.create_task(replicas.vigiar(settings.db_replica_check_seconds))
+        print(f"✅ Réplicas de leitura: {sum(r.saudavel for r in replicas.replicas)}/{len(replicas.replicas)} saudáveis")
+        fase("replicas")
+    aquecidas = await warm_pools()
+    if aquecidas:
+        print(f"✅ Pools aquecidos: {aquecidas}")
+    fase("pool")
+    # Confere em segundo plano se outro worker alterou dados de referência
+    poller = asyncio.create_task(reference_cache.poll(settings.reference_cache_poll_seconds))
+
+    inicializacao["total"] = time.perf_counter() - _INICIO
+    detalhes = ", ".join(f"{nome} {segundos * 1000:.0f} ms" for nome, segundos in inicializacao.items() if nome != "total")
+    print(f"⏱️  Pronto em {inicializacao['total'] * 1000:.0f} ms ({detalhes})")
+    if inicializacao["total"] > settings.startup_budget_seconds:
+        logger.warning(
+            "Startup levou %.2fs, acima do orçamento de %.2fs (STARTUP_BUDGET_SECONDS)",
+            inicializacao["total"], settings.startup_budget_seconds,
+        )
     yield
     print("👋 Encerrando aplicacao...")
+    poller.cancel()
+    if vigia is not None:
+        vigia.cancel()
+    await dispose_engines()
+    password_executor.shutdown(wait=False, cancel_futures=True)
 
 app = FastAPI(
     title=settings.api_title,
@@ -37,14 +112,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "X-DB-Query-Count", "X-DB-Time"],
 )
 
+# Mede todas as requisições (incluindo as respostas do CORS)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+# GETs em réplicas; escritas (e leituras logo após uma escrita) no primário
+if replicas:
+    app.add_middleware(
+        ReplicaRoutingMiddleware,
+        janela=settings.db_replica_max_lag_seconds + settings.db_replica_check_seconds,
+    )
+# Adicionado por último = mais externo: abre o acumulador de queries que as
+# métricas também usam
+app.add_middleware(QueryProfilerMiddleware)
+
 # Registrar rotas
 app.include_router(turmas.router, prefix="/api/v1")
 app.include_router(alunos.router, prefix="/api/v1")
 app.include_router(disciplinas.router, prefix="/api/v1")
 app.include_router(professores.router, prefix="/api/v1")
 app.include_router(tarefas.router, prefix="/api/v1")
+app.include_router(resumos.router, prefix="/api/v1")
 app.include_router(auth.router, prefix="/api/v1")
 
 @app.get("/", response_model=MessageResponse, tags=["Root"])
@@ -56,21 +146,62 @@ def root():
     }
 
 @app.get("/health", response_model=HealthResponse, tags=["Health"])
-def health_check():
+async def health_check():
     """Verifica saude da API e conexao com o banco."""
     try:
         # Testa conexao com o banco
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        await ping()
         return {"status": "ok", "database": "connected", "environment": settings.app_env}
     except Exception as e:
         return {"status": "error", "database": str(e), "environment": settings.app_env}
     
 
 
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+def prometheus_metrics():
+    """Métricas deste worker no formato texto do Prometheus."""
+    pools = pool_status()
+    gauges = {
+        f"db_pool_{campo}": (ajuda, {(("pool", nome),): estado.get(campo, 0) for nome, estado in pools.items()})
+        for campo, ajuda in (
+            ("checked_out", "Conexões do pool em uso."),
+            ("checked_in", "Conexões ociosas no pool."),
+            ("overflow", "Conexões além do pool_size abertas agora."),
+            ("waiting", "Requisições esperando uma conexão livre."),
+        )
+    }
+    gauges["app_startup_seconds"] = (
+        "Duração de cada fase do startup deste worker.",
+        {(("fase", nome),): segundos for nome, segundos in inicializacao.items()},
+    )
+    return Response(metrics.render(gauges), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.post("/admin/seeds", tags=["Admin"])
-def run_seeds():
+async def run_seeds(db: AsyncSession = Depends(get_db)):
     """Endpoint para executar seeds (apenas desenvolvimento)."""
     from seeds import main as run_seeds_main
-    run_seeds_main()
-    return {"message": "Seeds executados com sucesso"}
\ No newline at end of file
+    await run_in_threadpool(run_seeds_main)
+    principal_cache.clear()
+    versoes = await reference_cache.bump(db, *CONJUNTOS)
+    await db.commit()
+    reference_cache.invalidate(versoes)
+    return {"message": "Seeds executados com sucesso"}
+
+
+@app.get("/admin/cache", tags=["Admin"])
+def cache_stats():
+    """Estatísticas dos caches em memória deste worker."""
+    return {"principals": principal_cache.stats(), "referencia": reference_cache.stats()}
+
+
+@app.get("/admin/pool", tags=["Admin"])
+def pool_stats():
+    """Conexões em uso, overflow e esperas dos pools do banco neste worker."""
+    return pool_status()
+
+
+@app.get("/admin/replicas", tags=["Admin"])
+def replicas_status():
+    """Saúde e atraso das réplicas de leitura, e leituras desviadas para o primário."""
+    return replicas.status()
@@ -0,0 +1,69 @@
+"""GETs condicionais (ETag / Last-Modified) a partir das colunas de atualização."""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+
+
+def make_etag(*partes) -> str:
+    """ETag fraco derivado dos validadores (ex: id + atualizada_em)."""
+    digest = hashlib.blake2b("|".join(map(str, partes)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _http_date(valor: datetime) -> str:
+    if valor.tzinfo is None:
+        valor = valor.replace(tzinfo=timezone.utc)
+    return format_datetime(valor.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_confere(if_none_match: str, etag: str) -> bool:
+    # Comparação fraca (RFC 9110): ignora o prefixo W/
+    if if_none_match.strip() == "*":
+        return True
+    opaco = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaco for tag in if_none_match.split(","))
+
+
+def _nao_modificado_desde(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        desde = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # Last-Modified tem resolução de segundos
+    return last_modified.replace(microsecond=0) <= desde
+
+
+def not_modified(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: datetime | None = None,
+) -> Response | None:
+    """
+    Responde 304 se o cliente já tem a versão atual.
+
+    Retorna a resposta 304 (sem corpo) quando `If-None-Match` confere com o
+    ETag ou, na ausência dele, quando `If-Modified-Since` não é anterior a
+    `last_modified`. Caso contrário coloca ETag/Last-Modified em `response`
+    e retorna None, para a rota seguir com a resposta normal.
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        fresco = _etag_confere(if_none_match, etag)
+    elif if_modified_since and last_modified is not None:
+        fresco = _nao_modificado_desde(if_modified_since, last_modified)
+    else:
+        fresco = False
+
+    if fresco:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -13,6 +13,41 @@ class Settings(BaseSettings):
 
     # Banco de Dados
     database_url: str = "postgresql://postgres:postgres123@db:5432/gestao_tarefas_db"
+    # Modo assíncrono: rotas usam AsyncEngine (asyncpg) em vez do threadpool
+    db_async: bool = False
+    # Opcional; se vazio, é derivada de database_url trocando o driver
+    async_database_url: str | None = None
+    # Pool de conexões (por engine e por worker). O total de conexões abertas
+    # chega a workers x (db_pool_size + db_max_overflow): mantenha abaixo do
+    # max_connections do Postgres
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # Segundos esperando uma conexão livre antes de falhar
+    db_pool_timeout: float = 30.0
+    # Recicla conexões mais velhas que isso (segundos; -1 desativa)
+    db_pool_recycle: int = 1800
+    # Testa a conexão a cada checkout (um round-trip a mais por requisição)
+    db_pool_pre_ping: bool = True
+    # Profiler de SQL: queries acima disso vão para o log (ms; 0 desativa)
+    db_slow_query_ms: float = 200.0
+    # Mesma query repetida mais vezes que isso numa requisição = N+1 (0 desativa)
+    db_n_plus_one_threshold: int = 20
+    # Headers X-DB-Query-Count / X-DB-Time nas respostas
+    db_profile_headers: bool = False
+    # Réplicas de leitura, separadas por vírgula (vazio = tudo no primário).
+    # Requisições GET/HEAD leem delas; escritas usam o primário
+    database_replica_urls: str = ""
+    # Réplica mais atrasada que isso (segundos) sai do rodízio; é também o
+    # tempo, somado ao intervalo abaixo, em que o cliente lê do primário
+    # depois de uma escrita
+    db_replica_max_lag_seconds: float = 5.0
+    # Intervalo (e timeout) das verificações de saúde e atraso das réplicas
+    db_replica_check_seconds: float = 5.0
+    # Conexões abertas em cada pool no startup, antes da primeira requisição
+    # (limitado a db_pool_size; 0 desativa)
+    db_pool_prewarm: int = 2
+    # Imprime todo SQL executado (só para depuração local; lento sob carga)
+    db_echo: bool = False
     
     # Aplicação
     app_env: str = "development"
@@ -24,14 +59,66 @@ class Settings(BaseSettings):
     api_description: str = "API REST para gestão de tarefas, alunos, turmas e disciplinas"
     api_version: str = "1.0.0"
     
+    # Limite de itens por requisição nas rotas em lote
+    bulk_max_items: int = 1000
+    # Linhas buscadas por vez do cursor do servidor nas exportações
+    export_chunk_size: int = 2000
+    
     # JWT / Auth
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    # Executor dedicado ao bcrypt (hash/verificação de senha)
+    password_hash_workers: int = 4
+    # Jobs aguardando além dos workers; acima disso o login responde 503
+    password_hash_queue_limit: int = 32
+    # Cache dos alunos autenticados (evita uma query por requisição). O worker
+    # que altera um aluno o tira do cache na hora; nos outros a cópia antiga
+    # vale até o TTL, então mantenha-o curto
+    principal_cache_size: int = 10_000
+    principal_cache_ttl_seconds: float = 5.0
+    # Intervalo com que cada worker confere as versões do cache de referência
+    # (turmas, disciplinas, professores); é o atraso máximo entre workers
+    reference_cache_poll_seconds: float = 2.0
+    # Busca textual: no máximo estas tarefas que casam com o termo (as mais
+    # recentes) são ordenadas por relevância (limita o custo de termos comuns)
+    search_max_candidates: int = 10_000
+    # Métricas do Prometheus em GET /metrics (latência, tamanho, queries por rota)
+    metrics_enabled: bool = True
+    # Startup mais lento que isso (segundos, do import da app até aceitar
+    # requisições) gera um aviso no log
+    startup_budget_seconds: float = 3.0
+    # Aplica as migrations pendentes no startup em vez de recusar subir.
+    # Só para um banco local descartável: em deploy, rode `python migrate.py`
+    # uma vez, antes dos workers
+    auto_migrate: bool = False
     
     @property
     def is_development(self) -> bool:
         return self.app_env == "development"
 
+    @property
+    def async_url(self) -> str:
+        if self.async_database_url:
+            return self.async_database_url
+        return _async_driver(self.database_url)
+
+    @property
+    def replica_urls(self) -> list[str]:
+        """URLs das réplicas no driver do modo atual (síncrono ou assíncrono)."""
+        urls = [url.strip() for url in self.database_replica_urls.split(",") if url.strip()]
+        return [_async_driver(url) for url in urls] if self.db_async else urls
+
+def _async_driver(url: str) -> str:
+    """Mesma URL com o driver assíncrono correspondente."""
+    for sync_prefix, async_prefix in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
 @lru_cache
 def get_settings() -> Settings:
     return Settings()
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""Escritas de uma linha em uma única ida ao banco."""
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import Column, Row, delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def response_columns(modelo, schema: type[BaseModel]) -> list[Column]:
+    """Colunas da tabela expostas no schema de resposta (para RETURNING/projeções)."""
+    return [modelo.__table__.c[nome] for nome in schema.model_fields]
+
+
+async def update_returning(
+    db: AsyncSession,
+    modelo,
+    item_id: UUID,
+    valores: dict,
+    colunas: list[Column],
+) -> Row | None:
+    """
+    Atualiza a linha `item_id` com um único UPDATE ... RETURNING.
+
+    Retorna a linha já atualizada (com os defaults/onupdate do banco) ou None
+    se o id não existe. Sem valores a alterar, faz só o SELECT, para não
+    mexer na coluna de atualização.
+    """
+    if valores:
+        stmt = (
+            update(modelo)
+            .where(modelo.id == item_id)
+            .values(**valores)
+            .returning(*colunas)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        stmt = select(*colunas).where(modelo.id == item_id)
+    return (await db.execute(stmt)).first()
+
+
+async def delete_returning(db: AsyncSession, modelo, item_id: UUID, coluna: Column | None = None) -> Any | None:
+    """
+    Remove a linha `item_id` com um único DELETE ... RETURNING id.
+
+    Dependentes são tratados pelas regras ON DELETE das FKs, no banco, sem
+    carregar objetos. Retorna o id (ou o valor de `coluna` na linha removida)
+    ou None se o id não existe.
+    """
+    stmt = (
+        delete(modelo)
+        .where(modelo.id == item_id)
+        .returning(modelo.id if coluna is None else coluna)
+        .execution_options(synchronize_session=False)
+    )
+    return (await db.execute(stmt)).scalar()
@@ -0,0 +1,58 @@
+"""Formato das respostas: campos parciais (`?fields=`) e expansões (`?expand=`)."""
+from fastapi import HTTPException, Query
+from sqlalchemy import Column
+
+FIELDS_QUERY = Query(
+    None,
+    description="Campos a retornar, separados por vírgula (ex: id,titulo,status). O id sempre vem.",
+)
+
+
+def expand_query(permitidas) -> Query:
+    return Query(None, description=f"Relacionamentos a incluir, separados por vírgula: {','.join(permitidas)}")
+
+
+def parse_expand(expand: str | None, permitidas) -> list[str]:
+    """
+    Relacionamentos pedidos em `expand`.
+
+    Raises:
+        HTTPException: 400 se algum relacionamento não puder ser expandido
+    """
+    if not expand:
+        return []
+    pedidas = [nome.strip() for nome in expand.split(",") if nome.strip()]
+    invalidas = set(pedidas) - set(permitidas)
+    if invalidas:
+        raise HTTPException(status_code=400, detail=f"Expansões inválidas: {', '.join(sorted(invalidas))}")
+    return [nome for nome in permitidas if nome in pedidas]
+
+
+def parse_fields(fields: str | None, colunas: list[Column]) -> list[str] | None:
+    """
+    Nomes dos campos pedidos em `fields`, na ordem do schema.
+
+    Retorna None quando o parâmetro não foi enviado (todos os campos).
+
+    Raises:
+        HTTPException: 400 se algum campo não existir no schema
+    """
+    if not fields:
+        return None
+    pedidos = {campo.strip() for campo in fields.split(",") if campo.strip()}
+    invalidos = pedidos - {coluna.name for coluna in colunas}
+    if invalidos:
+        raise HTTPException(status_code=400, detail=f"Campos inválidos: {', '.join(sorted(invalidos))}")
+    pedidos.add("id")
+    return [coluna.name for coluna in colunas if coluna.name in pedidos]
+
+
+def project(colunas: list[Column], campos: list[str] | None, *internas: Column) -> list[Column]:
+    """
+    Colunas do SELECT: as pedidas mais as que a rota usa internamente
+    (ordenação do cursor, ETag). As internas não pedidas são removidas da
+    resposta pelo serializador.
+    """
+    selecionadas = colunas if campos is None else [coluna for coluna in colunas if coluna.name in campos]
+    nomes = {coluna.name for coluna in selecionadas}
+    return selecionadas + [coluna for coluna in internas if coluna.name not in nomes]
@@ -0,0 +1,182 @@
+"""
+Métricas no formato texto do Prometheus (`GET /metrics`).
+
+Tudo é atualizado no fim de cada requisição, na thread do event loop, então
+os contadores são inteiros/floats simples, sem locks. Quantidade e tempo das
+queries SQL vêm do acumulador da requisição do profiler (`app.profiler`).
+"""
+import bisect
+import time
+from collections import defaultdict
+
+from app.profiler import ConsultasRequisicao, request_queries
+
+# Limites superiores dos buckets dos histogramas
+LATENCIA_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TAMANHO_BUCKETS = (256, 1_024, 4_096, 16_384, 65_536, 262_144, 1_048_576, 4_194_304)
+CONSULTAS_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+# Requisições que não casaram com nenhuma rota ficam num rótulo só, para
+# que URLs arbitrárias não criem séries novas
+SEM_ROTA = "<unmatched>"
+
+
+class _Histograma:
+    __slots__ = ("buckets", "contagens", "soma", "total")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # Um a mais para o +Inf; acumulados só na exposição
+        self.contagens = [0] * (len(buckets) + 1)
+        self.soma = 0.0
+        self.total = 0
+
+    def observe(self, valor: float) -> None:
+        self.contagens[bisect.bisect_left(self.buckets, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+
+class Metrics:
+    """Registro das métricas HTTP e SQL deste worker."""
+
+    def __init__(self):
+        self.em_andamento = 0
+        # (método, rota, status) -> quantidade
+        self.requisicoes: dict[tuple[str, str, str], int] = defaultdict(int)
+        # (método, rota) -> histograma
+        self.latencia = defaultdict(lambda: _Histograma(LATENCIA_BUCKETS))
+        self.tamanho = defaultdict(lambda: _Histograma(TAMANHO_BUCKETS))
+        self.consultas = defaultdict(lambda: _Histograma(CONSULTAS_BUCKETS))
+        self.sql_segundos: dict[tuple[str, str], float] = defaultdict(float)
+
+    def observe(
+        self,
+        metodo: str,
+        rota: str,
+        status: int,
+        segundos: float,
+        tamanho: int,
+        consultas: ConsultasRequisicao,
+    ) -> None:
+        chave = (metodo, rota)
+        self.requisicoes[(metodo, rota, str(status))] += 1
+        self.latencia[chave].observe(segundos)
+        self.tamanho[chave].observe(tamanho)
+        self.consultas[chave].observe(consultas.quantidade)
+        self.sql_segundos[chave] += consultas.segundos
+
+    def render(self, gauges: dict[str, tuple[str, dict[tuple, float]]] | None = None) -> str:
+        """
+        Texto no formato de exposição do Prometheus.
+
+        `gauges` acrescenta valores lidos na hora (nome -> (ajuda, {rótulos: valor})),
+        com os rótulos como tuplas de pares (nome, valor).
+        """
+        linhas = [
+            "# HELP http_requests_in_progress Requisições sendo atendidas agora.",
+            "# TYPE http_requests_in_progress gauge",
+            f"http_requests_in_progress {self.em_andamento}",
+            "# HELP http_requests_total Requisições atendidas.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (metodo, rota, status), quantidade in sorted(self.requisicoes.items()):
+            linhas.append(f"http_requests_total{_rotulos(method=metodo, route=rota, status=status)} {quantidade}")
+
+        _histogramas(linhas, "http_request_duration_seconds", "Duração das requisições.", self.latencia)
+        _histogramas(linhas, "http_response_size_bytes", "Tamanho do corpo das respostas.", self.tamanho)
+        _histogramas(linhas, "db_statements_per_request", "Queries SQL por requisição.", self.consultas)
+
+        linhas += [
+            "# HELP db_statement_duration_seconds_total Tempo gasto em queries SQL.",
+            "# TYPE db_statement_duration_seconds_total counter",
+        ]
+        for (metodo, rota), segundos in sorted(self.sql_segundos.items()):
+            linhas.append(f"db_statement_duration_seconds_total{_rotulos(method=metodo, route=rota)} {segundos:.6f}")
+
+        for nome, (ajuda, valores) in (gauges or {}).items():
+            linhas += [f"# HELP {nome} {ajuda}", f"# TYPE {nome} gauge"]
+            for rotulos, valor in valores.items():
+                linhas.append(f"{nome}{_rotulos(**dict(rotulos))} {valor}")
+        return "\n".join(linhas) + "\n"
+
+
+def _escape(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _rotulos(**rotulos: str) -> str:
+    if not rotulos:
+        return ""
+    return "{" + ",".join(f'{nome}="{_escape(str(valor))}"' for nome, valor in rotulos.items()) + "}"
+
+
+def _histogramas(linhas: list[str], nome: str, ajuda: str, series: dict) -> None:
+    linhas += [f"# HELP {nome} {ajuda}", f"# TYPE {nome} histogram"]
+    for (metodo, rota), hist in sorted(series.items()):
+        acumulado = 0
+        for limite, contagem in zip((*hist.buckets, "+Inf"), hist.contagens):
+            acumulado += contagem
+            linhas.append(f"{nome}_bucket{_rotulos(method=metodo, route=rota, le=limite)} {acumulado}")
+        linhas.append(f"{nome}_sum{_rotulos(method=metodo, route=rota)} {hist.soma:.6f}")
+        linhas.append(f"{nome}_count{_rotulos(method=metodo, route=rota)} {hist.total}")
+
+
+metrics = Metrics()
+
+
+def route_template(scope) -> str:
+    """Caminho da rota casada com a requisição (ex: /api/v1/tarefas/{tarefa_id})."""
+    rota = scope.get("route")
+    if rota is None:
+        return SEM_ROTA
+    # Com routers incluídos, o FastAPI guarda a rota original (sem o prefixo)
+    # em scope["route"] e o caminho completo no contexto efetivo
+    efetiva = scope.get("fastapi", {}).get("effective_route_context")
+    return getattr(efetiva, "path", None) or rota.path
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede cada requisição HTTP.
+
+    ASGI puro (sem BaseHTTPMiddleware) para não criar tasks nem copiar o
+    corpo da resposta: só conta os bytes enviados.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        tamanho = 0
+
+        async def send_medindo(message):
+            nonlocal status, tamanho
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                tamanho += len(message.get("body", b""))
+            await send(message)
+
+        with request_queries(scope) as consultas:
+            metrics.em_andamento += 1
+            inicio = time.perf_counter()
+            try:
+                await self.app(scope, receive, send_medindo)
+            finally:
+                segundos = time.perf_counter() - inicio
+                metrics.em_andamento -= 1
+                metrics.observe(
+                    scope["method"],
+                    route_template(scope),
+                    status,
+                    segundos,
+                    tamanho,
+                    consultas,
+                )
+
@@ -1,7 +1,7 @@
 """Modelos SQLAlchemy - Tabelas do DER."""
 from datetime import datetime
 from enum import Enum as PyEnum
-from sqlalchemy import String, DateTime, ForeignKey, Enum, Integer, Text, func
+from sqlalchemy import String, DateTime, ForeignKey, Enum, Integer, BigInteger, Text, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -26,17 +26,21 @@ class Turma(Base):
     criada_em: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     
     # Relacionamentos
-    alunos: Mapped[list["Aluno"]] = relationship("Aluno", back_populates="turma")
+    alunos: Mapped[list["Aluno"]] = relationship("Aluno", back_populates="turma", passive_deletes=True)
 
 # ============ TABELA: ALUNO ============
 class Aluno(Base):
     __tablename__ = "alunos"
+    __table_args__ = (
+        Index("ix_alunos_turma_id", "turma_id"),
+        Index("ix_alunos_criado_em_id", "criado_em", "id"),
+    )
     
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     nome: Mapped[str] = mapped_column(String(255), nullable=False)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
     senha_hash: Mapped[str] = mapped_column(String(255), nullable=False)
-    turma_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("turmas.id"), nullable=False)
+    turma_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("turmas.id", ondelete="CASCADE"), nullable=False)
     criado_em: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     atualizado_em: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), 
@@ -46,7 +50,7 @@ class Aluno(Base):
     
     # Relacionamentos
     turma: Mapped["Turma"] = relationship("Turma", back_populates="alunos")
-    tarefas: Mapped[list["Tarefa"]] = relationship("Tarefa", back_populates="aluno")
+    tarefas: Mapped[list["Tarefa"]] = relationship("Tarefa", back_populates="aluno", passive_deletes=True)
 
 # ============ TABELA: DISCIPLINA ============
 class Disciplina(Base):
@@ -61,9 +65,10 @@ class Disciplina(Base):
     professores: Mapped[list["Professor"]] = relationship(
         "Professor", 
         secondary="professor_disciplina",
-        back_populates="disciplinas"
+        back_populates="disciplinas",
+        passive_deletes=True
     )
-    tarefas: Mapped[list["Tarefa"]] = relationship("Tarefa", back_populates="disciplina")
+    tarefas: Mapped[list["Tarefa"]] = relationship("Tarefa", back_populates="disciplina", passive_deletes=True)
 
 # ============ TABELA: PROFESSOR ============
 class Professor(Base):
@@ -78,34 +83,51 @@ class Professor(Base):
     disciplinas: Mapped[list["Disciplina"]] = relationship(
         "Disciplina",
         secondary="professor_disciplina",
-        back_populates="professores"
+        back_populates="professores",
+        passive_deletes=True
     )
-    tarefas: Mapped[list["Tarefa"]] = relationship("Tarefa", back_populates="professor")
+    tarefas: Mapped[list["Tarefa"]] = relationship("Tarefa", back_populates="professor", passive_deletes=True)
 
 # ============ TABELA: PROFESSOR_DISCIPLINA (N:N) ============
 class ProfessorDisciplina(Base):
     __tablename__ = "professor_disciplina"
+    __table_args__ = (
+        # A PK (professor_id, disciplina_id) não atende buscas pela disciplina
+        Index("ix_professor_disciplina_disciplina_id", "disciplina_id"),
+    )
     
     professor_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("professores.id"), 
+        ForeignKey("professores.id", ondelete="CASCADE"), 
         primary_key=True
     )
     disciplina_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("disciplinas.id"), 
+        ForeignKey("disciplinas.id", ondelete="CASCADE"), 
         primary_key=True
     )
 
 # ============ TABELA: TAREFA ============
 class Tarefa(Base):
     __tablename__ = "tarefas"
+    __table_args__ = (
+        # Filtros de list_tarefas e prazos por aluno
+        Index("ix_tarefas_aluno_status_entrega", "aluno_id", "status", "data_entrega"),
+        # Paginação por cursor (criada_em, id), com e sem filtros
+        Index("ix_tarefas_criada_em_id", "criada_em", "id"),
+        Index("ix_tarefas_aluno_criada_em_id", "aluno_id", "criada_em", "id"),
+        Index("ix_tarefas_status_criada_em_id", "status", "criada_em", "id"),
+        # Lado das FKs (deletes de disciplina/professor)
+        Index("ix_tarefas_disciplina_id", "disciplina_id"),
+        Index("ix_tarefas_professor_id", "professor_id"),
+    )
     
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    aluno_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("alunos.id"), nullable=False)
+    aluno_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("alunos.id", ondelete="CASCADE"), nullable=False)
     tipo: Mapped[TipoTarefa] = mapped_column(Enum(TipoTarefa), nullable=False)
     titulo: Mapped[str] = mapped_column(String(255), nullable=False)
     descricao: Mapped[str | None] = mapped_column(Text, nullable=True)
-    disciplina_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("disciplinas.id"), nullable=False)
-    professor_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("professores.id"), nullable=False)
+    disciplina_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("disciplinas.id", ondelete="CASCADE"), nullable=False)
+    # SET NULL: a tarefa do aluno continua existindo se o professor sair
+    professor_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("professores.id", ondelete="SET NULL"), nullable=True)
     pontos: Mapped[int] = mapped_column(Integer, nullable=False)
     data_entrega: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     status: Mapped[StatusTarefa] = mapped_column(Enum(StatusTarefa), default=StatusTarefa.PENDENTE)
@@ -121,4 +143,35 @@ class Tarefa(Base):
     # Relacionamentos
     aluno: Mapped["Aluno"] = relationship("Aluno", back_populates="tarefas")
     disciplina: Mapped["Disciplina"] = relationship("Disciplina", back_populates="tarefas")
-    professor: Mapped["Professor"] = relationship("Professor", back_populates="tarefas")
\ No newline at end of file
+    professor: Mapped["Professor | None"] = relationship("Professor", back_populates="tarefas")
+
+# ============ TABELA: RESUMO_TAREFAS ============
+class ResumoTarefa(Base):
+    """
+    Contagem e soma de pontos das tarefas por escopo, status e tipo.
+
+    Mantida de forma incremental por triggers no PostgreSQL (migration 0003),
+    então os resumos são lidos pela PK sem agregar a tabela de tarefas.
+    Escopos: "aluno", "turma" e "disciplina".
+    """
+    __tablename__ = "resumo_tarefas"
+    
+    escopo: Mapped[str] = mapped_column(String(20), primary_key=True)
+    escopo_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    status: Mapped[StatusTarefa] = mapped_column(Enum(StatusTarefa), primary_key=True)
+    tipo: Mapped[TipoTarefa] = mapped_column(Enum(TipoTarefa), primary_key=True)
+    quantidade: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    pontos: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+# ============ TABELA: CACHE_VERSOES ============
+class CacheVersao(Base):
+    """
+    Versão de cada conjunto de dados de referência em cache.
+
+    Incrementada na mesma transação da escrita; os workers comparam com a
+    versão que têm em memória para saber se o cache ficou velho.
+    """
+    __tablename__ = "cache_versoes"
+    
+    nome: Mapped[str] = mapped_column(String(50), primary_key=True)
+    versao: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,71 @@
+"""Paginação por cursor (keyset) para as rotas de listagem."""
+import base64
+import binascii
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+
+def _encode(partes: list) -> str:
+    raw = json.dumps(partes).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def encode_cursor(ordenado_em: datetime, item_id: UUID) -> str:
+    """Gera o token opaco que aponta para o último item de uma página."""
+    return _encode([ordenado_em.isoformat(), str(item_id)])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decodifica o token gerado por `encode_cursor`."""
+    try:
+        ordenado_em, item_id = _decode(cursor)
+        return datetime.fromisoformat(ordenado_em), UUID(item_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+def encode_rank_cursor(relevancia: float, item_id: UUID) -> str:
+    """Cursor das buscas, ordenadas por relevância (decrescente) e id."""
+    return _encode([relevancia, str(item_id)])
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, UUID]:
+    """Decodifica o token gerado por `encode_rank_cursor`."""
+    try:
+        relevancia, item_id = _decode(cursor)
+        return float(relevancia), UUID(item_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+def paginate(query, sort_column, id_column, cursor: str | None, limit: int):
+    """
+    Aplica ordenação estável e o filtro de keyset a uma consulta.
+
+    Busca `limit + 1` linhas para saber se existe uma próxima página sem
+    precisar de um COUNT. Com um índice em (sort_column, id_column) o custo
+    de qualquer página é o mesmo da primeira.
+    """
+    if cursor:
+        ordenado_em, item_id = decode_cursor(cursor)
+        query = query.filter(tuple_(sort_column, id_column) > tuple_(ordenado_em, item_id))
+    return query.order_by(sort_column, id_column).limit(limit + 1)
+
+
+def build_page(rows: list, limit: int, sort_attr: str) -> dict:
+    """Monta a resposta paginada a partir das linhas buscadas por `paginate`."""
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        ultimo = items[-1]
+        next_cursor = encode_cursor(getattr(ultimo, sort_attr), ultimo.id)
+    return {"items": items, "next_cursor": next_cursor}
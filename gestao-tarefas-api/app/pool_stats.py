@@ -0,0 +1,140 @@
+"""Estatísticas ao vivo dos pools de conexão do SQLAlchemy."""
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolStats:
+    """
+    Contadores de um pool, alimentados pelos eventos do SQLAlchemy e pela
+    espera na obtenção de conexões (ver `_InstrumentedPool`).
+
+    Os listeners são registrados uma vez, em `instrument`: o pool novo criado
+    por `engine.dispose()` herda o dispatch do antigo, com os mesmos listeners.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+        self.checkouts = 0
+        self.checkins = 0
+        # Pedidos que encontraram o pool esgotado e tiveram de esperar
+        self.waiting = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _inc(self, nome: str, valor=1) -> None:
+        with self._lock:
+            setattr(self, nome, getattr(self, nome) + valor)
+
+    def attach(self, pool) -> None:
+        event.listen(pool, "connect", lambda *_: self._inc("connects"))
+        event.listen(pool, "close", lambda *_: self._inc("closes"))
+        event.listen(pool, "invalidate", lambda *_: self._inc("invalidations"))
+        event.listen(pool, "checkout", lambda *_: self._inc("checkouts"))
+        event.listen(pool, "checkin", lambda *_: self._inc("checkins"))
+
+    def _espera(self, segundos: float, timeout: bool) -> None:
+        with self._lock:
+            self.waits += 1
+            self.timeouts += timeout
+            self.wait_seconds_total += segundos
+            self.wait_seconds_max = max(self.wait_seconds_max, segundos)
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            contadores = {
+                "connects": self.connects,
+                "closes": self.closes,
+                "invalidations": self.invalidations,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "waiting": self.waiting,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+        if not isinstance(pool, _InstrumentedPool):
+            # Ex: SQLite em memória, sem limite de conexões
+            return {"pool": type(pool).__name__, **contadores}
+        return {
+            "pool": type(pool).__name__,
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool.max_overflow,
+            "timeout_seconds": pool.timeout(),
+            **contadores,
+        }
+
+
+class _InstrumentedPool:
+    """
+    Mixin que mede a espera por conexão quando o pool está esgotado.
+
+    Não há evento do SQLAlchemy para isso: a espera acontece dentro de
+    `connect()`, antes do evento `checkout`. Só os pedidos que de fato
+    bloqueiam (sem conexão livre e sem overflow disponível) pagam o custo da
+    medição.
+    """
+
+    stats: PoolStats
+
+    def __init__(self, *args, max_overflow: int = 10, **kwargs):
+        # Guardado aqui para não depender do atributo privado do QueuePool
+        self.max_overflow = max_overflow
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+
+    def _esgotado(self) -> bool:
+        return (
+            self.max_overflow > -1
+            and self.checkedin() == 0
+            and self.checkedout() >= self.size() + self.max_overflow
+        )
+
+    def connect(self):
+        if not self._esgotado():
+            return super().connect()
+
+        self.stats._inc("waiting")
+        inicio = time.perf_counter()
+        timeout = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timeout = True
+            raise
+        finally:
+            self.stats._inc("waiting", -1)
+            self.stats._espera(time.perf_counter() - inicio, timeout)
+
+    def recreate(self):
+        # dispose() cria um pool novo, que já herda os listeners (dispatch);
+        # só os contadores precisam ser levados
+        novo = super().recreate()
+        novo.stats = self.stats
+        return novo
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    pass
+
+
+class InstrumentedAsyncPool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument(engine) -> PoolStats:
+    """Liga as estatísticas ao pool da engine (criada com um dos pools acima)."""
+    stats = PoolStats()
+    engine.pool.stats = stats
+    stats.attach(engine.pool)
+    return stats
@@ -0,0 +1,155 @@
+"""
+Profiler de SQL por requisição.
+
+Os eventos da engine contam e cronometram cada query no acumulador da
+requisição atual (um contextvar, visível também no threadpool e nos
+greenlets do asyncpg). Com isso:
+
+- queries acima de `DB_SLOW_QUERY_MS` vão para o log, com os parâmetros
+  trocados pelos tipos;
+- a mesma query (mesmo SQL, parâmetros diferentes) executada mais de
+  `DB_N_PLUS_ONE_THRESHOLD` vezes numa requisição é apontada como N+1;
+- com `DB_PROFILE_HEADERS=true` a resposta leva `X-DB-Query-Count` e `X-DB-Time`.
+"""
+import logging
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Tamanho máximo do SQL copiado para o log
+_SQL_MAX = 500
+
+
+class ConsultasRequisicao:
+    """Queries executadas durante uma requisição."""
+
+    __slots__ = ("alvo", "quantidade", "segundos", "formas")
+
+    def __init__(self, alvo: str = ""):
+        self.alvo = alvo
+        self.quantidade = 0
+        self.segundos = 0.0
+        # SQL -> execuções; o SQL já vem parametrizado, então é a "forma" da query
+        self.formas: Counter[str] = Counter()
+
+
+consultas_atuais: ContextVar[ConsultasRequisicao | None] = ContextVar("consultas_atuais", default=None)
+
+
+@contextmanager
+def request_queries(scope) -> Iterator[ConsultasRequisicao]:
+    """Acumulador da requisição; reaproveita o de um middleware mais externo."""
+    atual = consultas_atuais.get()
+    if atual is not None:
+        yield atual
+        return
+    atual = ConsultasRequisicao(f"{scope['method']} {scope['path']}")
+    token = consultas_atuais.set(atual)
+    try:
+        yield atual
+    finally:
+        consultas_atuais.reset(token)
+
+
+def _sql(statement: str) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= _SQL_MAX else statement[:_SQL_MAX] + "..."
+
+
+def redact(parameters):
+    """Parâmetros com os valores trocados pelo nome do tipo (sem dados de alunos no log)."""
+    if isinstance(parameters, dict):
+        return {nome: redact(valor) for nome, valor in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return type(parameters)(redact(valor) for valor in parameters)
+    return f"<{type(parameters).__name__}>"
+
+
+def instrument_engine(engine) -> None:
+    """Liga a contagem, o cronômetro e o log de queries lentas à engine."""
+    lenta = settings.db_slow_query_ms / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._profiler_inicio = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _depois(conn, cursor, statement, parameters, context, executemany):
+        if context is None:
+            return
+        segundos = time.perf_counter() - context._profiler_inicio
+        consultas = consultas_atuais.get()
+        if consultas is not None:
+            consultas.quantidade += 1
+            consultas.segundos += segundos
+            consultas.formas[statement] += 1
+        if lenta > 0 and segundos >= lenta:
+            if executemany:
+                # Só o primeiro conjunto: o formato é o mesmo para todos
+                parametros = f"{redact(parameters[0])} (x{len(parameters)})" if parameters else "[]"
+            else:
+                parametros = redact(parameters)
+            logger.warning(
+                "Query lenta (%.1f ms) em %s: %s | parâmetros: %s",
+                segundos * 1000,
+                consultas.alvo if consultas is not None else "-",
+                _sql(statement),
+                parametros,
+            )
+
+
+def check_n_plus_one(consultas: ConsultasRequisicao) -> list[tuple[str, int]]:
+    """Queries repetidas acima do limite na requisição (e as registra no log)."""
+    limite = settings.db_n_plus_one_threshold
+    if limite <= 0 or consultas.quantidade <= limite:
+        return []
+    repetidas = [(sql, vezes) for sql, vezes in consultas.formas.items() if vezes > limite]
+    for sql, vezes in repetidas:
+        logger.warning("Possível N+1 em %s: %d execuções de: %s", consultas.alvo, vezes, _sql(sql))
+    return repetidas
+
+
+class QueryProfilerMiddleware:
+    """
+    Middleware ASGI que abre o acumulador de queries da requisição, aponta
+    N+1 ao final e, se configurado, escreve os headers de profiling.
+
+    Os headers saem no início da resposta: queries feitas depois (ex: durante
+    um StreamingResponse) não entram neles, mas entram no log de N+1.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with request_queries(scope) as consultas:
+            if settings.db_profile_headers:
+                async def send_com_headers(message):
+                    if message["type"] == "http.response.start":
+                        message["headers"] = [
+                            *message.get("headers", []),
+                            (b"x-db-query-count", str(consultas.quantidade).encode()),
+                            (b"x-db-time", f"{consultas.segundos * 1000:.2f}".encode()),
+                        ]
+                    await send(message)
+            else:
+                send_com_headers = send
+
+            try:
+                await self.app(scope, receive, send_com_headers)
+            finally:
+                check_n_plus_one(consultas)
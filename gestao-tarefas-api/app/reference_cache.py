@@ -0,0 +1,198 @@
+"""
+Cache em memória (por worker) dos dados de referência.
+
+Turmas, disciplinas, professores e os vínculos professor/disciplina mudam
+poucas vezes por período e são lidos em quase toda tela. Cada conjunto é
+carregado inteiro, uma vez, e servido da memória (inclusive a paginação por
+cursor). As escritas incrementam a versão do conjunto em `cache_versoes` na
+mesma transação; cada worker confere essas versões em segundo plano, então
+as leituras não vão ao banco enquanto nada muda.
+"""
+import asyncio
+import bisect
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import CacheVersao, Disciplina, Professor, ProfessorDisciplina, Turma
+from app.pagination import decode_cursor, encode_cursor
+from app.schemas import DisciplinaResponse, ProfessorResponse, TurmaResponse
+from database import fetch_all
+
+logger = logging.getLogger(__name__)
+
+# Conjunto -> (modelo, schema de resposta, coluna de ordenação)
+FONTES = {
+    "turmas": (Turma, TurmaResponse, "criada_em"),
+    "disciplinas": (Disciplina, DisciplinaResponse, "criada_em"),
+    "professores": (Professor, ProfessorResponse, "criado_em"),
+}
+VINCULOS = "vinculos"
+CONJUNTOS = [*FONTES, VINCULOS]
+
+
+@dataclass
+class _Tabela:
+    versao: int
+    itens: list[BaseModel] = field(default_factory=list)
+    # (ordenado_em, id) de cada item, na mesma ordem, para o bisect do cursor
+    chaves: list[tuple[datetime, UUID]] = field(default_factory=list)
+    por_id: dict[UUID, BaseModel] = field(default_factory=dict)
+
+
+@dataclass
+class _Vinculos:
+    versao: int
+    disciplinas_por_professor: dict[UUID, list[UUID]] = field(default_factory=dict)
+    professores_por_disciplina: dict[UUID, list[UUID]] = field(default_factory=dict)
+
+
+class ReferenceCache:
+    """Cópia em memória dos conjuntos de referência, versionada pelo banco."""
+
+    def __init__(self):
+        self._dados: dict[str, _Tabela | _Vinculos] = {}
+        # Maior versão conhecida de cada conjunto no banco
+        self._versoes: dict[str, int] = {}
+        self._locks = {nome: asyncio.Lock() for nome in CONJUNTOS}
+        self.hits = 0
+        self.loads = 0
+
+    # ---------- leitura ----------
+
+    async def _conjunto(self, db: AsyncSession, nome: str) -> _Tabela | _Vinculos:
+        atual = self._dados.get(nome)
+        if atual is not None and atual.versao >= self._versoes.get(nome, 0):
+            self.hits += 1
+            return atual
+
+        async with self._locks[nome]:
+            # Outra requisição pode ter recarregado enquanto esperávamos
+            atual = self._dados.get(nome)
+            if atual is not None and atual.versao >= self._versoes.get(nome, 0):
+                self.hits += 1
+                return atual
+
+            # Versão lida antes das linhas: se mudar no meio, a próxima
+            # conferência vê uma versão maior e recarrega
+            versao = await db.scalar(select(CacheVersao.versao).where(CacheVersao.nome == nome)) or 0
+            if nome == VINCULOS:
+                atual = await self._carregar_vinculos(db, versao)
+            else:
+                atual = await self._carregar_tabela(db, nome, versao)
+            self._dados[nome] = atual
+            self._versoes[nome] = max(self._versoes.get(nome, 0), versao)
+            self.loads += 1
+            return atual
+
+    async def _carregar_tabela(self, db: AsyncSession, nome: str, versao: int) -> _Tabela:
+        modelo, schema, ordenacao = FONTES[nome]
+        coluna = getattr(modelo, ordenacao)
+        linhas = (await db.scalars(select(modelo).order_by(coluna, modelo.id))).all()
+        tabela = _Tabela(versao=versao)
+        for linha in linhas:
+            item = schema.model_validate(linha)
+            tabela.itens.append(item)
+            tabela.chaves.append((getattr(item, ordenacao), item.id))
+            tabela.por_id[item.id] = item
+        return tabela
+
+    async def _carregar_vinculos(self, db: AsyncSession, versao: int) -> _Vinculos:
+        linhas = await db.execute(select(ProfessorDisciplina.professor_id, ProfessorDisciplina.disciplina_id))
+        disciplinas = defaultdict(list)
+        professores = defaultdict(list)
+        for professor_id, disciplina_id in linhas:
+            disciplinas[professor_id].append(disciplina_id)
+            professores[disciplina_id].append(professor_id)
+        return _Vinculos(versao, dict(disciplinas), dict(professores))
+
+    async def page(self, db: AsyncSession, nome: str, cursor: str | None, limit: int) -> dict:
+        """Página no mesmo formato (e com os mesmos cursores) de `build_page`."""
+        tabela = await self._conjunto(db, nome)
+        inicio = bisect.bisect_right(tabela.chaves, decode_cursor(cursor)) if cursor else 0
+        fim = inicio + limit
+        next_cursor = encode_cursor(*tabela.chaves[fim - 1]) if fim < len(tabela.itens) else None
+        return {"items": tabela.itens[inicio:fim], "next_cursor": next_cursor}
+
+    async def get(self, db: AsyncSession, nome: str, item_id: UUID) -> BaseModel | None:
+        return (await self._conjunto(db, nome)).por_id.get(item_id)
+
+    async def get_many(self, db: AsyncSession, nome: str, ids) -> dict[UUID, BaseModel]:
+        """Itens de vários ids de uma vez (ids inexistentes ficam de fora)."""
+        por_id = (await self._conjunto(db, nome)).por_id
+        return {item_id: por_id[item_id] for item_id in ids if item_id in por_id}
+
+    def version(self, nome: str) -> int:
+        """Versão mais recente conhecida do conjunto (usada nos ETags)."""
+        return self._versoes.get(nome, 0)
+
+    async def links(self, db: AsyncSession) -> _Vinculos:
+        """Vínculos professor/disciplina nos dois sentidos."""
+        return await self._conjunto(db, VINCULOS)
+
+    # ---------- escrita ----------
+
+    async def bump(self, db: AsyncSession, *nomes: str) -> dict[str, int]:
+        """
+        Incrementa a versão dos conjuntos na transação de `db`.
+
+        Deve ser chamado antes do commit da escrita; depois do commit, passe
+        o retorno para `invalidate`.
+        """
+        stmt = insert(CacheVersao).values([{"nome": nome, "versao": 1} for nome in nomes])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CacheVersao.nome],
+            set_={"versao": CacheVersao.versao + 1},
+        ).returning(CacheVersao.nome, CacheVersao.versao)
+        return dict((await db.execute(stmt)).all())
+
+    def invalidate(self, versoes: dict[str, int]) -> None:
+        """Marca como velhas as cópias anteriores às versões informadas."""
+        for nome, versao in versoes.items():
+            self._versoes[nome] = max(self._versoes.get(nome, 0), versao)
+
+    def clear(self) -> None:
+        self._dados.clear()
+
+    # ---------- sincronização entre workers ----------
+
+    async def refresh_versions(self) -> None:
+        """Lê as versões atuais do banco (uma query pequena, fora das requisições)."""
+        for nome, versao in await fetch_all(select(CacheVersao.nome, CacheVersao.versao)):
+            if versao > self._versoes.get(nome, 0):
+                self._versoes[nome] = versao
+
+    async def poll(self, intervalo: float) -> None:
+        """Confere as versões a cada `intervalo` segundos até ser cancelado."""
+        while True:
+            await asyncio.sleep(intervalo)
+            try:
+                await self.refresh_versions()
+            except Exception:
+                # Banco fora do ar: continua servindo a cópia atual
+                logger.warning("Falha ao conferir versões do cache de referência", exc_info=True)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "loads": self.loads,
+            "conjuntos": {
+                nome: {
+                    "versao": dados.versao,
+                    "versao_banco": self._versoes.get(nome, 0),
+                    "itens": len(dados.itens) if isinstance(dados, _Tabela)
+                    else len(dados.disciplinas_por_professor),
+                }
+                for nome, dados in self._dados.items()
+            },
+        }
+
+
+reference_cache = ReferenceCache()
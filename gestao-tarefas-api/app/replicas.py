@@ -0,0 +1,201 @@
+"""
+Roteamento de leituras para réplicas do banco.
+
+Com `DATABASE_REPLICA_URLS` configurada:
+
+- requisições GET/HEAD usam uma réplica saudável (em rodízio); as demais
+  usam o primário;
+- depois de uma escrita o cliente recebe um cookie curto, e as leituras
+  seguintes dele também vão ao primário (lê o que acabou de gravar);
+- uma tarefa em segundo plano mede o atraso de replicação de cada réplica:
+  réplica fora do ar ou mais atrasada que `DB_REPLICA_MAX_LAG_SECONDS` sai do
+  rodízio até a próxima verificação boa. Sem réplica saudável, as leituras
+  voltam para o primário.
+"""
+import asyncio
+import itertools
+import logging
+import math
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import HTTPConnection
+
+logger = logging.getLogger(__name__)
+
+# Ligado pelo middleware quando a requisição pode ler de uma réplica
+leitura_replica: ContextVar[bool] = ContextVar("leitura_replica", default=False)
+
+# Cookie que prende as leituras do cliente ao primário depois de uma escrita
+COOKIE_PRIMARIO = "db_primario"
+
+METODOS_LEITURA = ("GET", "HEAD")
+
+# Segundos de atraso da réplica: zero fora de recovery ou com todo o WAL
+# recebido já aplicado (senão o primário parado pareceria uma réplica atrasada)
+_ATRASO_POSTGRES = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class Replica:
+    """Uma réplica de leitura: engine, fábrica de sessões e último estado medido."""
+
+    def __init__(self, nome: str, engine, sessions):
+        self.nome = nome
+        # Engine (modo padrão) ou AsyncEngine (DB_ASYNC=true)
+        self.engine = engine
+        self.sessions = sessions
+        # Fica fora do rodízio até a primeira verificação
+        self.saudavel = False
+        self.atraso: float | None = None
+        self.erro: str | None = None
+        self.verificada_em: float | None = None
+
+    @property
+    def sync_engine(self):
+        return self.engine.sync_engine if isinstance(self.engine, AsyncEngine) else self.engine
+
+    async def medir_atraso(self) -> float:
+        """Atraso de replicação em segundos (abre uma conexão do pool da réplica)."""
+        consulta = _ATRASO_POSTGRES if self.sync_engine.dialect.name == "postgresql" else text("SELECT 0")
+        if isinstance(self.engine, AsyncEngine):
+            async with self.engine.connect() as conn:
+                return float(await conn.scalar(consulta))
+
+        def _medir() -> float:
+            with self.engine.connect() as conn:
+                return float(conn.scalar(consulta))
+
+        return await run_in_threadpool(_medir)
+
+
+class ReplicaSet:
+    """Réplicas configuradas, com rodízio entre as saudáveis."""
+
+    def __init__(self, replicas: list[Replica], atraso_maximo: float):
+        self.replicas = replicas
+        self.atraso_maximo = atraso_maximo
+        self._rodizio = itertools.count()
+        self.leituras = 0
+        # Leituras que iriam para uma réplica mas foram para o primário
+        self.desvios = 0
+        for replica in replicas:
+            self._vigiar_erros(replica)
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def _vigiar_erros(self, replica: Replica) -> None:
+        """Conexão perdida numa requisição tira a réplica do rodízio na hora."""
+        @event.listens_for(replica.sync_engine, "handle_error")
+        def _erro(context):
+            if context.is_disconnect:
+                self.marcar_falha(replica, context.original_exception)
+
+    def escolher(self) -> Replica | None:
+        """Próxima réplica saudável (None = usar o primário)."""
+        if not self.replicas:
+            return None
+        saudaveis = [replica for replica in self.replicas if replica.saudavel]
+        if not saudaveis:
+            self.desvios += 1
+            return None
+        self.leituras += 1
+        return saudaveis[next(self._rodizio) % len(saudaveis)]
+
+    def marcar_falha(self, replica: Replica, erro: BaseException) -> None:
+        if replica.saudavel:
+            logger.warning("Réplica %s fora do rodízio: %s", replica.nome, erro)
+        replica.saudavel = False
+        replica.erro = str(erro) or type(erro).__name__
+
+    async def _verificar(self, replica: Replica, timeout: float) -> None:
+        try:
+            atraso = await asyncio.wait_for(replica.medir_atraso(), timeout)
+        except Exception as exc:
+            self.marcar_falha(replica, exc)
+            return
+        finally:
+            replica.verificada_em = time.time()
+
+        replica.atraso = atraso
+        replica.erro = None
+        saudavel = atraso <= self.atraso_maximo
+        if saudavel and not replica.saudavel:
+            logger.info("Réplica %s no rodízio (atraso %.1fs)", replica.nome, atraso)
+        elif not saudavel and replica.saudavel:
+            logger.warning("Réplica %s fora do rodízio: atraso de %.1fs", replica.nome, atraso)
+        replica.saudavel = saudavel
+
+    async def verificar(self, timeout: float) -> None:
+        """Mede todas as réplicas em paralelo; cada uma tem até `timeout` segundos."""
+        await asyncio.gather(*(self._verificar(replica, timeout) for replica in self.replicas))
+
+    async def vigiar(self, intervalo: float) -> None:
+        """Verifica as réplicas a cada `intervalo` segundos até ser cancelado."""
+        while True:
+            await asyncio.sleep(intervalo)
+            await self.verificar(intervalo)
+
+    def status(self) -> dict:
+        return {
+            "atraso_maximo": self.atraso_maximo,
+            "leituras": self.leituras,
+            "desvios_para_primario": self.desvios,
+            "replicas": [
+                {
+                    "nome": replica.nome,
+                    "url": replica.sync_engine.url.render_as_string(hide_password=True),
+                    "saudavel": replica.saudavel,
+                    "atraso": replica.atraso,
+                    "erro": replica.erro,
+                    "verificada_em": replica.verificada_em,
+                }
+                for replica in self.replicas
+            ],
+        }
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Middleware ASGI que decide se a requisição pode ler de uma réplica e,
+    nas escritas bem-sucedidas, envia o cookie que manda as leituras
+    seguintes do cliente para o primário durante `janela` segundos.
+    """
+
+    def __init__(self, app, janela: float):
+        self.app = app
+        self.cookie = (
+            f"{COOKIE_PRIMARIO}=1; Max-Age={math.ceil(janela)}; Path=/; HttpOnly; SameSite=Lax"
+        ).encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] in METODOS_LEITURA:
+            if COOKIE_PRIMARIO in HTTPConnection(scope).cookies:
+                await self.app(scope, receive, send)
+                return
+            token = leitura_replica.set(True)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                leitura_replica.reset(token)
+            return
+
+        async def send_com_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", self.cookie)]
+            await send(message)
+
+        await self.app(scope, receive, send_com_cookie)
@@ -0,0 +1,60 @@
+"""Caminho rápido de serialização JSON para as listagens."""
+from collections.abc import Sequence
+from uuid import UUID
+
+import orjson
+from fastapi import Response
+from sqlalchemy import Row
+
+from app.pagination import build_page
+
+# OPT_UTC_Z escreve datas UTC com "Z", como o Pydantic faz no response_model
+_OPCOES = orjson.OPT_UTC_Z
+
+
+def _default(valor):
+    # O asyncpg devolve o próprio tipo de UUID, que o orjson não reconhece
+    if isinstance(valor, UUID):
+        return str(valor)
+    raise TypeError
+
+
+def json_response(conteudo, response: Response | None = None) -> Response:
+    """
+    Codifica `conteudo` direto em bytes com orjson.
+
+    Retornar um Response pula a validação/serialização do response_model
+    (que continua documentando o schema no OpenAPI). Headers já definidos em
+    `response` (ex: ETag) são copiados.
+    """
+    resposta = Response(orjson.dumps(conteudo, default=_default, option=_OPCOES), media_type="application/json")
+    if response is not None:
+        resposta.headers.update({k: v for k, v in response.headers.items() if k != "content-length"})
+    return resposta
+
+
+def row_dict(row: Row, campos: list[str] | None = None) -> dict:
+    """Linha Core como dict, restrita a `campos` quando informado."""
+    item = row._asdict()
+    if campos is None:
+        return item
+    return {campo: item[campo] for campo in campos}
+
+
+def json_page(
+    rows: Sequence[Row],
+    limit: int,
+    sort_attr: str,
+    response: Response | None = None,
+    campos: list[str] | None = None,
+) -> Response:
+    """
+    Página a partir de linhas Core (sem hidratar objetos ORM).
+
+    As linhas devem selecionar as colunas do schema de resposta (ou, com
+    `campos`, ao menos essas e a de ordenação), para que a saída seja
+    idêntica à do response_model.
+    """
+    page = build_page(rows, limit, sort_attr)
+    page["items"] = [row_dict(row, campos) for row in page["items"]]
+    return json_response(page, response)
@@ -1,73 +1,109 @@
 """Rotas CRUD para Alunos."""
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from passlib.hash import bcrypt
+from auth import get_password_hash_async, invalidate_principals
 from database import get_db
+from app.conditional import make_etag, not_modified
+from app.crud import delete_returning, response_columns, update_returning
+from app.fieldsets import FIELDS_QUERY, parse_fields, project
 from app.models import Aluno
-from app.schemas import AlunoCreate, AlunoUpdate, AlunoResponse, MessageResponse
+from app.pagination import paginate
+from app.responses import json_page, json_response, row_dict
+from app.schemas import AlunoCreate, AlunoUpdate, AlunoResponse, MessageResponse, Page
 
 router = APIRouter(prefix="/alunos", tags=["Alunos"])
 
-def hash_password(password: str) -> str:
-    return bcrypt.hash(password)
+# Colunas expostas em AlunoResponse (nunca inclui senha_hash)
+ALUNO_COLUNAS = response_columns(Aluno, AlunoResponse)
 
 @router.post("/", response_model=AlunoResponse, status_code=status.HTTP_201_CREATED)
-def create_aluno(aluno: AlunoCreate, db: Session = Depends(get_db)):
+async def create_aluno(aluno: AlunoCreate, db: AsyncSession = Depends(get_db)):
     """Cria um novo aluno."""
     db_aluno = Aluno(
         nome=aluno.nome,
         email=aluno.email,
-        senha_hash=hash_password(aluno.password),
+        senha_hash=await get_password_hash_async(aluno.password),
         turma_id=aluno.turma_id
     )
     db.add(db_aluno)
     try:
-        db.commit()
-        db.refresh(db_aluno)
+        await db.commit()
+        await db.refresh(db_aluno)
         return db_aluno
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail="Email já cadastrado")
 
-@router.get("/", response_model=list[AlunoResponse])
-def list_alunos(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Lista todos os alunos."""
-    return db.query(Aluno).offset(skip).limit(limit).all()
+@router.get("/", response_model=Page[AlunoResponse])
+async def list_alunos(
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    turma_id: UUID | None = None,
+    fields: str | None = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_db)
+):
+    """Lista alunos, opcionalmente filtrando pela turma (linhas Core + orjson)."""
+    campos = parse_fields(fields, ALUNO_COLUNAS)
+    query = select(*project(ALUNO_COLUNAS, campos, Aluno.criado_em))
+    if turma_id:
+        query = query.filter(Aluno.turma_id == turma_id)
+    query = paginate(query, Aluno.criado_em, Aluno.id, cursor, limit)
+    result = await db.execute(query)
+    return json_page(result.all(), limit, "criado_em", response, campos)
 
 @router.get("/{aluno_id}", response_model=AlunoResponse)
-def get_aluno(aluno_id: UUID, db: Session = Depends(get_db)):
-    """Busca um aluno pelo ID."""
-    aluno = db.query(Aluno).filter(Aluno.id == aluno_id).first()
+async def get_aluno(
+    aluno_id: UUID,
+    request: Request,
+    response: Response,
+    fields: str | None = FIELDS_QUERY,
+    db: AsyncSession = Depends(get_db)
+):
+    """Busca um aluno pelo ID (responde 304 se não mudou desde o ETag do cliente)."""
+    campos = parse_fields(fields, ALUNO_COLUNAS)
+    aluno = (await db.execute(
+        select(*project(ALUNO_COLUNAS, campos, Aluno.atualizado_em)).where(Aluno.id == aluno_id)
+    )).first()
     if not aluno:
         raise HTTPException(status_code=404, detail="Aluno não encontrado")
-    return aluno
+    etag = make_etag(aluno.id, aluno.atualizado_em, campos)
+    if (resposta := not_modified(request, response, etag, aluno.atualizado_em)) is not None:
+        return resposta
+    return json_response(row_dict(aluno, campos), response)
 
 @router.put("/{aluno_id}", response_model=AlunoResponse)
-def update_aluno(aluno_id: UUID, aluno_data: AlunoUpdate, db: Session = Depends(get_db)):
-    """Atualiza um aluno."""
-    aluno = db.query(Aluno).filter(Aluno.id == aluno_id).first()
-    if not aluno:
-        raise HTTPException(status_code=404, detail="Aluno não encontrado")
-    
+async def update_aluno(aluno_id: UUID, aluno_data: AlunoUpdate, db: AsyncSession = Depends(get_db)):
+    """Atualiza um aluno (um único UPDATE ... RETURNING)."""
     update_data = aluno_data.model_dump(exclude_unset=True)
     if "password" in update_data:
-        update_data["senha_hash"] = hash_password(update_data.pop("password"))
-    
-    for field, value in update_data.items():
-        setattr(aluno, field, value)
-    
-    db.commit()
-    db.refresh(aluno)
-    return aluno
+        update_data["senha_hash"] = await get_password_hash_async(update_data.pop("password"))
 
-@router.delete("/{aluno_id}", response_model=MessageResponse)
-def delete_aluno(aluno_id: UUID, db: Session = Depends(get_db)):
-    """Remove um aluno."""
-    aluno = db.query(Aluno).filter(Aluno.id == aluno_id).first()
+    # Troca de email: o cache de principals está indexado pelo email antigo
+    email_antigo = None
+    if "email" in update_data:
+        email_antigo = await db.scalar(select(Aluno.email).where(Aluno.id == aluno_id))
+
+    try:
+        aluno = await update_returning(db, Aluno, aluno_id, update_data, ALUNO_COLUNAS)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Email já cadastrado ou turma não encontrada")
     if not aluno:
         raise HTTPException(status_code=404, detail="Aluno não encontrado")
-    db.delete(aluno)
-    db.commit()
+    invalidate_principals(aluno.email, email_antigo)
+    return aluno._asdict()
+
+@router.delete("/{aluno_id}", response_model=MessageResponse)
+async def delete_aluno(aluno_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Remove um aluno e, em cascata no banco, as tarefas dele."""
+    email = await delete_returning(db, Aluno, aluno_id, Aluno.email)
+    if not email:
+        raise HTTPException(status_code=404, detail="Aluno não encontrado")
+    await db.commit()
+    invalidate_principals(email)
     return {"message": "Aluno removido com sucesso", "detail": f"ID: {aluno_id}"}
\ No newline at end of file
@@ -1,20 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
-from auth import authenticate_aluno, create_access_token
-from app.schemas import Token
+from auth import authenticate_aluno, create_access_token, get_current_aluno
+from app.schemas import AlunoResponse, Token
 
 router = APIRouter()
 
 
 @router.post("/auth/login", response_model=Token, tags=["Auth"])
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    aluno = authenticate_aluno(db, form_data.username, form_data.password)
+    aluno = await authenticate_aluno(db, form_data.username, form_data.password)
     if not aluno:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -24,3 +24,9 @@ def login_for_access_token(
 
     access_token = create_access_token(data={"sub": aluno.email})
     return {"access_token": access_token, "token_type": "bearer"}
+
+
+@router.get("/auth/me", response_model=AlunoResponse, tags=["Auth"])
+async def read_current_aluno(aluno: AlunoResponse = Depends(get_current_aluno)):
+    """Aluno dono do token (resolvido pelo cache de principals)."""
+    return aluno
@@ -1,55 +1,64 @@
 """Rotas CRUD para Disciplinas."""
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
+from app.crud import delete_returning, response_columns, update_returning
 from app.models import Disciplina
-from app.schemas import DisciplinaCreate, DisciplinaUpdate, DisciplinaResponse, MessageResponse
+from app.reference_cache import reference_cache
+from app.schemas import DisciplinaCreate, DisciplinaUpdate, DisciplinaResponse, MessageResponse, Page
 
 router = APIRouter(prefix="/disciplinas", tags=["Disciplinas"])
 
+DISCIPLINA_COLUNAS = response_columns(Disciplina, DisciplinaResponse)
+
 @router.post("/", response_model=DisciplinaResponse, status_code=status.HTTP_201_CREATED)
-def create_disciplina(disciplina: DisciplinaCreate, db: Session = Depends(get_db)):
+async def create_disciplina(disciplina: DisciplinaCreate, db: AsyncSession = Depends(get_db)):
     """Cria uma nova disciplina."""
     db_disciplina = Disciplina(nome=disciplina.nome, codigo=disciplina.codigo)
     db.add(db_disciplina)
-    db.commit()
-    db.refresh(db_disciplina)
+    versoes = await reference_cache.bump(db, "disciplinas")
+    await db.commit()
+    await db.refresh(db_disciplina)
+    reference_cache.invalidate(versoes)
     return db_disciplina
 
-@router.get("/", response_model=list[DisciplinaResponse])
-def list_disciplinas(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Lista todas as disciplinas."""
-    return db.query(Disciplina).offset(skip).limit(limit).all()
+@router.get("/", response_model=Page[DisciplinaResponse])
+async def list_disciplinas(
+    cursor: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+    """Lista todas as disciplinas (servidas do cache de referência)."""
+    return await reference_cache.page(db, "disciplinas", cursor, limit)
 
 @router.get("/{disciplina_id}", response_model=DisciplinaResponse)
-def get_disciplina(disciplina_id: UUID, db: Session = Depends(get_db)):
-    """Busca uma disciplina pelo ID."""
-    disciplina = db.query(Disciplina).filter(Disciplina.id == disciplina_id).first()
+async def get_disciplina(disciplina_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Busca uma disciplina pelo ID (servida do cache de referência)."""
+    disciplina = await reference_cache.get(db, "disciplinas", disciplina_id)
     if not disciplina:
         raise HTTPException(status_code=404, detail="Disciplina não encontrada")
     return disciplina
 
 @router.put("/{disciplina_id}", response_model=DisciplinaResponse)
-def update_disciplina(disciplina_id: UUID, disciplina_data: DisciplinaUpdate, db: Session = Depends(get_db)):
-    """Atualiza uma disciplina."""
-    disciplina = db.query(Disciplina).filter(Disciplina.id == disciplina_id).first()
+async def update_disciplina(disciplina_id: UUID, disciplina_data: DisciplinaUpdate, db: AsyncSession = Depends(get_db)):
+    """Atualiza uma disciplina (um único UPDATE ... RETURNING)."""
+    valores = disciplina_data.model_dump(exclude_unset=True)
+    disciplina = await update_returning(db, Disciplina, disciplina_id, valores, DISCIPLINA_COLUNAS)
     if not disciplina:
         raise HTTPException(status_code=404, detail="Disciplina não encontrada")
-    
-    for field, value in disciplina_data.model_dump(exclude_unset=True).items():
-        setattr(disciplina, field, value)
-    
-    db.commit()
-    db.refresh(disciplina)
-    return disciplina
+    if valores:
+        versoes = await reference_cache.bump(db, "disciplinas")
+        await db.commit()
+        reference_cache.invalidate(versoes)
+    return disciplina._asdict()
 
 @router.delete("/{disciplina_id}", response_model=MessageResponse)
-def delete_disciplina(disciplina_id: UUID, db: Session = Depends(get_db)):
-    """Remove uma disciplina."""
-    disciplina = db.query(Disciplina).filter(Disciplina.id == disciplina_id).first()
-    if not disciplina:
+async def delete_disciplina(disciplina_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Remove uma disciplina, com as tarefas e vínculos dela (cascata no banco)."""
+    if not await delete_returning(db, Disciplina, disciplina_id):
         raise HTTPException(status_code=404, detail="Disciplina não encontrada")
-    db.delete(disciplina)
-    db.commit()
+    versoes = await reference_cache.bump(db, "disciplinas", "vinculos")
+    await db.commit()
+    reference_cache.invalidate(versoes)
     return {"message": "Disciplina removida com sucesso", "detail": f"ID: {disciplina_id}"}
\ No newline at end of file
@@ -1,77 +1,137 @@
 """Rotas CRUD para Professores."""
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from database import get_db
-from app.models import Professor, Disciplina, ProfessorDisciplina
+from app.crud import delete_returning, response_columns, update_returning
+from app.models import Professor, Disciplina, ProfessorDisciplina, Tarefa
+from app.fieldsets import expand_query, parse_expand
+from app.reference_cache import reference_cache
+from app.responses import json_response
 from app.schemas import (
-    ProfessorCreate, ProfessorUpdate, ProfessorResponse, 
-    ProfessorDisciplinaCreate, MessageResponse
+    ProfessorCreate, ProfessorUpdate, ProfessorResponse,
+    ProfessorDisciplinaCreate, MessageResponse, Page
 )
 
 router = APIRouter(prefix="/professores", tags=["Professores"])
 
+PROFESSOR_COLUNAS = response_columns(Professor, ProfessorResponse)
+
+EXPANSOES = ["disciplinas"]
+
+async def _com_disciplinas(db: AsyncSession, professores: list[ProfessorResponse]) -> list[dict]:
+    """Professores com as disciplinas vinculadas, a partir do cache de referência."""
+    vinculos = (await reference_cache.links(db)).disciplinas_por_professor
+    disciplinas = await reference_cache.get_many(
+        db, "disciplinas", {d for p in professores for d in vinculos.get(p.id, [])}
+    )
+    return [
+        {
+            **professor.model_dump(),
+            "disciplinas": [
+                disciplinas[d].model_dump() for d in vinculos.get(professor.id, []) if d in disciplinas
+            ],
+        }
+        for professor in professores
+    ]
+
 @router.post("/", response_model=ProfessorResponse, status_code=status.HTTP_201_CREATED)
-def create_professor(professor: ProfessorCreate, db: Session = Depends(get_db)):
+async def create_professor(professor: ProfessorCreate, db: AsyncSession = Depends(get_db)):
     """Cria um novo professor."""
     db_professor = Professor(nome=professor.nome, email=professor.email)
     db.add(db_professor)
     try:
-        db.commit()
-        db.refresh(db_professor)
-        return db_professor
+        versoes = await reference_cache.bump(db, "professores")
+        await db.commit()
+        await db.refresh(db_professor)
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail="Email já cadastrado")
+    reference_cache.invalidate(versoes)
+    return db_professor
 
-@router.get("/", response_model=list[ProfessorResponse])
-def list_professores(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Lista todos os professores."""
-    return db.query(Professor).offset(skip).limit(limit).all()
+@router.get("/", response_model=Page[ProfessorResponse])
+async def list_professores(
+    cursor: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    expand: str | None = expand_query(EXPANSOES),
+    db: AsyncSession = Depends(get_db)
+):
+    """Lista todos os professores (servidos do cache de referência)."""
+    page = await reference_cache.page(db, "professores", cursor, limit)
+    if not parse_expand(expand, EXPANSOES):
+        return page
+    return json_response({"items": await _com_disciplinas(db, page["items"]), "next_cursor": page["next_cursor"]})
 
 @router.get("/{professor_id}", response_model=ProfessorResponse)
-def get_professor(professor_id: UUID, db: Session = Depends(get_db)):
-    """Busca um professor pelo ID."""
-    professor = db.query(Professor).filter(Professor.id == professor_id).first()
+async def get_professor(
+    professor_id: UUID,
+    expand: str | None = expand_query(EXPANSOES),
+    db: AsyncSession = Depends(get_db)
+):
+    """Busca um professor pelo ID (servido do cache de referência)."""
+    expansoes = parse_expand(expand, EXPANSOES)
+    professor = await reference_cache.get(db, "professores", professor_id)
     if not professor:
         raise HTTPException(status_code=404, detail="Professor não encontrado")
-    return professor
+    if not expansoes:
+        return professor
+    return json_response((await _com_disciplinas(db, [professor]))[0])
 
 @router.put("/{professor_id}", response_model=ProfessorResponse)
-def update_professor(professor_id: UUID, professor_data: ProfessorUpdate, db: Session = Depends(get_db)):
-    """Atualiza um professor."""
-    professor = db.query(Professor).filter(Professor.id == professor_id).first()
+async def update_professor(professor_id: UUID, professor_data: ProfessorUpdate, db: AsyncSession = Depends(get_db)):
+    """Atualiza um professor (um único UPDATE ... RETURNING)."""
+    valores = professor_data.model_dump(exclude_unset=True)
+    try:
+        professor = await update_returning(db, Professor, professor_id, valores, PROFESSOR_COLUNAS)
+        if professor and valores:
+            versoes = await reference_cache.bump(db, "professores")
+            await db.commit()
+            reference_cache.invalidate(versoes)
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Email já cadastrado")
     if not professor:
         raise HTTPException(status_code=404, detail="Professor não encontrado")
-    
-    for field, value in professor_data.model_dump(exclude_unset=True).items():
-        setattr(professor, field, value)
-    
-    db.commit()
-    db.refresh(professor)
-    return professor
+    return professor._asdict()
 
 @router.delete("/{professor_id}", response_model=MessageResponse)
-def delete_professor(professor_id: UUID, db: Session = Depends(get_db)):
-    """Remove um professor."""
-    professor = db.query(Professor).filter(Professor.id == professor_id).first()
-    if not professor:
+async def delete_professor(professor_id: UUID, db: AsyncSession = Depends(get_db)):
+    """
+    Remove um professor; as tarefas dele ficam sem professor.
+
+    Dois comandos na mesma transação: o UPDATE desvincula as tarefas tocando
+    atualizada_em (o SET NULL da FK não tocaria, e os ETags das listagens não
+    mudariam) e o DELETE remove o professor; os vínculos com disciplinas caem
+    em cascata. Sem CTE de escrita, que só o PostgreSQL aceita.
+    """
+    await db.execute(
+        update(Tarefa)
+        .where(Tarefa.professor_id == professor_id)
+        .values(professor_id=None, atualizada_em=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    if not await delete_returning(db, Professor, professor_id):
         raise HTTPException(status_code=404, detail="Professor não encontrado")
-    db.delete(professor)
-    db.commit()
+    versoes = await reference_cache.bump(db, "professores", "vinculos")
+    await db.commit()
+    reference_cache.invalidate(versoes)
     return {"message": "Professor removido com sucesso", "detail": f"ID: {professor_id}"}
 
 @router.post("/{professor_id}/disciplinas/{disciplina_id}", response_model=MessageResponse)
-def vincular_disciplina(professor_id: UUID, disciplina_id: UUID, db: Session = Depends(get_db)):
+async def vincular_disciplina(professor_id: UUID, disciplina_id: UUID, db: AsyncSession = Depends(get_db)):
     """Vincula um professor a uma disciplina."""
-    professor = db.query(Professor).filter(Professor.id == professor_id).first()
-    disciplina = db.query(Disciplina).filter(Disciplina.id == disciplina_id).first()
-    
+    professor = await db.get(Professor, professor_id)
+    disciplina = await db.get(Disciplina, disciplina_id)
+
     if not professor or not disciplina:
         raise HTTPException(status_code=404, detail="Professor ou disciplina não encontrados")
-    
+
     vinculo = ProfessorDisciplina(professor_id=professor_id, disciplina_id=disciplina_id)
     db.add(vinculo)
-    db.commit()
+    versoes = await reference_cache.bump(db, "vinculos")
+    await db.commit()
+    reference_cache.invalidate(versoes)
     return {"message": "Professor vinculado à disciplina com sucesso"}
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""Rotas de resumo (dashboard) de tarefas por aluno, turma e disciplina."""
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import engine, get_db
+from app.models import Aluno, Disciplina, ResumoTarefa, StatusTarefa, TipoTarefa, Turma
+from app.schemas import ResumoResponse
+
+router = APIRouter(tags=["Resumos"])
+
+async def _resumo(db: AsyncSession, escopo: str, escopo_id: UUID, entidade, nao_encontrado: str) -> dict:
+    """
+    Monta o resumo a partir de `resumo_tarefas`.
+
+    A tabela é mantida pelos triggers da migration 0003, então a leitura é
+    uma busca pela PK (no máximo status x tipo linhas), sem agregar tarefas.
+    Linhas zeradas são apagadas (migration 0008): sem linhas, ou a entidade
+    não tem tarefas, ou não existe.
+
+    Fora do PostgreSQL não há triggers e a tabela fica vazia: responde 501
+    em vez de zeros.
+    """
+    if engine.dialect.name != "postgresql":
+        raise HTTPException(status_code=501, detail="Resumos exigem PostgreSQL")
+
+    linhas = (await db.execute(
+        select(ResumoTarefa.status, ResumoTarefa.tipo, ResumoTarefa.quantidade, ResumoTarefa.pontos)
+        .where(ResumoTarefa.escopo == escopo, ResumoTarefa.escopo_id == escopo_id)
+    )).all()
+
+    # Sem linhas: confere se a entidade existe
+    if not linhas and not await db.get(entidade, escopo_id):
+        raise HTTPException(status_code=404, detail=nao_encontrado)
+
+    por_status = dict.fromkeys(StatusTarefa, 0)
+    por_tipo = dict.fromkeys(TipoTarefa, 0)
+    pontos = pontos_concluidos = 0
+    for linha in linhas:
+        por_status[linha.status] += linha.quantidade
+        por_tipo[linha.tipo] += linha.quantidade
+        pontos += linha.pontos
+        if linha.status == StatusTarefa.CONCLUIDA:
+            pontos_concluidos += linha.pontos
+
+    return {
+        "escopo": escopo,
+        "escopo_id": escopo_id,
+        "total": sum(por_status.values()),
+        "pontos": pontos,
+        "pontos_concluidos": pontos_concluidos,
+        "por_status": por_status,
+        "por_tipo": por_tipo,
+    }
+
+@router.get("/alunos/{aluno_id}/resumo", response_model=ResumoResponse)
+async def resumo_aluno(aluno_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Totais de tarefas e pontos de um aluno."""
+    return await _resumo(db, "aluno", aluno_id, Aluno, "Aluno não encontrado")
+
+@router.get("/turmas/{turma_id}/resumo", response_model=ResumoResponse)
+async def resumo_turma(turma_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Totais de tarefas e pontos dos alunos de uma turma."""
+    return await _resumo(db, "turma", turma_id, Turma, "Turma não encontrada")
+
+@router.get("/disciplinas/{disciplina_id}/resumo", response_model=ResumoResponse)
+async def resumo_disciplina(disciplina_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Totais de tarefas e pontos de uma disciplina."""
+    return await _resumo(db, "disciplina", disciplina_id, Disciplina, "Disciplina não encontrada")
@@ -1,76 +1,457 @@
 """Rotas CRUD para Tarefas."""
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
 from datetime import datetime
+from enum import Enum
+from typing import Annotated, Any, Literal
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from database import get_db
-from app.models import Tarefa, StatusTarefa
-from app.schemas import TarefaCreate, TarefaUpdate, TarefaResponse, MessageResponse
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Double, and_, cast, delete, func, insert, literal, literal_column, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db, stream_rows
+from app.conditional import make_etag, not_modified
+from app.crud import delete_returning, response_columns, update_returning
+from app.config import get_settings
+from app.fieldsets import FIELDS_QUERY, expand_query, parse_expand, parse_fields, project
+from app.models import Aluno, Disciplina, Professor, Tarefa, StatusTarefa
+from app.pagination import build_page, decode_rank_cursor, encode_rank_cursor, paginate
+from app.reference_cache import reference_cache
+from app.responses import json_response, row_dict
+from app.routes.alunos import ALUNO_COLUNAS
+from app.schemas import (
+    TarefaCreate, TarefaUpdate, TarefaResponse, TarefaBulkResponse,
+    TarefaStatusBulk, TarefaStatusBulkResponse, TarefaDeleteBulkResponse, TarefaBuscaResponse,
+    MessageResponse, Page
+)
+
+settings = get_settings()
 
 router = APIRouter(prefix="/tarefas", tags=["Tarefas"])
 
+# Colunas expostas em TarefaResponse (usadas em RETURNING e projeções Core)
+TAREFA_COLUNAS = response_columns(Tarefa, TarefaResponse)
+
+# Relacionamentos expansíveis com ?expand= -> coluna de FK na tarefa
+EXPANSOES = {"aluno": Tarefa.aluno_id, "disciplina": Tarefa.disciplina_id, "professor": Tarefa.professor_id}
+# Expansões servidas pelo cache de referência -> conjunto no cache
+EXPANSOES_CACHE = {"disciplina": "disciplinas", "professor": "professores"}
+
+# Coluna tsvector gerada pelo banco (migration 0006); fica fora do modelo
+# para que o ORM nunca a carregue nem tente gravá-la
+BUSCA = literal_column("tarefas.busca")
+BUSCA_CONFIG = literal_column("'portuguese'::regconfig")
+
 @router.post("/", response_model=TarefaResponse, status_code=status.HTTP_201_CREATED)
-def create_tarefa(tarefa: TarefaCreate, db: Session = Depends(get_db)):
+async def create_tarefa(tarefa: TarefaCreate, db: AsyncSession = Depends(get_db)):
     """Cria uma nova tarefa."""
     db_tarefa = Tarefa(**tarefa.model_dump())
     db.add(db_tarefa)
-    db.commit()
-    db.refresh(db_tarefa)
+    await db.commit()
+    await db.refresh(db_tarefa)
     return db_tarefa
 
-@router.get("/", response_model=list[TarefaResponse])
-def list_tarefas(
-    skip: int = 0, 
-    limit: int = 100, 
+def _status_timestamps(novo_status: StatusTarefa) -> dict:
+    """
+    Colunas de data a preencher na transição de status, calculadas no banco.
+
+    Só preenche iniciada_em/concluida_em se ainda estiverem nulas.
+    """
+    if novo_status == StatusTarefa.EM_ANDAMENTO:
+        return {"iniciada_em": func.coalesce(Tarefa.iniciada_em, func.now())}
+    if novo_status == StatusTarefa.CONCLUIDA:
+        return {"concluida_em": func.coalesce(Tarefa.concluida_em, func.now())}
+    return {}
+
+def _filtro_tarefas(
+    ids: list[UUID] | None = None,
+    aluno_id: UUID | None = None,
+    turma_id: UUID | None = None,
+    disciplina_id: UUID | None = None,
+    professor_id: UUID | None = None,
+    status_atual: StatusTarefa | None = None,
+) -> list:
+    """
+    Condições WHERE das operações em lote.
+
+    Raises:
+        HTTPException: 400 se nenhum critério for informado
+    """
+    condicoes = []
+    if ids:
+        condicoes.append(Tarefa.id.in_(ids))
+    if aluno_id:
+        condicoes.append(Tarefa.aluno_id == aluno_id)
+    if turma_id:
+        condicoes.append(Tarefa.aluno_id.in_(select(Aluno.id).where(Aluno.turma_id == turma_id)))
+    if disciplina_id:
+        condicoes.append(Tarefa.disciplina_id == disciplina_id)
+    if professor_id:
+        condicoes.append(Tarefa.professor_id == professor_id)
+    if status_atual:
+        condicoes.append(Tarefa.status == status_atual)
+    if not condicoes:
+        raise HTTPException(status_code=400, detail="Informe ids ou ao menos um filtro")
+    return condicoes
+
+async def _expandir(db: AsyncSession, rows: list, itens: list[dict], expansoes: list[str]) -> None:
+    """
+    Anexa a cada item os relacionamentos pedidos em `expand`.
+
+    O custo é por página, não por linha: alunos vêm de uma única consulta
+    com IN nos ids da página; disciplina e professor vêm do cache de
+    referência, sem consulta.
+    """
+    if "aluno" in expansoes:
+        ids = {row.aluno_id for row in rows}
+        alunos = {
+            aluno.id: aluno._asdict()
+            for aluno in await db.execute(select(*ALUNO_COLUNAS).where(Aluno.id.in_(ids)))
+        } if ids else {}
+        for row, item in zip(rows, itens):
+            item["aluno"] = alunos.get(row.aluno_id)
+
+    for nome, conjunto in EXPANSOES_CACHE.items():
+        if nome not in expansoes:
+            continue
+        coluna = EXPANSOES[nome].key
+        relacionados = await reference_cache.get_many(db, conjunto, {getattr(row, coluna) for row in rows})
+        for row, item in zip(rows, itens):
+            relacionado = relacionados.get(getattr(row, coluna))
+            item[nome] = relacionado.model_dump() if relacionado else None
+
+def _versoes_expansoes(expansoes: list[str]) -> list[int]:
+    """Versões do cache de referência que entram no ETag das expansões."""
+    return [reference_cache.version(EXPANSOES_CACHE[nome]) for nome in expansoes if nome in EXPANSOES_CACHE]
+
+@router.post("/bulk", response_model=TarefaBulkResponse, status_code=status.HTTP_201_CREATED)
+async def create_tarefas_bulk(
+    tarefas: Annotated[list[TarefaCreate], Body(min_length=1, max_length=settings.bulk_max_items)],
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Cria várias tarefas em uma única transação.
+
+    As FKs do lote são validadas com uma única query e as linhas válidas
+    são inseridas com INSERT ... RETURNING de várias linhas. Itens com FK
+    inexistente são reportados individualmente e não impedem os demais.
+
+    Se uma referência for removida entre a validação e o INSERT, nada é
+    criado: responde 409 com os itens válidos marcados como falha, para o
+    cliente reenviar o lote.
+    """
+    aluno_ids = {t.aluno_id for t in tarefas}
+    disciplina_ids = {t.disciplina_id for t in tarefas}
+    professor_ids = {t.professor_id for t in tarefas}
+    existentes = await db.execute(
+        select(literal("aluno"), Aluno.id).where(Aluno.id.in_(aluno_ids))
+        .union_all(
+            select(literal("disciplina"), Disciplina.id).where(Disciplina.id.in_(disciplina_ids)),
+            select(literal("professor"), Professor.id).where(Professor.id.in_(professor_ids)),
+        )
+    )
+    encontrados = {(tipo, item_id) for tipo, item_id in existentes}
+
+    results: list[dict] = []
+    validas: list[tuple[int, dict]] = []
+    for index, tarefa in enumerate(tarefas):
+        if ("aluno", tarefa.aluno_id) not in encontrados:
+            results.append({"index": index, "ok": False, "error": "Aluno não encontrado"})
+        elif ("disciplina", tarefa.disciplina_id) not in encontrados:
+            results.append({"index": index, "ok": False, "error": "Disciplina não encontrada"})
+        elif ("professor", tarefa.professor_id) not in encontrados:
+            results.append({"index": index, "ok": False, "error": "Professor não encontrado"})
+        else:
+            validas.append((index, tarefa.model_dump()))
+
+    if validas:
+        try:
+            criadas = (await db.execute(
+                insert(Tarefa).returning(*TAREFA_COLUNAS, sort_by_parameter_order=True),
+                [dados for _, dados in validas],
+            )).all()
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            response.status_code = status.HTTP_409_CONFLICT
+            for index, _ in validas:
+                results.append({"index": index, "ok": False, "error": "Referência removida durante a criação; reenvie o lote"})
+            validas = []
+        else:
+            for (index, _), row in zip(validas, criadas):
+                results.append({"index": index, "ok": True, "tarefa": row})
+
+    results.sort(key=lambda item: item["index"])
+    return {"created": len(validas), "failed": len(tarefas) - len(validas), "results": results}
+
+@router.post("/status", response_model=TarefaStatusBulkResponse)
+async def update_status_bulk(transicao: TarefaStatusBulk, db: AsyncSession = Depends(get_db)):
+    """
+    Move várias tarefas para um novo status com um único UPDATE.
+
+    Mantém a regra de update_tarefa: iniciada_em/concluida_em só são
+    preenchidas se estiverem nulas, usando o now() do banco. Tarefas que já
+    estão no status de destino não são tocadas.
+    """
+    condicoes = _filtro_tarefas(**transicao.model_dump(exclude={"status"}))
+    stmt = (
+        update(Tarefa)
+        .where(*condicoes, Tarefa.status != transicao.status)
+        .values(status=transicao.status, **_status_timestamps(transicao.status))
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    return {"status": transicao.status, "updated": result.rowcount}
+
+@router.delete("/", response_model=TarefaDeleteBulkResponse)
+async def delete_tarefas_bulk(
+    ids: list[UUID] | None = Query(None),
+    aluno_id: UUID | None = None,
+    turma_id: UUID | None = None,
+    disciplina_id: UUID | None = None,
+    professor_id: UUID | None = None,
+    status: StatusTarefa | None = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Remove as tarefas que atendem aos filtros com um único DELETE.
+
+    Mesmos critérios de update_status_bulk (`ids` e/ou filtros); sem nenhum
+    critério responde 400, para não apagar a tabela inteira por engano.
+    """
+    condicoes = _filtro_tarefas(ids, aluno_id, turma_id, disciplina_id, professor_id, status)
+    stmt = delete(Tarefa).where(*condicoes).execution_options(synchronize_session=False)
+    result = await db.execute(stmt)
+    await db.commit()
+    return {"deleted": result.rowcount}
+
+@router.get("/", response_model=Page[TarefaResponse])
+async def list_tarefas(
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    aluno_id: UUID | None = None,
+    status: StatusTarefa | None = None,
+    fields: str | None = FIELDS_QUERY,
+    expand: str | None = expand_query(EXPANSOES),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Lista tarefas com filtros opcionais.
+
+    O ETag vem da própria página (ids e atualizada_em dos itens, e se há
+    próxima página): criar, alterar ou remover uma tarefa da página, ou tirá-la
+    do filtro, muda o validador. O custo é o da página, não o do filtro
+    inteiro. Se o cliente já tem a versão atual, responde 304 sem montar o
+    corpo nem as expansões. Não há Last-Modified: uma data máxima não percebe
+    remoções.
+
+    A página é lida como linhas Core e codificada direto com orjson, sem
+    criar objetos ORM nem revalidar cada item em TarefaResponse. Com
+    `fields`, só as colunas pedidas entram no SELECT (ex: sem `descricao`).
+    Com `expand`, cada relacionamento custa no máximo uma consulta por página.
+    """
+    campos = parse_fields(fields, TAREFA_COLUNAS)
+    expansoes = parse_expand(expand, EXPANSOES)
+    filtros = []
+    if aluno_id:
+        filtros.append(Tarefa.aluno_id == aluno_id)
+    if status:
+        filtros.append(Tarefa.status == status)
+
+    colunas = project(
+        TAREFA_COLUNAS, campos, Tarefa.criada_em, Tarefa.atualizada_em, *[EXPANSOES[nome] for nome in expansoes]
+    )
+    query = paginate(select(*colunas).where(*filtros), Tarefa.criada_em, Tarefa.id, cursor, limit)
+    page = build_page((await db.execute(query)).all(), limit, "criada_em")
+
+    alunos_em = None
+    if "aluno" in expansoes and page["items"]:
+        # Alteração em um aluno expandido também invalida a página
+        ids = {row.aluno_id for row in page["items"]}
+        alunos_em = await db.scalar(select(func.max(Aluno.atualizado_em)).where(Aluno.id.in_(ids)))
+    etag = make_etag(
+        request.url.query,
+        [(row.id, row.atualizada_em) for row in page["items"]],
+        page["next_cursor"],
+        alunos_em,
+        *_versoes_expansoes(expansoes),
+    )
+    if (resposta := not_modified(request, response, etag)) is not None:
+        return resposta
+
+    itens = [row_dict(row, campos) for row in page["items"]]
+    await _expandir(db, page["items"], itens, expansoes)
+    return json_response({"items": itens, "next_cursor": page["next_cursor"]}, response)
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+async def _export_ndjson(query) -> AsyncIterator[str]:
+    async for rows in stream_rows(query, settings.export_chunk_size):
+        yield "".join(
+            json.dumps({k: _export_value(v) for k, v in row._mapping.items()}, ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+async def _export_csv(query) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([coluna.name for coluna in TAREFA_COLUNAS])
+    async for rows in stream_rows(query, settings.export_chunk_size):
+        for row in rows:
+            writer.writerow(["" if v is None else _export_value(v) for v in row])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Só o cabeçalho, quando não há linhas
+    if buffer.tell():
+        yield buffer.getvalue()
+
+@router.get("/export")
+async def export_tarefas(
+    formato: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
     aluno_id: UUID | None = None,
     status: StatusTarefa | None = None,
-    db: Session = Depends(get_db)
 ):
-    """Lista tarefas com filtros opcionais."""
-    query = db.query(Tarefa)
+    """
+    Exporta tarefas em NDJSON ou CSV via streaming.
+
+    Usa cursor do lado do servidor e gera a resposta lote a lote, então a
+    memória fica constante independentemente do número de linhas.
+    """
+    query = select(*TAREFA_COLUNAS)
     if aluno_id:
         query = query.filter(Tarefa.aluno_id == aluno_id)
     if status:
         query = query.filter(Tarefa.status == status)
-    return query.offset(skip).limit(limit).all()
+    query = query.order_by(Tarefa.criada_em, Tarefa.id)
+
+    if formato == "csv":
+        return StreamingResponse(
+            _export_csv(query),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="tarefas.csv"'},
+        )
+    return StreamingResponse(
+        _export_ndjson(query),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="tarefas.ndjson"'},
+    )
+
+@router.get("/busca", response_model=Page[TarefaBuscaResponse])
+async def search_tarefas(
+    q: str = Query(..., min_length=2, max_length=200, description='Termos; aceita "frase exata", OR e -exclusão'),
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    aluno_id: UUID | None = None,
+    status: StatusTarefa | None = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Busca textual no título e na descrição, do mais ao menos relevante.
+
+    Usa a coluna `busca` (tsvector em português, título com peso maior) e o
+    índice GIN: o custo depende de quantas tarefas casam, não do tamanho da
+    tabela. Para termos muito comuns, só as `SEARCH_MAX_CANDIDATES` tarefas
+    mais recentes que casam são ordenadas; o corte tem ordem determinística,
+    então todas as páginas do cursor enxergam o mesmo conjunto.
+    """
+    termo = func.websearch_to_tsquery(BUSCA_CONFIG, q)
+    filtros = [BUSCA.op("@@")(termo)]
+    if aluno_id:
+        filtros.append(Tarefa.aluno_id == aluno_id)
+    if status:
+        filtros.append(Tarefa.status == status)
+
+    candidatos = (
+        select(Tarefa.id).where(*filtros)
+        .order_by(Tarefa.criada_em.desc(), Tarefa.id)
+        .limit(settings.search_max_candidates)
+        .subquery()
+    )
+    ranqueadas = (
+        # ts_rank devolve real (float4); em float8 o valor volta exato no cursor
+        select(*TAREFA_COLUNAS, cast(func.ts_rank(BUSCA, termo), Double).label("relevancia"))
+        .join(candidatos, candidatos.c.id == Tarefa.id)
+        .subquery()
+    )
+    query = select(ranqueadas)
+    if cursor:
+        relevancia, item_id = decode_rank_cursor(cursor)
+        query = query.where(or_(
+            ranqueadas.c.relevancia < relevancia,
+            and_(ranqueadas.c.relevancia == relevancia, ranqueadas.c.id > item_id),
+        ))
+    query = query.order_by(ranqueadas.c.relevancia.desc(), ranqueadas.c.id).limit(limit + 1)
+
+    rows = (await db.execute(query)).all()
+    itens = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_rank_cursor(itens[-1].relevancia, itens[-1].id)
+    return json_response({"items": [row_dict(row) for row in itens], "next_cursor": next_cursor})
 
 @router.get("/{tarefa_id}", response_model=TarefaResponse)
-def get_tarefa(tarefa_id: UUID, db: Session = Depends(get_db)):
-    """Busca uma tarefa pelo ID."""
-    tarefa = db.query(Tarefa).filter(Tarefa.id == tarefa_id).first()
+async def get_tarefa(
+    tarefa_id: UUID,
+    request: Request,
+    response: Response,
+    fields: str | None = FIELDS_QUERY,
+    expand: str | None = expand_query(EXPANSOES),
+    db: AsyncSession = Depends(get_db)
+):
+    """Busca uma tarefa pelo ID (responde 304 se não mudou desde o ETag do cliente)."""
+    campos = parse_fields(fields, TAREFA_COLUNAS)
+    expansoes = parse_expand(expand, EXPANSOES)
+    colunas = project(TAREFA_COLUNAS, campos, Tarefa.atualizada_em, *[EXPANSOES[nome] for nome in expansoes])
+    tarefa = (await db.execute(select(*colunas).where(Tarefa.id == tarefa_id))).first()
     if not tarefa:
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
-    return tarefa
+
+    item = row_dict(tarefa, campos)
+    await _expandir(db, [tarefa], [item], expansoes)
+    aluno_em = item["aluno"]["atualizado_em"] if item.get("aluno") else None
+    etag = make_etag(tarefa.id, tarefa.atualizada_em, campos, expansoes, aluno_em, *_versoes_expansoes(expansoes))
+    last_modified = None if expansoes else tarefa.atualizada_em
+    if (resposta := not_modified(request, response, etag, last_modified)) is not None:
+        return resposta
+    return json_response(item, response)
 
 @router.put("/{tarefa_id}", response_model=TarefaResponse)
-def update_tarefa(tarefa_id: UUID, tarefa_data: TarefaUpdate, db: Session = Depends(get_db)):
-    """Atualiza uma tarefa."""
-    tarefa = db.query(Tarefa).filter(Tarefa.id == tarefa_id).first()
-    if not tarefa:
-        raise HTTPException(status_code=404, detail="Tarefa não encontrada")
-    
+async def update_tarefa(tarefa_id: UUID, tarefa_data: TarefaUpdate, db: AsyncSession = Depends(get_db)):
+    """
+    Atualiza uma tarefa com um único UPDATE ... RETURNING.
+
+    Timestamps de status seguem a regra de _status_timestamps: calculados no
+    banco e preenchidos só se ainda estiverem nulos.
+    """
     update_data = tarefa_data.model_dump(exclude_unset=True)
-    
-    # Atualizar timestamps de status
     if "status" in update_data:
-        if update_data["status"] == StatusTarefa.EM_ANDAMENTO and not tarefa.iniciada_em:
-            update_data["iniciada_em"] = datetime.now()
-        elif update_data["status"] == StatusTarefa.CONCLUIDA and not tarefa.concluida_em:
-            update_data["concluida_em"] = datetime.now()
-    
-    for field, value in update_data.items():
-        setattr(tarefa, field, value)
-    
-    db.commit()
-    db.refresh(tarefa)
-    return tarefa
+        update_data.update(_status_timestamps(update_data["status"]))
 
-@router.delete("/{tarefa_id}", response_model=MessageResponse)
-def delete_tarefa(tarefa_id: UUID, db: Session = Depends(get_db)):
-    """Remove uma tarefa."""
-    tarefa = db.query(Tarefa).filter(Tarefa.id == tarefa_id).first()
+    tarefa = await update_returning(db, Tarefa, tarefa_id, update_data, TAREFA_COLUNAS)
+    await db.commit()
     if not tarefa:
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
-    db.delete(tarefa)
-    db.commit()
+    return tarefa._asdict()
+
+@router.delete("/{tarefa_id}", response_model=MessageResponse)
+async def delete_tarefa(tarefa_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Remove uma tarefa (um único DELETE ... RETURNING)."""
+    if not await delete_returning(db, Tarefa, tarefa_id):
+        raise HTTPException(status_code=404, detail="Tarefa não encontrada")
+    await db.commit()
     return {"message": "Tarefa removida com sucesso", "detail": f"ID: {tarefa_id}"}
\ No newline at end of file
@@ -1,57 +1,109 @@
 """Rotas CRUD para Turmas."""
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from database import get_db
-from app.models import Turma
-from app.schemas import TurmaCreate, TurmaResponse, MessageResponse
+from auth import invalidate_principals
+from app.crud import delete_returning, response_columns, update_returning
+from app.models import Aluno, StatusTarefa, Tarefa, Turma
+from app.reference_cache import reference_cache
+from app.routes.tarefas import TAREFA_COLUNAS
+from app.schemas import (
+    TurmaCreate, TurmaResponse, TarefaTurmaCreate, TarefaTurmaResponse,
+    MessageResponse, Page
+)
 
 router = APIRouter(prefix="/turmas", tags=["Turmas"])
 
+TURMA_COLUNAS = response_columns(Turma, TurmaResponse)
+
 @router.post("/", response_model=TurmaResponse, status_code=status.HTTP_201_CREATED)
-def create_turma(turma: TurmaCreate, db: Session = Depends(get_db)):
+async def create_turma(turma: TurmaCreate, db: AsyncSession = Depends(get_db)):
     """Cria uma nova turma."""
     db_turma = Turma(nome=turma.nome)
     db.add(db_turma)
     try:
-        db.commit()
-        db.refresh(db_turma)
-        return db_turma
+        versoes = await reference_cache.bump(db, "turmas")
+        await db.commit()
+        await db.refresh(db_turma)
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail="Erro ao criar turma")
+    reference_cache.invalidate(versoes)
+    return db_turma
 
-@router.get("/", response_model=list[TurmaResponse])
-def list_turmas(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Lista todas as turmas."""
-    return db.query(Turma).offset(skip).limit(limit).all()
+@router.get("/", response_model=Page[TurmaResponse])
+async def list_turmas(
+    cursor: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+    """Lista todas as turmas (servidas do cache de referência)."""
+    return await reference_cache.page(db, "turmas", cursor, limit)
 
 @router.get("/{turma_id}", response_model=TurmaResponse)
-def get_turma(turma_id: UUID, db: Session = Depends(get_db)):
-    """Busca uma turma pelo ID."""
-    turma = db.query(Turma).filter(Turma.id == turma_id).first()
+async def get_turma(turma_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Busca uma turma pelo ID (servida do cache de referência)."""
+    turma = await reference_cache.get(db, "turmas", turma_id)
     if not turma:
         raise HTTPException(status_code=404, detail="Turma não encontrada")
     return turma
 
 @router.put("/{turma_id}", response_model=TurmaResponse)
-def update_turma(turma_id: UUID, turma_data: TurmaCreate, db: Session = Depends(get_db)):
-    """Atualiza uma turma."""
-    turma = db.query(Turma).filter(Turma.id == turma_id).first()
+async def update_turma(turma_id: UUID, turma_data: TurmaCreate, db: AsyncSession = Depends(get_db)):
+    """Atualiza uma turma (um único UPDATE ... RETURNING)."""
+    turma = await update_returning(db, Turma, turma_id, turma_data.model_dump(), TURMA_COLUNAS)
     if not turma:
         raise HTTPException(status_code=404, detail="Turma não encontrada")
-    turma.nome = turma_data.nome
-    db.commit()
-    db.refresh(turma)
-    return turma
+    versoes = await reference_cache.bump(db, "turmas")
+    await db.commit()
+    reference_cache.invalidate(versoes)
+    return turma._asdict()
 
 @router.delete("/{turma_id}", response_model=MessageResponse)
-def delete_turma(turma_id: UUID, db: Session = Depends(get_db)):
-    """Remove uma turma."""
-    turma = db.query(Turma).filter(Turma.id == turma_id).first()
-    if not turma:
+async def delete_turma(turma_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Remove uma turma e, em cascata no banco, os alunos e as tarefas deles."""
+    # Emails dos alunos que a cascata vai remover, para tirá-los do cache de principals
+    emails = (await db.scalars(select(Aluno.email).where(Aluno.turma_id == turma_id))).all()
+    if not await delete_returning(db, Turma, turma_id):
+        raise HTTPException(status_code=404, detail="Turma não encontrada")
+    versoes = await reference_cache.bump(db, "turmas")
+    await db.commit()
+    reference_cache.invalidate(versoes)
+    invalidate_principals(*emails)
+    return {"message": "Turma removida com sucesso", "detail": f"ID: {turma_id}"}
+
+@router.post("/{turma_id}/tarefas", response_model=TarefaTurmaResponse, status_code=status.HTTP_201_CREATED)
+async def atribuir_tarefa_turma(turma_id: UUID, tarefa: TarefaTurmaCreate, db: AsyncSession = Depends(get_db)):
+    """
+    Cria a mesma tarefa para todos os alunos da turma.
+
+    Usa um único INSERT ... SELECT a partir de `alunos`, então o custo em
+    round trips não depende do tamanho da turma.
+    """
+    colunas = Tarefa.__table__.c
+    campos = tarefa.model_dump()
+    selecao = select(
+        func.gen_random_uuid(),
+        Aluno.id,
+        *[literal(valor, colunas[nome].type) for nome, valor in campos.items()],
+        literal(StatusTarefa.PENDENTE, colunas.status.type),
+    ).where(Aluno.turma_id == turma_id)
+    stmt = (
+        insert(Tarefa)
+        .from_select(["id", "aluno_id", *campos, "status"], selecao)
+        .returning(*TAREFA_COLUNAS)
+    )
+    try:
+        criadas = (await db.execute(stmt)).all()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Disciplina ou professor não encontrados")
+
+    # Nenhuma linha: turma vazia ou inexistente
+    if not criadas and not await db.get(Turma, turma_id):
         raise HTTPException(status_code=404, detail="Turma não encontrada")
-    db.delete(turma)
-    db.commit()
-    return {"message": "Turma removida com sucesso", "detail": f"ID: {turma_id}"}
\ No newline at end of file
+    return {"turma_id": turma_id, "created": len(criadas), "tarefas": criadas}
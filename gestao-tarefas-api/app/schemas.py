@@ -1,9 +1,12 @@
 """Schemas Pydantic para validação de dados."""
 from datetime import datetime
+from typing import Generic, TypeVar
 from uuid import UUID
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
 from app.models import TipoTarefa, StatusTarefa
 
+T = TypeVar("T")
+
 # ============ SCHEMAS: TURMA ============
 class TurmaBase(BaseModel):
     nome: str = Field(..., min_length=2, max_length=255)
@@ -95,6 +98,11 @@ class TarefaCreate(TarefaBase):
     disciplina_id: UUID
     professor_id: UUID
 
+class TarefaTurmaCreate(TarefaBase):
+    """Modelo de tarefa replicado para todos os alunos de uma turma."""
+    disciplina_id: UUID
+    professor_id: UUID
+
 class TarefaUpdate(BaseModel):
     tipo: TipoTarefa | None = None
     titulo: str | None = Field(None, min_length=2, max_length=255)
@@ -108,13 +116,66 @@ class TarefaResponse(TarefaBase):
     id: UUID
     aluno_id: UUID
     disciplina_id: UUID
-    professor_id: UUID
+    # Nulo quando o professor foi removido
+    professor_id: UUID | None
     status: StatusTarefa
     iniciada_em: datetime | None
     concluida_em: datetime | None
     criada_em: datetime
     atualizada_em: datetime
 
+class TarefaBulkItem(BaseModel):
+    index: int
+    ok: bool
+    tarefa: TarefaResponse | None = None
+    error: str | None = None
+
+class TarefaBulkResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[TarefaBulkItem]
+
+class TarefaTurmaResponse(BaseModel):
+    turma_id: UUID
+    created: int
+    tarefas: list[TarefaResponse]
+
+class TarefaStatusBulk(BaseModel):
+    """Transição de status em lote: por lista de ids e/ou por filtros."""
+    status: StatusTarefa
+    ids: list[UUID] | None = Field(None, min_length=1)
+    aluno_id: UUID | None = None
+    turma_id: UUID | None = None
+    disciplina_id: UUID | None = None
+    professor_id: UUID | None = None
+    status_atual: StatusTarefa | None = None
+
+class TarefaStatusBulkResponse(BaseModel):
+    status: StatusTarefa
+    updated: int
+
+class TarefaDeleteBulkResponse(BaseModel):
+    deleted: int
+
+class TarefaBuscaResponse(TarefaResponse):
+    """Tarefa encontrada pela busca textual, com a relevância para o termo."""
+    relevancia: float
+
+# ============ SCHEMAS: RESUMO ============
+class ResumoResponse(BaseModel):
+    escopo: str
+    escopo_id: UUID
+    total: int
+    pontos: int
+    pontos_concluidos: int
+    por_status: dict[StatusTarefa, int]
+    por_tipo: dict[TipoTarefa, int]
+
+# ============ SCHEMAS: PAGINACAO ============
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
 # ============ SCHEMAS: MENSAGENS ============
 class MessageResponse(BaseModel):
     message: str
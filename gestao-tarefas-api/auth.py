@@ -3,25 +3,61 @@ Módulo de autenticação e autorização JWT.
 Contém funções para hash de senha, criação/validação de tokens e dependências de segurança.
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache, partial
+from typing import Any, Callable, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import TTLCache
 from app.config import get_settings
+from app.crud import response_columns
 from database import get_db
 from app.models import Aluno
-from app.schemas import TokenData
+from app.schemas import AlunoResponse, TokenData
 
 # Configurações
 settings = get_settings()
 
-# Contexto para hash de senha usando bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def _pwd_context():
+    """
+    Contexto para hash de senha usando bcrypt.
+
+    Criado no primeiro uso: passlib só serve ao login e ao cadastro, então
+    fica fora do import da app e do startup.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# Executor exclusivo para bcrypt: um pico de logins não ocupa o threadpool
+# usado pelas rotas nem bloqueia o event loop
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="bcrypt",
+)
+
+# Jobs de senha em execução ou na fila do executor (só alterado no event loop)
+_password_jobs = 0
+
+# Alunos já resolvidos a partir do token (AlunoResponse, sem sessão),
+# indexados pelo subject (email). As rotas que alteram ou removem alunos
+# tiram os emails afetados do cache deste worker; nos outros workers a
+# entrada antiga vale até expirar (PRINCIPAL_CACHE_TTL_SECONDS, curto).
+principal_cache = TTLCache(
+    maxsize=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl_seconds,
+)
+_PRINCIPAL_COLUNAS = response_columns(Aluno, AlunoResponse)
 
 # Esquema OAuth2 para Bearer token (JWT)
 # tokenUrl é o endpoint de login
@@ -39,7 +75,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True se a senha corresponder, False caso contrário
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return _pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
@@ -52,7 +88,41 @@ def get_password_hash(password: str) -> str:
     Returns:
         Hash bcrypt da senha
     """
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
+
+
+async def _run_password_job(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Executa uma função de bcrypt no executor dedicado.
+
+    Raises:
+        HTTPException: 503 se a fila do executor estiver cheia
+    """
+    global _password_jobs
+    limite = settings.password_hash_workers + settings.password_hash_queue_limit
+    if _password_jobs >= limite:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado, tente novamente em instantes",
+            headers={"Retry-After": "1"},
+        )
+
+    _password_jobs += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(password_executor, partial(fn, *args))
+    finally:
+        _password_jobs -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Versão de `verify_password` que roda fora do event loop."""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Versão de `get_password_hash` que roda fora do event loop."""
+    return await _run_password_job(get_password_hash, password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -112,10 +182,17 @@ def decode_token(token: str) -> Optional[dict]:
         return None
 
 
+def invalidate_principals(*emails: str | None) -> None:
+    """Remove do cache deste worker os alunos alterados/removidos."""
+    for email in emails:
+        if email:
+            principal_cache.pop(email)
+
+
 async def get_current_aluno(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> Aluno:
+    db: AsyncSession = Depends(get_db)
+) -> AlunoResponse:
     """
     Dependência FastAPI que obtém o aluno atual a partir do token JWT.
     Usada para proteger endpoints.
@@ -125,7 +202,7 @@ async def get_current_aluno(
         db: Sessão do banco de dados
         
     Returns:
-        Objeto Aluno autenticado
+        Dados do aluno autenticado (sem senha)
         
     Raises:
         HTTPException: 401 se token inválido ou aluno não encontrado
@@ -155,12 +232,17 @@ async def get_current_aluno(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Busca o aluno no banco
+    # Busca o aluno no cache e, se ausente, no banco
     token_data = TokenData(email=email)
-    aluno = db.query(Aluno).filter(Aluno.email == token_data.email).first()
-    
+    aluno = principal_cache.get(token_data.email)
     if aluno is None:
-        raise credentials_exception
+        linha = (await db.execute(
+            select(*_PRINCIPAL_COLUNAS).where(Aluno.email == token_data.email)
+        )).first()
+        if linha is None:
+            raise credentials_exception
+        aluno = AlunoResponse.model_validate(linha)
+        principal_cache.set(token_data.email, aluno)
     
     # Verifica se o aluno está ativo (se tiver campo is_active)
     # if hasattr(aluno, 'is_active') and not aluno.is_active:
@@ -173,8 +255,8 @@ async def get_current_aluno(
 
 
 async def get_current_active_aluno(
-    current_aluno: Aluno = Depends(get_current_aluno)
-) -> Aluno:
+    current_aluno: AlunoResponse = Depends(get_current_aluno)
+) -> AlunoResponse:
     """
     Versão estendida que verifica se o aluno está ativo.
     (Para usar quando implementar soft delete/desativação)
@@ -184,7 +266,7 @@ async def get_current_active_aluno(
     return current_aluno
 
 
-def authenticate_aluno(db: Session, email: str, password: str) -> Optional[Aluno]:
+async def authenticate_aluno(db: AsyncSession, email: str, password: str) -> Optional[Aluno]:
     """
     Autentica um aluno verificando email e senha.
     
@@ -196,12 +278,12 @@ def authenticate_aluno(db: Session, email: str, password: str) -> Optional[Aluno
     Returns:
         Aluno autenticado ou None se falhar
     """
-    aluno = db.query(Aluno).filter(Aluno.email == email).first()
+    aluno = await db.scalar(select(Aluno).where(Aluno.email == email))
     
     if not aluno:
         return None
     
-    if not verify_password(password, aluno.senha_hash):
+    if not await verify_password_async(password, aluno.senha_hash):
         return None
     
     return aluno
\ No newline at end of file
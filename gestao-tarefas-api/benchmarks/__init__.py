@@ -0,0 +1,5 @@
+"""
+Benchmark de carga e latência da API.
+
+Execute a partir da raiz do projeto: python -m benchmarks --help
+"""
@@ -0,0 +1,224 @@
+"""
+Executa o benchmark e compara com uma linha de base.
+
+Exemplos (na raiz do projeto, com DATABASE_URL apontando para um banco só
+de benchmark):
+
+    python -m benchmarks --tarefas 1000 --salvar benchmarks/baselines/1k.json
+    python -m benchmarks --tarefas 1000 --comparar benchmarks/baselines/1k.json
+    python -m benchmarks --url http://localhost:8000 --tarefas 1000000 --concorrencia 64
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from benchmarks.dataset import Amostra, amostra, preparar, volume_para
+from benchmarks.mix import Cenario, escolher
+
+
+def _percentil(ordenados: list[float], q: float) -> float:
+    """Percentil por posição (nearest-rank) de uma lista já ordenada."""
+    return ordenados[min(len(ordenados) - 1, int(q * len(ordenados)))]
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    cenarios: list[Cenario],
+    dados: Amostra,
+    rng: random.Random,
+    fim: float,
+    medir_de: float,
+    latencias: dict[str, list[float]],
+    erros: dict[str, int],
+) -> None:
+    pesos = [cenario.peso for cenario in cenarios]
+    while (agora := time.perf_counter()) < fim:
+        cenario = rng.choices(cenarios, weights=pesos)[0]
+        metodo, url, kwargs = cenario.montar(rng, dados)
+        inicio = time.perf_counter()
+        try:
+            resposta = await client.request(metodo, url, **kwargs)
+            falhou = resposta.status_code >= 400
+        except httpx.HTTPError:
+            falhou = True
+        segundos = time.perf_counter() - inicio
+        # Aquecimento: enche caches e pools sem entrar no resultado
+        if agora < medir_de:
+            continue
+        latencias[cenario.nome].append(segundos)
+        if falhou:
+            erros[cenario.nome] += 1
+
+
+async def executar(args, cenarios: list[Cenario], dados: Amostra) -> tuple[dict, float]:
+    latencias: dict[str, list[float]] = defaultdict(list)
+    erros: dict[str, int] = defaultdict(int)
+
+    async def rodar(client: httpx.AsyncClient) -> float:
+        inicio = time.perf_counter()
+        medir_de = inicio + args.aquecimento
+        fim = medir_de + args.duracao
+        await asyncio.gather(*(
+            _worker(client, cenarios, dados, random.Random(args.semente + i), fim, medir_de, latencias, erros)
+            for i in range(args.concorrencia)
+        ))
+        return time.perf_counter() - medir_de
+
+    limites = httpx.Limits(max_connections=args.concorrencia)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, limits=limites, timeout=60) as client:
+            segundos = await rodar(client)
+    else:
+        # Em processo: a mesma app do uvicorn, sem rede nem servidor HTTP
+        from app.app import app
+
+        # Exceções viram 500 (contadas como erro) em vez de derrubar o benchmark
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+                segundos = await rodar(client)
+
+    resultados = {}
+    for nome, valores in sorted(latencias.items()):
+        valores.sort()
+        resultados[nome] = {
+            "requisicoes": len(valores),
+            "erros": erros[nome],
+            "rps": round(len(valores) / segundos, 2),
+            "p50_ms": round(_percentil(valores, 0.50) * 1000, 3),
+            "p95_ms": round(_percentil(valores, 0.95) * 1000, 3),
+            "p99_ms": round(_percentil(valores, 0.99) * 1000, 3),
+        }
+    return resultados, segundos
+
+
+def imprimir(resultados: dict, segundos: float) -> None:
+    print(f"\n{'endpoint':<28}{'reqs':>8}{'erros':>7}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for nome, r in resultados.items():
+        print(
+            f"{nome:<28}{r['requisicoes']:>8}{r['erros']:>7}{r['rps']:>10.1f}"
+            f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+        )
+    total = sum(r["requisicoes"] for r in resultados.values())
+    print(f"\nTotal: {total} requisições em {segundos:.1f}s = {total / segundos:.1f} req/s")
+
+
+def _variacao(atual: float, anterior: float) -> float:
+    return atual / anterior - 1 if anterior else 0.0
+
+
+def comparar(resultados: dict, base: dict, tolerancia: float, min_amostras: int) -> bool:
+    """
+    Compara p50, p95 e vazão de cada endpoint com a linha de base.
+
+    O p99 não entra: com algumas centenas de amostras ele é decidido por
+    duas ou três requisições e varia muito entre execuções. Endpoints com
+    menos de `min_amostras` requisições (na base ou agora) são listados mas
+    não comparados.
+
+    Retorna False se algum endpoint piorou além da tolerância (ex: 0.2 = 20%).
+    """
+    if base["parametros"]["tamanho"] != resultados["parametros"]["tamanho"]:
+        print("⚠️  A linha de base usou outra massa de dados; a comparação não é direta.")
+    ok = True
+    print(
+        f"\n{'endpoint':<28}{'p50 base':>10}{'p50 agora':>11}{'Δ p50':>8}"
+        f"{'p95 base':>10}{'p95 agora':>11}{'Δ p95':>8}{'req/s base':>12}{'req/s agora':>13}{'Δ req/s':>9}"
+    )
+    for nome, atual in resultados["endpoints"].items():
+        anterior = base["endpoints"].get(nome)
+        if anterior is None:
+            print(f"{nome:<28}{'(novo)':>10}")
+            continue
+        amostras = min(atual["requisicoes"], anterior["requisicoes"])
+        if amostras < min_amostras:
+            print(f"{nome:<28}{f'(só {amostras} amostras, mínimo {min_amostras})':>40}")
+            continue
+        delta_p50 = _variacao(atual["p50_ms"], anterior["p50_ms"])
+        delta_p95 = _variacao(atual["p95_ms"], anterior["p95_ms"])
+        delta_rps = _variacao(atual["rps"], anterior["rps"])
+        piorou = delta_p50 > tolerancia or delta_p95 > tolerancia or delta_rps < -tolerancia
+        ok = ok and not piorou
+        print(
+            f"{nome:<28}{anterior['p50_ms']:>10.2f}{atual['p50_ms']:>11.2f}{delta_p50:>+8.0%}"
+            f"{anterior['p95_ms']:>10.2f}{atual['p95_ms']:>11.2f}{delta_p95:>+8.0%}"
+            f"{anterior['rps']:>12.1f}{atual['rps']:>13.1f}{delta_rps:>+9.0%}"
+            f"{'  ❌ regressão' if piorou else ''}"
+        )
+    return ok
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de carga e latência da API")
+    parser.add_argument("--tarefas", type=int, default=1000, help="Tarefas na massa de dados (ex: 1000 a 1000000)")
+    parser.add_argument("--alunos", type=int, help="Alunos (padrão: tarefas/20)")
+    parser.add_argument("--semente", type=int, default=42, help="Semente dos dados e da sequência de requisições")
+    parser.add_argument(
+        "--recriar", action="store_true",
+        help="APAGA as tabelas do banco e recarrega a massa (necessário se o banco já tem outros dados)",
+    )
+    parser.add_argument("--url", help="Servidor já rodando (ex: http://localhost:8000); padrão: app em processo")
+    parser.add_argument("--duracao", type=float, default=120.0, help="Segundos medidos")
+    parser.add_argument("--aquecimento", type=float, default=3.0, help="Segundos iniciais descartados")
+    parser.add_argument("--concorrencia", type=int, default=16, help="Requisições simultâneas")
+    parser.add_argument("--cenarios", nargs="*", help="Só estes cenários (ex: 'GET /tarefas/{id}')")
+    parser.add_argument("--salvar", type=Path, help="Grava o resultado em JSON (linha de base)")
+    parser.add_argument("--comparar", type=Path, help="Compara com uma linha de base salva")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Piora aceita na comparação (0.2 = 20%%)")
+    parser.add_argument(
+        "--min-amostras", type=int, default=100,
+        help="Requisições mínimas de um endpoint (na base e agora) para entrar na comparação",
+    )
+    args = parser.parse_args()
+
+    volume = volume_para(args.tarefas, args.alunos)
+    cenarios = escolher(args.cenarios)
+    preparar(volume, args.semente, args.recriar)
+    dados = amostra()
+
+    print(f"🏁 {len(cenarios)} cenários, concorrência {args.concorrencia}, {args.duracao:.0f}s "
+          f"({'servidor ' + args.url if args.url else 'em processo'})")
+    endpoints, segundos = asyncio.run(executar(args, cenarios, dados))
+    imprimir(endpoints, segundos)
+
+    resultados = {
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "parametros": {
+            "tamanho": asdict(volume),
+            "semente": args.semente,
+            "duracao": args.duracao,
+            "concorrencia": args.concorrencia,
+            "modo": args.url or "em processo",
+        },
+        "endpoints": endpoints,
+    }
+    if args.salvar:
+        args.salvar.parent.mkdir(parents=True, exist_ok=True)
+        args.salvar.write_text(json.dumps(resultados, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"💾 Resultado salvo em {args.salvar}")
+    if args.comparar:
+        base = json.loads(args.comparar.read_text(encoding="utf-8"))
+        if not comparar(resultados, base, args.tolerancia, args.min_amostras):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Massa de dados do benchmark, com tamanho configurável e semente fixa."""
+import uuid
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import func, select
+
+from app.models import Aluno, Disciplina, Professor, Tarefa, Turma
+from database import engine
+from seeds import DOMINIO_SINTETICO, VolumeSintetico, gerar_sintetico, limpar_sintetico
+
+
+def volume_para(tarefas: int, alunos: int | None = None) -> VolumeSintetico:
+    """Proporções de uma faculdade: ~20 tarefas por aluno, ~40 alunos por turma."""
+    alunos = alunos or max(10, tarefas // 20)
+    return VolumeSintetico(
+        turmas=max(1, alunos // 40),
+        alunos=alunos,
+        disciplinas=max(4, min(200, alunos // 50)),
+        professores=max(4, min(300, alunos // 40)),
+        tarefas=tarefas,
+    )
+
+
+@dataclass
+class Amostra:
+    """Ids existentes usados para montar as requisições."""
+    alunos: list[uuid.UUID]
+    emails: list[str]
+    tarefas: list[uuid.UUID]
+    turmas: list[uuid.UUID]
+    disciplinas: list[uuid.UUID]
+
+
+def _contagens(conn) -> dict[str, int]:
+    return {
+        nome: conn.scalar(select(func.count()).select_from(modelo))
+        for nome, modelo in (
+            ("tarefas", Tarefa), ("alunos", Aluno), ("turmas", Turma),
+            ("disciplinas", Disciplina), ("professores", Professor),
+        )
+    }
+
+
+def preparar(volume: VolumeSintetico, semente: int = 42, recriar: bool = False) -> None:
+    """
+    Garante a massa de dados no tamanho pedido.
+
+    Se as contagens já batem, reaproveita o que está no banco (carregar 1M
+    de tarefas leva minutos). Banco vazio recebe a carga direto; um banco
+    com outros dados só é apagado com `recriar=True` (--recriar), para o
+    benchmark nunca esvaziar por engano o banco da aplicação.
+    """
+    with engine.connect() as conn:
+        contagens = _contagens(conn)
+    if not recriar and contagens == asdict(volume):
+        print(f"♻️  Reaproveitando massa de dados: {asdict(volume)}")
+        return
+    if not any(contagens.values()):
+        print(f"🌱 Carregando massa de dados: {asdict(volume)}")
+    elif not recriar:
+        raise SystemExit(
+            f"❌ O banco {engine.url.render_as_string(hide_password=True)} já tem dados {contagens}, "
+            f"diferentes da massa pedida {asdict(volume)}.\n"
+            "   Use um banco só para o benchmark e rode com --recriar para apagá-lo e recarregar."
+        )
+    else:
+        print(f"🧹 Apagando o banco e recriando massa de dados: {asdict(volume)}")
+        limpar_sintetico()
+    gerar_sintetico(volume, semente)
+
+
+def amostra(limite: int = 5_000) -> Amostra:
+    """Ids para as requisições (os primeiros por id, que é aleatório)."""
+    with engine.connect() as conn:
+        def ids(modelo):
+            return list(conn.scalars(select(modelo.id).order_by(modelo.id).limit(limite)))
+
+        alunos = conn.execute(select(Aluno.id, Aluno.email).order_by(Aluno.id).limit(limite)).all()
+        return Amostra(
+            alunos=[linha.id for linha in alunos],
+            emails=[linha.email for linha in alunos if linha.email.endswith(f"@{DOMINIO_SINTETICO}")],
+            tarefas=ids(Tarefa),
+            turmas=ids(Turma),
+            disciplinas=ids(Disciplina),
+        )
@@ -0,0 +1,75 @@
+"""
+Mistura de requisições do benchmark.
+
+Os pesos imitam o uso do app: o aluno abre a lista das próprias tarefas,
+abre uma tarefa, muda o status; as telas carregam os dados de referência;
+o login é raro, mas caro (bcrypt).
+"""
+import random
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from benchmarks.dataset import Amostra
+from seeds import SENHA_SINTETICA
+
+A = "/api/v1"
+STATUS = ("PENDENTE", "EM_ANDAMENTO", "CONCLUIDA")
+# Termos da busca textual, de muito comuns a raros
+BUSCAS = ("lista de exercícios", "sql", "redes neurais", '"árvores binárias"', "normalização -sql")
+
+
+@dataclass(frozen=True)
+class Cenario:
+    nome: str
+    peso: int
+    # (rng, amostra) -> (método, url, kwargs do httpx)
+    montar: Callable[[random.Random, Amostra], tuple[str, str, dict]]
+
+
+CENARIOS = [
+    Cenario(
+        "POST /auth/login", 2,
+        lambda rng, a: ("POST", f"{A}/auth/login", {"data": {"username": rng.choice(a.emails), "password": SENHA_SINTETICA}}),
+    ),
+    Cenario(
+        "GET /tarefas?aluno_id", 25,
+        lambda rng, a: ("GET", f"{A}/tarefas/", {"params": {"aluno_id": str(rng.choice(a.alunos)), "limit": 50}}),
+    ),
+    Cenario(
+        "GET /tarefas?status", 8,
+        lambda rng, a: ("GET", f"{A}/tarefas/", {"params": {"status": rng.choice(STATUS), "limit": 50}}),
+    ),
+    Cenario(
+        "GET /tarefas/{id}", 25,
+        lambda rng, a: ("GET", f"{A}/tarefas/{rng.choice(a.tarefas)}", {}),
+    ),
+    Cenario(
+        "PUT /tarefas/{id}", 10,
+        lambda rng, a: ("PUT", f"{A}/tarefas/{rng.choice(a.tarefas)}", {"json": {"status": rng.choice(STATUS)}}),
+    ),
+    Cenario(
+        "GET /tarefas/busca", 3,
+        lambda rng, a: ("GET", f"{A}/tarefas/busca", {"params": {"q": rng.choice(BUSCAS)}}),
+    ),
+    Cenario(
+        "GET /alunos/{id}/resumo", 5,
+        lambda rng, a: ("GET", f"{A}/alunos/{rng.choice(a.alunos)}/resumo", {}),
+    ),
+    Cenario(
+        "GET /alunos/{id}", 3,
+        lambda rng, a: ("GET", f"{A}/alunos/{rng.choice(a.alunos)}", {}),
+    ),
+    Cenario("GET /turmas", 8, lambda rng, a: ("GET", f"{A}/turmas/", {})),
+    Cenario("GET /disciplinas", 8, lambda rng, a: ("GET", f"{A}/disciplinas/", {})),
+    Cenario("GET /professores", 6, lambda rng, a: ("GET", f"{A}/professores/", {"params": {"expand": "disciplinas"}})),
+]
+
+
+def escolher(nomes: list[str] | None) -> list[Cenario]:
+    """Cenários filtrados por nome (todos se `nomes` for vazio)."""
+    if not nomes:
+        return CENARIOS
+    desconhecidos = set(nomes) - {cenario.nome for cenario in CENARIOS}
+    if desconhecidos:
+        raise SystemExit(f"Cenários desconhecidos: {', '.join(sorted(desconhecidos))}")
+    return [cenario for cenario in CENARIOS if cenario.nome in nomes]
@@ -0,0 +1,69 @@
+"""
+Mede o cold start da API: processo novo, import da app e lifespan até o
+ponto de aceitar requisições (schema conferido, réplicas medidas, pool aquecido).
+
+    python -m benchmarks.startup --vezes 5
+    python -m benchmarks.startup --orcamento 2.5   # sai com código 1 se a mediana passar
+
+Cada rodada é um interpretador novo, como um worker do uvicorn subindo.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from app.config import get_settings
+
+# Roda no processo filho: sobe a app, anota o instante em que ficou pronta e encerra
+_FILHO = """
+import asyncio, json, time
+from app.app import app, inicializacao
+
+async def main():
+    async with app.router.lifespan_context(app):
+        pronto = time.time()
+    return pronto
+
+pronto = asyncio.run(main())
+print(json.dumps({"pronto": pronto, "fases": inicializacao}))
+"""
+
+
+def rodada() -> dict[str, float]:
+    """Um cold start: segundos por fase, mais o total desde o spawn do processo."""
+    inicio = time.time()
+    saida = subprocess.run([sys.executable, "-c", _FILHO], capture_output=True, text=True)
+    if saida.returncode != 0:
+        raise SystemExit(f"A app não subiu:\n{saida.stderr}")
+    resultado = json.loads(saida.stdout.strip().splitlines()[-1])
+    fases = resultado["fases"]
+    fases["processo"] = resultado["pronto"] - inicio
+    return fases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o tempo de startup da API")
+    parser.add_argument("--vezes", type=int, default=5, help="Rodadas (cada uma num processo novo)")
+    parser.add_argument(
+        "--orcamento", type=float, default=get_settings().startup_budget_seconds,
+        help="Segundos aceitos para a mediana do cold start (padrão: STARTUP_BUDGET_SECONDS)",
+    )
+    args = parser.parse_args()
+
+    rodadas = [rodada() for _ in range(args.vezes)]
+    print(f"\n{'fase':<14}{'mediana ms':>12}{'máximo ms':>12}")
+    for fase in rodadas[0]:
+        valores = [r.get(fase, 0.0) for r in rodadas]
+        print(f"{fase:<14}{statistics.median(valores) * 1000:>12.0f}{max(valores) * 1000:>12.0f}")
+
+    mediana = statistics.median(r["processo"] for r in rodadas)
+    if mediana > args.orcamento:
+        print(f"\n❌ Cold start de {mediana:.2f}s, acima do orçamento de {args.orcamento:.2f}s")
+        sys.exit(1)
+    print(f"\n✅ Cold start de {mediana:.2f}s (orçamento {args.orcamento:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,329 @@
 """Configuração do banco de dados SQLAlchemy."""
-from collections.abc import Generator
-from sqlalchemy import create_engine
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Iterator, Sequence
+from typing import Any
+from sqlalchemy import Row, Select, create_engine, event, func, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import sessionmaker, Session, DeclarativeBase
+from sqlalchemy.sql.functions import now
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 from app.config import get_settings
+from app.profiler import instrument_engine
+from app.pool_stats import InstrumentedAsyncPool, InstrumentedQueuePool, instrument
+from app.replicas import Replica, ReplicaSet, leitura_replica
+from migrations import schema_migrations
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
+@compiles(now, "sqlite")
+def _now_sqlite(element, compiler, **kw) -> str:
+    """
+    now() no SQLite com o mesmo texto que o SQLAlchemy grava nos parâmetros.
+
+    CURRENT_TIMESTAMP tem resolução de segundos e sai sem a fração: comparado
+    como texto com um datetime vindo de um cursor, os itens do mesmo segundo
+    ficavam de fora da página seguinte, e uma alteração no mesmo segundo não
+    mudava o ETag.
+    """
+    return "(strftime('%Y-%m-%d %H:%M:%f000', 'now'))"
+
+def _sqlite_foreign_keys(sync_engine) -> None:
+    """
+    Liga as FKs em cada conexão SQLite (vêm desligadas): as remoções contam
+    com os ON DELETE do banco para apagar ou desvincular os dependentes.
+    """
+    if sync_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _ligar(dbapi_conn, _registro):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+def _pool_options(url: str, poolclass) -> dict:
+    """Parâmetros do pool vindos das settings (o SQLite usa o pool padrão)."""
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+# Engine síncrona: usada pelas rotas no modo padrão e por seeds/migrations
 engine = create_engine(
     settings.database_url,
-    pool_pre_ping=True,
-    echo=settings.debug
+    echo=settings.db_echo,
+    **_pool_options(settings.database_url, InstrumentedQueuePool)
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine assíncrona: usada pelas rotas quando DB_ASYNC=true
+async_engine = create_async_engine(
+    settings.async_url,
+    echo=settings.db_echo,
+    **_pool_options(settings.async_url, InstrumentedAsyncPool)
+) if settings.db_async else None
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False
+) if settings.db_async else None
+
+_sqlite_foreign_keys(engine)
+if async_engine is not None:
+    _sqlite_foreign_keys(async_engine.sync_engine)
+
+def _connect_timeout(url: str) -> dict:
+    """Timeout de conexão: réplica fora do ar falha rápido em vez de prender a requisição."""
+    segundos = max(1, round(settings.db_replica_check_seconds))
+    if url.startswith("postgresql+asyncpg"):
+        return {"timeout": segundos}
+    if url.startswith("postgresql"):
+        return {"connect_timeout": segundos}
+    return {}
+
+def _replica(nome: str, url: str) -> Replica:
+    """Engine e sessões de uma réplica, no mesmo modo (e pool) das rotas."""
+    if settings.db_async:
+        replica_engine = create_async_engine(
+            url,
+            echo=settings.db_echo,
+            connect_args=_connect_timeout(url),
+            **_pool_options(url, InstrumentedAsyncPool)
+        )
+        return Replica(nome, replica_engine, async_sessionmaker(replica_engine, autoflush=False, expire_on_commit=False))
+    replica_engine = create_engine(
+        url,
+        echo=settings.db_echo,
+        connect_args=_connect_timeout(url),
+        **_pool_options(url, InstrumentedQueuePool)
+    )
+    return Replica(nome, replica_engine, sessionmaker(autocommit=False, autoflush=False, bind=replica_engine))
+
+# Réplicas de leitura (vazio = todas as rotas no primário)
+replicas = ReplicaSet(
+    [_replica(f"replica{indice}", url) for indice, url in enumerate(settings.replica_urls)],
+    settings.db_replica_max_lag_seconds,
+)
+
+# Engine síncrona de cada pool, por nome
+_pools = {"sync": engine}
+if async_engine is not None:
+    _pools["async"] = async_engine.sync_engine
+_pools.update({replica.nome: replica.sync_engine for replica in replicas.replicas})
+
+# Contadores dos pools, expostos em GET /admin/pool
+pool_stats = {nome: instrument(pool_engine) for nome, pool_engine in _pools.items()}
+
+# Profiler de SQL por requisição (também alimenta o GET /metrics)
+for pool_engine in _pools.values():
+    instrument_engine(pool_engine)
+
+def pool_status() -> dict:
+    """Estado atual de cada pool (conexões em uso, overflow, esperas)."""
+    return {nome: stats.snapshot(_pools[nome].pool) for nome, stats in pool_stats.items()}
+
 class Base(DeclarativeBase):
     """Classe base para modelos SQLAlchemy."""
     pass
 
-def get_db() -> Generator[Session, None, None]:
-    """Dependency que fornece sessão do banco de dados."""
-    db = SessionLocal()
+class ThreadedSession:
+    """
+    Session síncrona com a mesma interface awaitable da AsyncSession.
+
+    Cada chamada que faz I/O roda no threadpool, então as rotas podem ser
+    `async def` nos dois modos. Só ocupa uma thread enquanto a query roda,
+    não durante a requisição inteira.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance: Any) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances: Any) -> None:
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, statement, params, **kwargs)
+
+    async def scalar(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, params, **kwargs)
+
+    async def scalars(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalars, statement, params, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def delete(self, instance: Any) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def refresh(self, instance: Any, attribute_names=None) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, attribute_names)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+    async def run_sync(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency que fornece sessão do banco de dados.
+
+    No modo assíncrono entrega uma AsyncSession; no modo padrão entrega uma
+    ThreadedSession, que tem a mesma interface. Leituras liberadas pelo
+    ReplicaRoutingMiddleware usam uma réplica saudável, se houver.
+    """
+    replica = replicas.escolher() if leitura_replica.get() else None
+    if settings.db_async:
+        async with (replica.sessions if replica else AsyncSessionLocal)() as db:
+            yield db
+        return
+
+    db = ThreadedSession((replica.sessions if replica else SessionLocal)(expire_on_commit=False))
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+async def stream_rows(statement: Select, chunk_size: int) -> AsyncIterator[Sequence[Row]]:
+    """
+    Executa a consulta com cursor do lado do servidor, em lotes de linhas.
+
+    Abre a própria conexão (não depende da sessão da requisição), então pode
+    ser consumida por um StreamingResponse depois que a rota retornou. A
+    memória usada é a de um lote, qualquer que seja o total de linhas.
+    """
+    replica = replicas.escolher() if leitura_replica.get() else None
+    if settings.db_async:
+        async with (replica.engine if replica else async_engine).connect() as conn:
+            result = await conn.stream(statement.execution_options(yield_per=chunk_size))
+            async for partition in result.partitions():
+                yield partition
+        return
+
+    def _partitions() -> Iterator[Sequence[Row]]:
+        with (replica.engine if replica else engine).connect() as conn:
+            result = conn.execution_options(yield_per=chunk_size).execute(statement)
+            yield from result.partitions()
+
+    partitions = _partitions()
+    try:
+        async for partition in iterate_in_threadpool(partitions):
+            yield partition
+    finally:
+        # Cliente desconectou ou terminou: devolve a conexão ao pool
+        await run_in_threadpool(partitions.close)
+
+async def ping() -> None:
+    """Executa um SELECT 1 na engine usada pelas rotas."""
+    if settings.db_async:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return
+
+    def _ping() -> None:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    await run_in_threadpool(_ping)
+
+async def fetch_all(statement) -> Sequence[Row]:
+    """Executa uma consulta curta fora de qualquer sessão de requisição."""
+    if settings.db_async:
+        async with async_engine.connect() as conn:
+            return (await conn.execute(statement)).all()
+
+    def _fetch() -> Sequence[Row]:
+        with engine.connect() as conn:
+            return conn.execute(statement).all()
+
+    return await run_in_threadpool(_fetch)
+
+def _versao_schema(conn) -> int:
+    """Maior versão registrada em schema_migrations (0 se a tabela não existe)."""
+    if not inspect(conn).has_table(schema_migrations.name):
+        return 0
+    return conn.scalar(select(func.max(schema_migrations.c.versao))) or 0
+
+async def schema_version() -> int:
+    """Versão do schema do banco, lida com uma conexão da engine das rotas."""
+    if settings.db_async:
+        async with async_engine.connect() as conn:
+            return await conn.run_sync(_versao_schema)
+
+    def _ler() -> int:
+        with engine.connect() as conn:
+            return _versao_schema(conn)
+
+    return await run_in_threadpool(_ler)
+
+async def _aquecer(pool_engine, conexoes: int) -> int:
+    """Abre `conexoes` conexões ao mesmo tempo e as devolve ao pool."""
+    if isinstance(pool_engine, AsyncEngine):
+        abertas = await asyncio.gather(*(pool_engine.connect().start() for _ in range(conexoes)), return_exceptions=True)
+        ok = [conn for conn in abertas if not isinstance(conn, BaseException)]
+        await asyncio.gather(*(conn.close() for conn in ok))
+    else:
+        abertas = await asyncio.gather(*(run_in_threadpool(pool_engine.connect) for _ in range(conexoes)), return_exceptions=True)
+        ok = [conn for conn in abertas if not isinstance(conn, BaseException)]
+        for conn in ok:
+            conn.close()
+    if len(ok) < conexoes:
+        erro = next(conn for conn in abertas if isinstance(conn, BaseException))
+        logger.warning("Pré-aquecimento do pool abriu %d de %d conexões: %s", len(ok), conexoes, erro)
+    return len(ok)
+
+async def warm_pools() -> dict[str, int]:
+    """
+    Abre `DB_POOL_PREWARM` conexões no pool das rotas e no de cada réplica
+    saudável, para que as primeiras requisições não paguem o connect (TCP,
+    TLS e autenticação). Retorna as conexões abertas por pool.
+    """
+    conexoes = min(settings.db_pool_prewarm, settings.db_pool_size)
+    if conexoes <= 0 or engine.dialect.name == "sqlite":
+        return {}
+    pools = {"async" if settings.db_async else "sync": async_engine if settings.db_async else engine}
+    pools.update({replica.nome: replica.engine for replica in replicas.replicas if replica.saudavel})
+    abertas = await asyncio.gather(*(_aquecer(pool_engine, conexoes) for pool_engine in pools.values()))
+    return dict(zip(pools, abertas))
+
+async def dispose_engines() -> None:
+    """Fecha as conexões abertas dos pools."""
+    for replica in replicas.replicas:
+        if settings.db_async:
+            await replica.engine.dispose()
+        else:
+            replica.engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
 
 def create_tables() -> None:
-    """Cria todas as tabelas no banco de dados."""
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    """
+    Cria as tabelas dos modelos que ainda não existem (só para testes e
+    bancos descartáveis; o schema de verdade vem de `python migrate.py`).
+    """
+    Base.metadata.create_all(bind=engine)
@@ -0,0 +1,96 @@
+"""
+Script para aplicar as migrations pendentes do banco de dados.
+Execute: docker compose exec api python migrate.py
+Ou: python migrate.py (se estiver com ambiente local)
+
+Use --status para apenas listar a versão atual e as migrations pendentes.
+"""
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Connection
+
+from database import engine
+from migrations import Migration, carregar_migrations, metadata, schema_migrations
+
+# Chave arbitrária do advisory lock que serializa execuções concorrentes
+MIGRATIONS_LOCK_ID = 73112025
+
+
+def versao_atual(conn: Connection) -> int:
+    """Retorna a maior versão aplicada (0 se nenhuma)."""
+    versoes = conn.execute(select(schema_migrations.c.versao)).scalars().all()
+    return max(versoes, default=0)
+
+
+def pendentes(conn: Connection) -> list[Migration]:
+    """Lista as migrations ainda não aplicadas."""
+    aplicadas = set(conn.execute(select(schema_migrations.c.versao)).scalars())
+    return [m for m in carregar_migrations() if m.versao not in aplicadas]
+
+
+def _registrar(conn: Connection, migration: Migration) -> None:
+    conn.execute(schema_migrations.insert().values(
+        versao=migration.versao,
+        descricao=migration.descricao,
+    ))
+
+
+def _aplicar(migration: Migration) -> None:
+    if migration.transacional:
+        with engine.begin() as conn:
+            migration.upgrade(conn)
+            _registrar(conn, migration)
+        return
+
+    with engine.connect() as conn:
+        autocommit = conn.execution_options(isolation_level="AUTOCOMMIT")
+        migration.upgrade(autocommit)
+        _registrar(autocommit, migration)
+
+
+def upgrade() -> int:
+    """Aplica todas as migrations pendentes e retorna a versão final."""
+    with engine.begin() as conn:
+        metadata.create_all(conn, checkfirst=True)
+
+    with engine.connect() as lock_conn:
+        # Evita que dois processos (ex: deploy com várias réplicas) migrem juntos
+        if engine.dialect.name == "postgresql":
+            lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATIONS_LOCK_ID})
+            lock_conn.commit()
+        try:
+            with engine.connect() as conn:
+                lista = pendentes(conn)
+            for migration in lista:
+                print(f"⏫ Aplicando {migration.versao:04d} - {migration.descricao}")
+                _aplicar(migration)
+        finally:
+            if engine.dialect.name == "postgresql":
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATIONS_LOCK_ID})
+                lock_conn.commit()
+
+    with engine.connect() as conn:
+        return versao_atual(conn)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Aplica as migrations do banco de dados")
+    parser.add_argument("--status", action="store_true", help="Apenas mostra a versão atual e as pendentes")
+    args = parser.parse_args()
+
+    if args.status:
+        with engine.begin() as conn:
+            metadata.create_all(conn, checkfirst=True)
+            print(f"📌 Versão atual: {versao_atual(conn)}")
+            for migration in pendentes(conn):
+                print(f"   pendente: {migration.versao:04d} - {migration.descricao}")
+        return
+
+    versao = upgrade()
+    print(f"✅ Banco na versão {versao}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Schema inicial (tabelas que antes eram criadas apenas pelo create_tables)."""
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, MetaData, String, Table, Text, func
+from sqlalchemy.dialects.postgresql import UUID
+
+DESCRICAO = "schema inicial"
+
+# Snapshot do schema na época desta migration. Não importar app.models aqui:
+# os modelos evoluem, as migrations antigas não.
+metadata = MetaData()
+
+Table(
+    "turmas", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("nome", String(255), nullable=False),
+    Column("criada_em", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "alunos", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("nome", String(255), nullable=False),
+    Column("email", String(255), unique=True, nullable=False, index=True),
+    Column("senha_hash", String(255), nullable=False),
+    Column("turma_id", ForeignKey("turmas.id"), nullable=False),
+    Column("criado_em", DateTime(timezone=True), server_default=func.now()),
+    Column("atualizado_em", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "disciplinas", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("nome", String(255), nullable=False),
+    Column("codigo", String(50), nullable=True),
+    Column("criada_em", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "professores", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("nome", String(255), nullable=False),
+    Column("email", String(255), unique=True, nullable=True),
+    Column("criado_em", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "professor_disciplina", metadata,
+    Column("professor_id", ForeignKey("professores.id"), primary_key=True),
+    Column("disciplina_id", ForeignKey("disciplinas.id"), primary_key=True),
+)
+
+Table(
+    "tarefas", metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("aluno_id", ForeignKey("alunos.id"), nullable=False),
+    Column("tipo", Enum("ATIVIDADE", "PROJETO", name="tipotarefa"), nullable=False),
+    Column("titulo", String(255), nullable=False),
+    Column("descricao", Text, nullable=True),
+    Column("disciplina_id", ForeignKey("disciplinas.id"), nullable=False),
+    Column("professor_id", ForeignKey("professores.id"), nullable=False),
+    Column("pontos", Integer, nullable=False),
+    Column("data_entrega", DateTime(timezone=True), nullable=False),
+    Column("status", Enum("PENDENTE", "EM_ANDAMENTO", "CONCLUIDA", name="statustarefa")),
+    Column("iniciada_em", DateTime(timezone=True), nullable=True),
+    Column("concluida_em", DateTime(timezone=True), nullable=True),
+    Column("criada_em", DateTime(timezone=True), server_default=func.now()),
+    Column("atualizada_em", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+def upgrade(conn) -> None:
+    metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,26 @@
+"""Índices para os filtros de tarefas, paginação por cursor e lados das FKs."""
+from sqlalchemy import text
+
+DESCRICAO = "indices de tarefas, alunos e professor_disciplina"
+
+# CREATE INDEX CONCURRENTLY não pode rodar dentro de uma transação
+TRANSACIONAL = False
+
+INDICES = [
+    ("ix_tarefas_aluno_status_entrega", "tarefas", "aluno_id, status, data_entrega"),
+    ("ix_tarefas_criada_em_id", "tarefas", "criada_em, id"),
+    ("ix_tarefas_aluno_criada_em_id", "tarefas", "aluno_id, criada_em, id"),
+    ("ix_tarefas_status_criada_em_id", "tarefas", "status, criada_em, id"),
+    ("ix_tarefas_disciplina_id", "tarefas", "disciplina_id"),
+    ("ix_tarefas_professor_id", "tarefas", "professor_id"),
+    ("ix_alunos_turma_id", "alunos", "turma_id"),
+    ("ix_alunos_criado_em_id", "alunos", "criado_em, id"),
+    ("ix_professor_disciplina_disciplina_id", "professor_disciplina", "disciplina_id"),
+]
+
+
+def upgrade(conn) -> None:
+    # No PostgreSQL o índice é criado sem bloquear escritas na tabela
+    concurrently = "CONCURRENTLY " if conn.dialect.name == "postgresql" else ""
+    for nome, tabela, colunas in INDICES:
+        conn.execute(text(f"CREATE INDEX {concurrently}IF NOT EXISTS {nome} ON {tabela} ({colunas})"))
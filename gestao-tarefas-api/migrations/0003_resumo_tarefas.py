@@ -0,0 +1,156 @@
+"""
+Tabela resumo_tarefas mantida por triggers.
+
+Triggers por comando (FOR EACH STATEMENT) com tabelas de transição em
+`tarefas`: um INSERT/UPDATE/DELETE em lote gera um único upsert agregado no
+resumo, em vez de um por linha. Em `alunos`, triggers por linha movem os
+totais da turma quando o aluno troca de turma ou é removido.
+"""
+from sqlalchemy import text
+
+DESCRICAO = "resumo de tarefas por aluno, turma e disciplina"
+
+TABELA = """
+CREATE TABLE IF NOT EXISTS resumo_tarefas (
+    escopo VARCHAR(20) NOT NULL,
+    escopo_id UUID NOT NULL,
+    status statustarefa NOT NULL,
+    tipo tipotarefa NOT NULL,
+    quantidade INTEGER NOT NULL DEFAULT 0,
+    pontos BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (escopo, escopo_id, status, tipo)
+)
+"""
+
+
+def _deltas(tabela: str, sinal: str) -> str:
+    """Linhas de variação (+1/-1) de uma tabela de transição para os três escopos."""
+    return f"""
+        SELECT 'aluno' AS escopo, t.aluno_id AS escopo_id, t.status, t.tipo,
+               {sinal}1 AS quantidade, {sinal}t.pontos AS pontos
+          FROM {tabela} t
+        UNION ALL
+        SELECT 'disciplina', t.disciplina_id, t.status, t.tipo, {sinal}1, {sinal}t.pontos
+          FROM {tabela} t
+        UNION ALL
+        SELECT 'turma', a.turma_id, t.status, t.tipo, {sinal}1, {sinal}t.pontos
+          FROM {tabela} t JOIN alunos a ON a.id = t.aluno_id
+    """
+
+
+def _upsert(deltas: str) -> str:
+    """
+    Soma as variações agregadas no resumo, ignorando as que se anulam.
+
+    As linhas entram na ordem da PK, então dois comandos concorrentes travam
+    as linhas do resumo na mesma ordem e não entram em deadlock.
+    """
+    return f"""
+        INSERT INTO resumo_tarefas AS r (escopo, escopo_id, status, tipo, quantidade, pontos)
+        SELECT escopo, escopo_id, status, tipo, sum(quantidade), sum(pontos)
+          FROM ({deltas}) d
+         GROUP BY escopo, escopo_id, status, tipo
+        HAVING sum(quantidade) <> 0 OR sum(pontos) <> 0
+         ORDER BY escopo, escopo_id, status, tipo
+        ON CONFLICT (escopo, escopo_id, status, tipo) DO UPDATE
+           SET quantidade = r.quantidade + EXCLUDED.quantidade,
+               pontos = r.pontos + EXCLUDED.pontos
+    """
+
+
+FUNCAO_TAREFAS = f"""
+CREATE OR REPLACE FUNCTION resumo_tarefas_aplicar() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {_upsert(_deltas("novas", ""))};
+    ELSIF TG_OP = 'DELETE' THEN
+        {_upsert(_deltas("antigas", "-"))};
+    ELSE
+        {_upsert(_deltas("novas", "") + " UNION ALL " + _deltas("antigas", "-"))};
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+# BEFORE DELETE: o aluno ainda existe, então os totais saem da turma aqui.
+# Os DELETEs em cascata de tarefas que vierem depois não acham mais o aluno
+# no JOIN e só atualizam os escopos aluno/disciplina.
+FUNCAO_ALUNOS = f"""
+CREATE OR REPLACE FUNCTION resumo_tarefas_mover_turma() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        {_upsert('''
+            SELECT 'turma' AS escopo, OLD.turma_id AS escopo_id, status, tipo,
+                   -quantidade AS quantidade, -pontos AS pontos
+              FROM resumo_tarefas
+             WHERE escopo = 'aluno' AND escopo_id = OLD.id
+        ''')};
+        RETURN OLD;
+    END IF;
+
+    IF NEW.turma_id IS DISTINCT FROM OLD.turma_id THEN
+        {_upsert('''
+            SELECT 'turma' AS escopo, OLD.turma_id AS escopo_id, status, tipo,
+                   -quantidade AS quantidade, -pontos AS pontos
+              FROM resumo_tarefas
+             WHERE escopo = 'aluno' AND escopo_id = OLD.id
+            UNION ALL
+            SELECT 'turma', NEW.turma_id, status, tipo, quantidade, pontos
+              FROM resumo_tarefas
+             WHERE escopo = 'aluno' AND escopo_id = OLD.id
+        ''')};
+    END IF;
+    RETURN NEW;
+END;
+$$
+"""
+
+FUNCAO_RECALCULAR = f"""
+CREATE OR REPLACE FUNCTION resumo_tarefas_recalcular() RETURNS void
+LANGUAGE plpgsql AS $$
+BEGIN
+    LOCK TABLE tarefas IN SHARE MODE;
+    DELETE FROM resumo_tarefas;
+    {_upsert(_deltas("tarefas", ""))};
+END;
+$$
+"""
+
+TRIGGERS = [
+    "DROP TRIGGER IF EXISTS tarefas_resumo_insert ON tarefas",
+    """CREATE TRIGGER tarefas_resumo_insert AFTER INSERT ON tarefas
+       REFERENCING NEW TABLE AS novas
+       FOR EACH STATEMENT EXECUTE FUNCTION resumo_tarefas_aplicar()""",
+    "DROP TRIGGER IF EXISTS tarefas_resumo_update ON tarefas",
+    """CREATE TRIGGER tarefas_resumo_update AFTER UPDATE ON tarefas
+       REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+       FOR EACH STATEMENT EXECUTE FUNCTION resumo_tarefas_aplicar()""",
+    "DROP TRIGGER IF EXISTS tarefas_resumo_delete ON tarefas",
+    """CREATE TRIGGER tarefas_resumo_delete AFTER DELETE ON tarefas
+       REFERENCING OLD TABLE AS antigas
+       FOR EACH STATEMENT EXECUTE FUNCTION resumo_tarefas_aplicar()""",
+    "DROP TRIGGER IF EXISTS alunos_resumo_delete ON alunos",
+    """CREATE TRIGGER alunos_resumo_delete BEFORE DELETE ON alunos
+       FOR EACH ROW EXECUTE FUNCTION resumo_tarefas_mover_turma()""",
+    "DROP TRIGGER IF EXISTS alunos_resumo_turma ON alunos",
+    """CREATE TRIGGER alunos_resumo_turma AFTER UPDATE OF turma_id ON alunos
+       FOR EACH ROW EXECUTE FUNCTION resumo_tarefas_mover_turma()""",
+]
+
+
+def upgrade(conn) -> None:
+    # Triggers e tabelas de transição são específicos do PostgreSQL
+    if conn.dialect.name != "postgresql":
+        return
+
+    conn.execute(text(TABELA))
+    conn.execute(text(FUNCAO_TAREFAS))
+    conn.execute(text(FUNCAO_ALUNOS))
+    conn.execute(text(FUNCAO_RECALCULAR))
+    for comando in TRIGGERS:
+        conn.execute(text(comando))
+    # Carga inicial a partir das tarefas existentes
+    conn.execute(text("SELECT resumo_tarefas_recalcular()"))
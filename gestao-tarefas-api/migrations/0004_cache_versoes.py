@@ -0,0 +1,20 @@
+"""Versões dos dados de referência mantidos em cache pelos workers."""
+from sqlalchemy import text
+
+DESCRICAO = "tabela cache_versoes"
+
+CONJUNTOS = ["turmas", "disciplinas", "professores", "vinculos"]
+
+
+def upgrade(conn) -> None:
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS cache_versoes (
+            nome VARCHAR(50) PRIMARY KEY,
+            versao BIGINT NOT NULL DEFAULT 0
+        )
+    """))
+    for nome in CONJUNTOS:
+        conn.execute(
+            text("INSERT INTO cache_versoes (nome, versao) VALUES (:nome, 0) ON CONFLICT (nome) DO NOTHING"),
+            {"nome": nome},
+        )
@@ -0,0 +1,54 @@
+"""
+Regras ON DELETE nas FKs, para os deletes serem resolvidos pelo banco.
+
+- turma -> alunos -> tarefas e disciplina -> tarefas: CASCADE
+- professor -> tarefas: SET NULL (a tarefa do aluno continua existindo)
+- professor_disciplina: CASCADE nos dois lados
+
+As constraints novas entram como NOT VALID numa transação curta (a troca é
+atômica: nenhuma FK fica de fora) e cada VALIDATE roda depois, na sua própria
+transação. O ALTER ... NOT VALID pega ACCESS EXCLUSIVE só por um instante; o
+VALIDATE percorre a tabela com SHARE UPDATE EXCLUSIVE, que não bloqueia
+escritas.
+"""
+from sqlalchemy import text
+
+DESCRICAO = "on delete cascade/set null nas fks"
+
+# Os locks dos ALTERs não podem durar até o fim das validações
+TRANSACIONAL = False
+
+# (tabela, constraint, coluna, tabela referenciada, ação)
+FKS = [
+    ("alunos", "alunos_turma_id_fkey", "turma_id", "turmas", "CASCADE"),
+    ("tarefas", "tarefas_aluno_id_fkey", "aluno_id", "alunos", "CASCADE"),
+    ("tarefas", "tarefas_disciplina_id_fkey", "disciplina_id", "disciplinas", "CASCADE"),
+    ("tarefas", "tarefas_professor_id_fkey", "professor_id", "professores", "SET NULL"),
+    ("professor_disciplina", "professor_disciplina_professor_id_fkey", "professor_id", "professores", "CASCADE"),
+    ("professor_disciplina", "professor_disciplina_disciplina_id_fkey", "disciplina_id", "disciplinas", "CASCADE"),
+]
+
+
+def upgrade(conn) -> None:
+    # SQLite não altera constraints existentes; o create_all já cria as regras
+    if conn.dialect.name != "postgresql":
+        return
+
+    # Conexão em autocommit: a troca das constraints vai numa transação
+    # explícita, e cada VALIDATE abaixo é uma transação própria
+    conn.execute(text("BEGIN"))
+    try:
+        conn.execute(text("ALTER TABLE tarefas ALTER COLUMN professor_id DROP NOT NULL"))
+        for tabela, constraint, coluna, referenciada, acao in FKS:
+            conn.execute(text(
+                f"ALTER TABLE {tabela} DROP CONSTRAINT IF EXISTS {constraint}, "
+                f"ADD CONSTRAINT {constraint} FOREIGN KEY ({coluna}) "
+                f"REFERENCES {referenciada} (id) ON DELETE {acao} NOT VALID"
+            ))
+    except Exception:
+        conn.execute(text("ROLLBACK"))
+        raise
+    conn.execute(text("COMMIT"))
+
+    for tabela, constraint, *_ in FKS:
+        conn.execute(text(f"ALTER TABLE {tabela} VALIDATE CONSTRAINT {constraint}"))
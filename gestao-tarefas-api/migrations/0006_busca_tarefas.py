@@ -0,0 +1,34 @@
+"""
+Busca textual em tarefas: coluna tsvector gerada (titulo + descricao) e índice GIN.
+
+O título pesa mais que a descrição (pesos A e B) na ordenação por
+relevância. A coluna é calculada pelo próprio PostgreSQL a cada INSERT/UPDATE,
+então nenhuma escrita da API precisa conhecê-la.
+"""
+from sqlalchemy import text
+
+DESCRICAO = "coluna de busca textual em tarefas"
+
+# CREATE INDEX CONCURRENTLY não pode rodar dentro de uma transação
+TRANSACIONAL = False
+
+# Configuração de idioma do PostgreSQL (stemming e stopwords em português)
+CONFIG = "portuguese"
+
+COLUNA = f"""
+    ALTER TABLE tarefas ADD COLUMN IF NOT EXISTS busca tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{CONFIG}', coalesce(titulo, '')), 'A')
+        || setweight(to_tsvector('{CONFIG}', coalesce(descricao, '')), 'B')
+    ) STORED
+"""
+
+
+def upgrade(conn) -> None:
+    # tsvector e GIN são específicos do PostgreSQL
+    if conn.dialect.name != "postgresql":
+        return
+
+    # Reescreve a tabela (bloqueia escritas enquanto calcula a coluna)
+    conn.execute(text(COLUNA))
+    conn.execute(text("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tarefas_busca ON tarefas USING gin (busca)"))
@@ -0,0 +1,43 @@
+"""
+NOT NULL em status e nas colunas de data, como nos modelos.
+
+Para não reescrever nem bloquear as tabelas durante a verificação, cada
+coluna passa por: preencher nulos antigos, CHECK (col IS NOT NULL) NOT VALID,
+VALIDATE (sem bloquear escritas) e SET NOT NULL, que reaproveita o CHECK
+validado em vez de percorrer a tabela de novo sob ACCESS EXCLUSIVE.
+"""
+from sqlalchemy import text
+
+DESCRICAO = "not null em status e datas"
+
+# Cada passo é uma transação própria (locks curtos)
+TRANSACIONAL = False
+
+# (tabela, coluna, valor para linhas antigas com nulo)
+COLUNAS = [
+    ("turmas", "criada_em", "now()"),
+    ("alunos", "criado_em", "now()"),
+    ("alunos", "atualizado_em", "criado_em"),
+    ("disciplinas", "criada_em", "now()"),
+    ("professores", "criado_em", "now()"),
+    ("tarefas", "status", "'PENDENTE'"),
+    ("tarefas", "criada_em", "now()"),
+    ("tarefas", "atualizada_em", "criada_em"),
+]
+
+
+def upgrade(conn) -> None:
+    # SQLite não altera colunas existentes; o create_all já cria NOT NULL
+    if conn.dialect.name != "postgresql":
+        return
+
+    # alunos.criado_em e tarefas.criada_em são preenchidas antes das colunas
+    # que as usam como valor
+    for tabela, coluna, valor in COLUNAS:
+        check = f"{tabela}_{coluna}_not_null"
+        conn.execute(text(f"UPDATE {tabela} SET {coluna} = {valor} WHERE {coluna} IS NULL"))
+        conn.execute(text(f"ALTER TABLE {tabela} DROP CONSTRAINT IF EXISTS {check}"))
+        conn.execute(text(f"ALTER TABLE {tabela} ADD CONSTRAINT {check} CHECK ({coluna} IS NOT NULL) NOT VALID"))
+        conn.execute(text(f"ALTER TABLE {tabela} VALIDATE CONSTRAINT {check}"))
+        conn.execute(text(f"ALTER TABLE {tabela} ALTER COLUMN {coluna} SET NOT NULL"))
+        conn.execute(text(f"ALTER TABLE {tabela} DROP CONSTRAINT {check}"))
@@ -0,0 +1,46 @@
+"""
+Remove de resumo_tarefas as linhas que chegam a zero.
+
+Os upserts da migration 0003 só somam variações: uma linha cujas tarefas
+foram todas removidas (ou mudaram de status/turma) ficava com quantidade e
+pontos zerados para sempre. A tabela só crescia, e o resumo de uma entidade
+removida achava essas linhas e respondia 200 com zeros em vez de 404.
+
+Um trigger por linha em resumo_tarefas apaga a linha quando o upsert a zera;
+vale para todos os caminhos (tarefas, troca de turma, recálculo).
+"""
+from sqlalchemy import text
+
+DESCRICAO = "resumo de tarefas sem linhas zeradas"
+
+FUNCAO = """
+CREATE OR REPLACE FUNCTION resumo_tarefas_remover_zeradas() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM resumo_tarefas
+     WHERE escopo = NEW.escopo AND escopo_id = NEW.escopo_id
+       AND status = NEW.status AND tipo = NEW.tipo
+       AND quantidade = 0 AND pontos = 0;
+    RETURN NULL;
+END;
+$$
+"""
+
+TRIGGERS = [
+    "DROP TRIGGER IF EXISTS resumo_tarefas_zeradas ON resumo_tarefas",
+    # Só dispara nas linhas que o upsert deixou zeradas
+    """CREATE TRIGGER resumo_tarefas_zeradas AFTER UPDATE ON resumo_tarefas
+       FOR EACH ROW WHEN (NEW.quantidade = 0 AND NEW.pontos = 0)
+       EXECUTE FUNCTION resumo_tarefas_remover_zeradas()""",
+]
+
+
+def upgrade(conn) -> None:
+    # Triggers são específicos do PostgreSQL (o resumo também)
+    if conn.dialect.name != "postgresql":
+        return
+
+    conn.execute(text(FUNCAO))
+    for comando in TRIGGERS:
+        conn.execute(text(comando))
+    conn.execute(text("DELETE FROM resumo_tarefas WHERE quantidade = 0 AND pontos = 0"))
@@ -0,0 +1,27 @@
+"""
+Upserts do resumo de tarefas na ordem da PK.
+
+O INSERT ... SELECT ... GROUP BY ... ON CONFLICT das funções da migration
+0003 não tinha ORDER BY: dois comandos concorrentes em tarefas podiam
+travar as mesmas linhas de resumo_tarefas em ordens diferentes e um deles
+abortava por deadlock. A 0003 já gera o upsert ordenado; aqui as funções
+são recriadas nos bancos que já tinham aplicado a versão antiga.
+"""
+import importlib
+
+from sqlalchemy import text
+
+DESCRICAO = "upserts do resumo de tarefas na ordem da pk"
+
+_resumo = importlib.import_module("migrations.0003_resumo_tarefas")
+
+
+def upgrade(conn) -> None:
+    # Funções e triggers do resumo só existem no PostgreSQL
+    if conn.dialect.name != "postgresql":
+        return
+
+    # CREATE OR REPLACE: os triggers continuam apontando para as funções
+    conn.execute(text(_resumo.FUNCAO_TAREFAS))
+    conn.execute(text(_resumo.FUNCAO_ALUNOS))
+    conn.execute(text(_resumo.FUNCAO_RECALCULAR))
@@ -0,0 +1,70 @@
+"""
+Migrations versionadas do banco de dados.
+
+Cada arquivo `NNNN_descricao.py` deste pacote é uma migration. O número do
+arquivo é a versão e o módulo define:
+
+    DESCRICAO: str        - texto curto registrado em schema_migrations
+    TRANSACIONAL: bool    - False para rodar em autocommit (ex: CREATE INDEX CONCURRENTLY)
+    upgrade(conn)         - aplica a migration usando a conexão recebida
+
+As migrations devem ser idempotentes (IF NOT EXISTS), pois bancos criados
+antes deste controle já possuem parte do schema.
+"""
+import importlib
+import pkgutil
+from dataclasses import dataclass
+from types import ModuleType
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func
+
+metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    metadata,
+    Column("versao", Integer, primary_key=True),
+    Column("descricao", String(255), nullable=False),
+    Column("aplicada_em", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    versao: int
+    descricao: str
+    transacional: bool
+    modulo: ModuleType
+
+    def upgrade(self, conn) -> None:
+        self.modulo.upgrade(conn)
+
+
+def _versoes() -> dict[str, int]:
+    """Nome do módulo -> versão, para cada arquivo de migration do pacote."""
+    versoes = {}
+    for info in pkgutil.iter_modules(__path__):
+        prefixo = info.name.split("_", 1)[0]
+        if prefixo.isdigit():
+            versoes[info.name] = int(prefixo)
+    return versoes
+
+
+def versao_mais_recente() -> int:
+    """Versão da última migration, só pelos nomes dos arquivos (sem importá-los)."""
+    return max(_versoes().values(), default=0)
+
+
+def carregar_migrations() -> list[Migration]:
+    """Carrega as migrations do pacote, ordenadas pela versão."""
+    migrations = []
+    for nome, versao in _versoes().items():
+        modulo = importlib.import_module(f"{__name__}.{nome}")
+        migrations.append(Migration(
+            versao=versao,
+            descricao=modulo.DESCRICAO,
+            transacional=getattr(modulo, "TRANSACIONAL", True),
+            modulo=modulo,
+        ))
+    migrations.sort(key=lambda m: m.versao)
+    return migrations
@@ -4,7 +4,17 @@ Execute: docker compose exec api python -m app.seeds
 Ou: python -m app.seeds (se estiver com ambiente local)
 """
 
-from datetime import datetime, timedelta
+import io
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import Enum as PyEnum
+from functools import lru_cache
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from database import SessionLocal, engine
 from app.models import Base, Turma, Aluno, Disciplina, Professor, Tarefa, TipoTarefa, StatusTarefa
@@ -51,12 +61,15 @@ def criar_alunos(db: Session, turmas: list[Turma]) -> list[Aluno]:
         {"nome": "João Rodrigues", "email": "joao.rodrigues@email.com", "senha": "senha123", "turma_index": 5},
     ]
     
+    # bcrypt é lento de propósito: um hash por senha distinta, não por aluno
+    hashes = {senha: get_password_hash(senha) for senha in {data["senha"] for data in alunos_data}}
+
     alunos = []
     for data in alunos_data:
         aluno = Aluno(
             nome=data["nome"],
             email=data["email"],
-            senha_hash=get_password_hash(data["senha"]),
+            senha_hash=hashes[data["senha"]],
             turma_id=turmas[data["turma_index"]].id
         )
         db.add(aluno)
@@ -347,13 +360,294 @@ def limpar_banco(db: Session):
     print("✅ Banco limpo")
 
 
+# ============ GERADOR SINTÉTICO (testes de capacidade) ============
+
+SENHA_SINTETICA = "senha123"
+# Domínio dos e-mails sintéticos (precisa passar no EmailStr dos schemas)
+DOMINIO_SINTETICO = "bench.exemplo.com.br"
+# Linhas por job de COPY: cada job vira uma transação em um processo
+LOTE_SINTETICO = 50_000
+
+_TITULOS = [
+    "Lista de Exercícios", "Trabalho Prático", "Relatório", "Seminário",
+    "Estudo de Caso", "Projeto Integrador", "Questionário", "Resenha",
+]
+_TEMAS = [
+    "HTML e CSS", "consultas SQL", "normalização de dados", "listas encadeadas",
+    "árvores binárias", "protocolos TCP/IP", "escalonamento de processos",
+    "redes neurais", "layout responsivo", "testes automatizados",
+    "modelagem entidade-relacionamento", "APIs REST", "controle de versão com Git",
+    "algoritmos de ordenação", "segurança da informação", "computação em nuvem",
+]
+_VERBOS = [
+    "Implementar", "Desenvolver", "Analisar", "Documentar", "Modelar",
+    "Comparar", "Apresentar", "Revisar",
+]
+
+
+@dataclass(frozen=True)
+class VolumeSintetico:
+    turmas: int
+    alunos: int
+    disciplinas: int
+    professores: int
+    tarefas: int
+
+
+def _id_sintetico(semente: int, tipo: str, i: int) -> uuid.UUID:
+    """Id determinístico do i-ésimo registro: qualquer processo o recalcula sem consultar o banco."""
+    return uuid.uuid5(uuid.NAMESPACE_OID, f"gestao-tarefas:{semente}:{tipo}:{i}")
+
+
+@lru_cache(maxsize=8)
+def _ids_sinteticos(semente: int, tipo: str, quantidade: int) -> list[str]:
+    """Todos os ids de um tipo, já como texto (calculados uma vez por processo)."""
+    return [str(_id_sintetico(semente, tipo, i)) for i in range(quantidade)]
+
+
+def email_sintetico(i: int) -> str:
+    return f"aluno{i}@{DOMINIO_SINTETICO}"
+
+
+def _copy_valor(valor) -> str:
+    if valor is None:
+        return r"\N"
+    if isinstance(valor, PyEnum):
+        return valor.name
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    return str(valor).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def _gravar(conn, tabela: str, colunas: tuple[str, ...], linhas) -> None:
+    """Grava as linhas com COPY (PostgreSQL) ou INSERT de várias linhas (demais bancos)."""
+    if conn.dialect.name == "postgresql":
+        buffer = io.StringIO()
+        for linha in linhas:
+            buffer.write("\t".join(map(_copy_valor, linha)))
+            buffer.write("\n")
+        buffer.seek(0)
+        with conn.connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {tabela} ({', '.join(colunas)}) FROM STDIN", buffer)
+        return
+    conn.execute(
+        Base.metadata.tables[tabela].insert(),
+        [dict(zip(colunas, linha)) for linha in linhas],
+    )
+
+
+_COLUNAS_ALUNOS = ("id", "nome", "email", "senha_hash", "turma_id")
+_COLUNAS_TAREFAS = (
+    "id", "aluno_id", "tipo", "titulo", "descricao", "disciplina_id", "professor_id", "pontos",
+    "data_entrega", "status", "iniciada_em", "concluida_em", "criada_em", "atualizada_em",
+)
+
+
+def _linhas_alunos(volume: VolumeSintetico, semente: int, inicio: int, fim: int, senha_hash: str):
+    rng = random.Random(f"{semente}:alunos:{inicio}")
+    turmas = _ids_sinteticos(semente, "turma", volume.turmas)
+    for i in range(inicio, fim):
+        yield (
+            _id_sintetico(semente, "aluno", i),
+            f"Aluno Sintético {i}",
+            email_sintetico(i),
+            senha_hash,
+            rng.choice(turmas),
+        )
+
+
+def _linhas_tarefas(volume: VolumeSintetico, semente: int, inicio: int, fim: int, agora: datetime):
+    rng = random.Random(f"{semente}:tarefas:{inicio}")
+    status = list(StatusTarefa)
+    alunos = _ids_sinteticos(semente, "aluno", volume.alunos)
+    disciplinas = _ids_sinteticos(semente, "disciplina", volume.disciplinas)
+    professores = _ids_sinteticos(semente, "professor", volume.professores)
+    for i in range(inicio, fim):
+        criada_em = agora - timedelta(seconds=rng.randrange(365 * 86400))
+        situacao = rng.choice(status)
+        tipo = TipoTarefa.PROJETO if rng.random() < 0.3 else TipoTarefa.ATIVIDADE
+        tema = rng.choice(_TEMAS)
+        yield (
+            uuid.UUID(int=rng.getrandbits(128), version=4),
+            rng.choice(alunos),
+            tipo,
+            f"{rng.choice(_TITULOS)} {rng.randrange(1, 20):02d} - {tema}",
+            f"{rng.choice(_VERBOS)} {tema} e {rng.choice(_VERBOS).lower()} {rng.choice(_TEMAS)}",
+            rng.choice(disciplinas),
+            rng.choice(professores),
+            rng.randrange(5, 60 if tipo == TipoTarefa.PROJETO else 30),
+            criada_em + timedelta(days=rng.randrange(1, 90)),
+            situacao,
+            criada_em + timedelta(hours=rng.randrange(1, 72)) if situacao != StatusTarefa.PENDENTE else None,
+            criada_em + timedelta(days=rng.randrange(3, 30)) if situacao == StatusTarefa.CONCLUIDA else None,
+            criada_em,
+            criada_em,
+        )
+
+
+def _iniciar_processo() -> None:
+    # Conexões herdadas do processo pai (fork) não podem ser reutilizadas
+    engine.dispose(close=False)
+
+
+def _job_sintetico(tabela: str, volume: VolumeSintetico, semente: int, inicio: int, fim: int, extra) -> int:
+    """Gera e grava as linhas [inicio, fim) da tabela, numa transação própria."""
+    if tabela == "alunos":
+        colunas, linhas = _COLUNAS_ALUNOS, _linhas_alunos(volume, semente, inicio, fim, extra)
+    else:
+        colunas, linhas = _COLUNAS_TAREFAS, _linhas_tarefas(volume, semente, inicio, fim, extra)
+    with engine.begin() as conn:
+        _gravar(conn, tabela, colunas, linhas)
+    return fim - inicio
+
+
+def _em_paralelo(tabela: str, volume: VolumeSintetico, semente: int, total: int, extra, processos: int) -> None:
+    jobs = [(inicio, min(inicio + LOTE_SINTETICO, total)) for inicio in range(0, total, LOTE_SINTETICO)]
+    feitos = 0
+    inicio_relogio = time.perf_counter()
+    if processos <= 1:
+        resultados = (_job_sintetico(tabela, volume, semente, i, f, extra) for i, f in jobs)
+        for quantidade in resultados:
+            feitos += quantidade
+            print(f"   {tabela}: {feitos:,}/{total:,}", end="\r")
+    else:
+        with ProcessPoolExecutor(processos, initializer=_iniciar_processo) as executor:
+            futuros = [executor.submit(_job_sintetico, tabela, volume, semente, i, f, extra) for i, f in jobs]
+            for futuro in as_completed(futuros):
+                feitos += futuro.result()
+                print(f"   {tabela}: {feitos:,}/{total:,}", end="\r")
+    segundos = time.perf_counter() - inicio_relogio
+    print(f"✅ {total:,} {tabela} em {segundos:.1f}s ({total / max(segundos, 1e-9):,.0f}/s)")
+
+
+def gerar_sintetico(volume: VolumeSintetico, semente: int = 42, processos: int | None = None) -> None:
+    """
+    Gera uma massa de dados grande e reprodutível (mesma semente = mesmos dados).
+
+    Turmas, disciplinas e professores são poucos e vão direto; alunos e
+    tarefas são divididos em jobs de `LOTE_SINTETICO` linhas, gerados e
+    gravados com COPY em paralelo por `processos` processos. Todos os alunos
+    usam o mesmo hash de `SENHA_SINTETICA`, calculado uma vez.
+
+    No PostgreSQL o trigger de resumo de tarefas fica desligado durante a
+    carga (vários COPY simultâneos disputariam as mesmas linhas de
+    `resumo_tarefas`) e os resumos são recalculados no fim. O banco deve estar
+    vazio: use `limpar_sintetico` antes.
+    """
+    processos = processos or os.cpu_count() or 1
+    postgres = engine.dialect.name == "postgresql"
+    if not postgres:
+        # SQLite e afins não aceitam escritas paralelas
+        processos = 1
+    # Datas relativas ao dia da geração (não ao instante), para que a mesma
+    # semente gere os mesmos dados ao longo do dia
+    agora = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    rng = random.Random(semente)
+
+    with engine.begin() as conn:
+        _gravar(conn, "turmas", ("id", "nome"), [
+            (_id_sintetico(semente, "turma", i), f"Turma Sintética {i}") for i in range(volume.turmas)
+        ])
+        _gravar(conn, "disciplinas", ("id", "nome", "codigo"), [
+            (_id_sintetico(semente, "disciplina", i), f"{rng.choice(_TEMAS).capitalize()} {i}", f"S{i:05d}")
+            for i in range(volume.disciplinas)
+        ])
+        _gravar(conn, "professores", ("id", "nome", "email"), [
+            (_id_sintetico(semente, "professor", i), f"Professor Sintético {i}", f"prof{i}@{DOMINIO_SINTETICO}")
+            for i in range(volume.professores)
+        ])
+        vinculos = {
+            (_id_sintetico(semente, "professor", i), _id_sintetico(semente, "disciplina", rng.randrange(volume.disciplinas)))
+            for i in range(volume.professores)
+            for _ in range(2)
+        }
+        _gravar(conn, "professor_disciplina", ("professor_id", "disciplina_id"), sorted(vinculos))
+    print(f"✅ {volume.turmas} turmas, {volume.disciplinas} disciplinas, {volume.professores} professores")
+
+    senha_hash = get_password_hash(SENHA_SINTETICA)
+    _em_paralelo("alunos", volume, semente, volume.alunos, senha_hash, processos)
+
+    with engine.connect() as conn:
+        resumos = postgres and conn.scalar(text("SELECT to_regproc('resumo_tarefas_recalcular') IS NOT NULL"))
+    if resumos:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE tarefas DISABLE TRIGGER tarefas_resumo_insert"))
+    try:
+        _em_paralelo("tarefas", volume, semente, volume.tarefas, agora, processos)
+    finally:
+        if resumos:
+            with engine.begin() as conn:
+                conn.execute(text("ALTER TABLE tarefas ENABLE TRIGGER tarefas_resumo_insert"))
+                conn.execute(text("SELECT resumo_tarefas_recalcular()"))
+            print("✅ Resumos recalculados")
+
+    if postgres:
+        with engine.begin() as conn:
+            # Servidores já rodando descartam o cache de referência
+            conn.execute(
+                text(
+                    "INSERT INTO cache_versoes (nome, versao) VALUES (:nome, 1) "
+                    "ON CONFLICT (nome) DO UPDATE SET versao = cache_versoes.versao + 1"
+                ),
+                [{"nome": nome} for nome in ("turmas", "disciplinas", "professores", "vinculos")],
+            )
+            conn.execute(text("ANALYZE"))
+
+
+def limpar_sintetico() -> None:
+    """Esvazia as tabelas de uma vez (TRUNCATE no PostgreSQL)."""
+    print("🧹 Limpando banco de dados...")
+    if engine.dialect.name != "postgresql":
+        db = SessionLocal()
+        try:
+            limpar_banco(db)
+        finally:
+            db.close()
+        return
+    with engine.begin() as conn:
+        # TRUNCATE não dispara os triggers de DELETE: limpa os resumos junto
+        conn.execute(text(
+            "TRUNCATE tarefas, alunos, professor_disciplina, professores, disciplinas, "
+            "turmas, resumo_tarefas"
+        ))
+    print("✅ Banco limpo")
+
+
 def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="Executa seeds no banco de dados")
     parser.add_argument("--force", action="store_true", help="Ignora prompts e força recriação")
+    parser.add_argument("--sintetico", action="store_true", help="Gera uma massa grande para testes de capacidade")
+    parser.add_argument("--turmas", type=int, default=50, help="(--sintetico) Quantidade de turmas")
+    parser.add_argument("--alunos", type=int, default=2_000, help="(--sintetico) Quantidade de alunos")
+    parser.add_argument("--disciplinas", type=int, default=40, help="(--sintetico) Quantidade de disciplinas")
+    parser.add_argument("--professores", type=int, default=60, help="(--sintetico) Quantidade de professores")
+    parser.add_argument("--tarefas", type=int, default=100_000, help="(--sintetico) Quantidade de tarefas")
+    parser.add_argument("--processos", type=int, help="(--sintetico) Processos em paralelo (padrão: nº de CPUs)")
+    parser.add_argument("--semente", type=int, default=42, help="(--sintetico) Semente: mesma semente, mesmos dados")
     args = parser.parse_args()
 
+    if args.sintetico:
+        volume = VolumeSintetico(args.turmas, args.alunos, args.disciplinas, args.professores, args.tarefas)
+        print("=" * 50)
+        print("🌱 MASSA SINTÉTICA")
+        print("=" * 50)
+        with engine.connect() as conn:
+            tem_dados = conn.execute(text("SELECT 1 FROM turmas LIMIT 1")).first() is not None
+        if tem_dados and not args.force:
+            resposta = input("⚠️  Banco já contém dados! Deseja limpar e recriar? (s/N): ")
+            if resposta.lower() != 's':
+                print("❌ Operação cancelada")
+                return
+        if tem_dados:
+            limpar_sintetico()
+        inicio = time.perf_counter()
+        gerar_sintetico(volume, args.semente, args.processos)
+        print(f"\n✅ Massa sintética gerada em {time.perf_counter() - inicio:.1f}s")
+        print(f"🔑 Login: {email_sintetico(0)} ... {email_sintetico(volume.alunos - 1)} / senha: {SENHA_SINTETICA}")
+        return
+
     # Função interna que executa a lógica (para permitir chamada forçada)
     def _run(force: bool = False):
         print("=" * 50)
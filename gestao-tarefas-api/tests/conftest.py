@@ -0,0 +1,82 @@
+"""
+Fixtures dos testes: a app inteira em SQLite, no modo síncrono.
+
+As variáveis de ambiente precisam estar definidas antes do primeiro import
+de `app`/`database`, que leem as settings no import.
+"""
+import os
+import tempfile
+import uuid
+
+_BANCO = os.path.join(tempfile.mkdtemp(prefix="gestao-tarefas-"), "testes.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_BANCO}"
+os.environ["DB_ASYNC"] = "false"
+os.environ["APP_ENV"] = "development"
+# X-DB-Query-Count nas respostas, para conferir quantas queries uma rota faz
+os.environ["DB_PROFILE_HEADERS"] = "true"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.app import app
+from database import create_tables, engine
+from migrate import upgrade
+
+API = "/api/v1"
+
+
+@event.listens_for(engine, "connect")
+def _funcoes_sqlite(dbapi_conn, _registro):
+    # Rotas que geram ids no banco (INSERT ... SELECT) usam gen_random_uuid()
+    dbapi_conn.create_function("gen_random_uuid", 0, lambda: uuid.uuid4().hex)
+
+
+@pytest.fixture(scope="session")
+def client():
+    create_tables()
+    upgrade()
+    with TestClient(app) as client:
+        yield client
+
+
+def criar(client: TestClient, caminho: str, dados: dict) -> dict:
+    resposta = client.post(f"{API}/{caminho}", json=dados)
+    assert resposta.status_code == 201, resposta.text
+    return resposta.json()
+
+
+@pytest.fixture
+def aluno(client):
+    turma = criar(client, "turmas/", {"nome": "Turma de testes"})
+    return criar(client, "alunos/", {
+        "nome": "Aluno de testes",
+        "email": f"{uuid.uuid4().hex[:12]}@testes.com",
+        "password": "senha-de-testes",
+        "turma_id": turma["id"],
+    })
+
+
+@pytest.fixture
+def referencias(client):
+    """Disciplina e professor para criar tarefas."""
+    disciplina = criar(client, "disciplinas/", {"nome": "Banco de Dados"})
+    professor = criar(client, "professores/", {"nome": "Professor", "email": f"{uuid.uuid4().hex[:12]}@testes.com"})
+    return {"disciplina_id": disciplina["id"], "professor_id": professor["id"]}
+
+
+@pytest.fixture
+def nova_tarefa(client, aluno, referencias):
+    """Cria tarefas do aluno da fixture (com `criar_agora=False`, só monta o corpo)."""
+    def _nova_tarefa(titulo: str = "Lista de exercícios", criar_agora: bool = True, **extras) -> dict:
+        dados = {
+            "tipo": "ATIVIDADE",
+            "titulo": titulo,
+            "pontos": 10,
+            "data_entrega": "2026-12-01T10:00:00Z",
+            "aluno_id": aluno["id"],
+            **referencias,
+            **extras,
+        }
+        return criar(client, "tarefas/", dados) if criar_agora else dados
+    return _nova_tarefa
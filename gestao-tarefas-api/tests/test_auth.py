@@ -0,0 +1,86 @@
+"""Cache de principals: alunos resolvidos a partir do token."""
+import pytest
+
+from auth import principal_cache
+from conftest import API, criar
+
+SENHA = "senha-de-testes"
+
+
+@pytest.fixture
+def token(client, aluno):
+    resposta = client.post(f"{API}/auth/login", data={"username": aluno["email"], "password": SENHA})
+    assert resposta.status_code == 200, resposta.text
+    return {"Authorization": f"Bearer {resposta.json()['access_token']}"}
+
+
+def _me(client, token):
+    return client.get(f"{API}/auth/me", headers=token)
+
+
+def test_primeira_requisicao_vai_ao_banco_e_as_seguintes_nao(client, aluno, token):
+    antes = principal_cache.stats()
+
+    primeira = _me(client, token)
+    segunda = _me(client, token)
+
+    assert primeira.status_code == segunda.status_code == 200
+    assert primeira.json()["id"] == segunda.json()["id"] == aluno["id"]
+    assert "senha_hash" not in primeira.json()
+    assert int(primeira.headers["X-DB-Query-Count"]) == 1
+    assert int(segunda.headers["X-DB-Query-Count"]) == 0
+    depois = principal_cache.stats()
+    assert depois["misses"] - antes["misses"] == 1
+    assert depois["hits"] - antes["hits"] == 1
+
+
+def test_token_invalido(client):
+    resposta = client.get(f"{API}/auth/me", headers={"Authorization": "Bearer lixo"})
+    assert resposta.status_code == 401
+
+
+def test_alteracao_do_aluno_invalida_o_cache(client, aluno, token):
+    _me(client, token)
+
+    assert client.put(f"{API}/alunos/{aluno['id']}", json={"nome": "Nome novo"}).status_code == 200
+
+    resposta = _me(client, token)
+    assert resposta.json()["nome"] == "Nome novo"
+    assert int(resposta.headers["X-DB-Query-Count"]) == 1
+
+
+def test_troca_de_email_invalida_o_email_antigo(client, aluno, token):
+    _me(client, token)
+
+    resposta = client.put(f"{API}/alunos/{aluno['id']}", json={"email": f"novo.{aluno['email']}"})
+    assert resposta.status_code == 200, resposta.text
+
+    # O token aponta para o email antigo, que não existe mais
+    assert _me(client, token).status_code == 401
+
+
+def test_alteracao_de_outro_aluno_mantem_o_cache(client, aluno, token):
+    outro = criar(client, "alunos/", {
+        "nome": "Outro aluno", "email": f"outro.{aluno['email']}", "password": SENHA, "turma_id": aluno["turma_id"],
+    })
+    _me(client, token)
+
+    client.put(f"{API}/alunos/{outro['id']}", json={"nome": "Nome novo"})
+
+    assert int(_me(client, token).headers["X-DB-Query-Count"]) == 0
+
+
+def test_remocao_do_aluno_invalida_o_cache(client, aluno, token):
+    _me(client, token)
+
+    assert client.delete(f"{API}/alunos/{aluno['id']}").status_code == 200
+
+    assert _me(client, token).status_code == 401
+
+
+def test_remocao_da_turma_invalida_o_cache(client, aluno, token):
+    _me(client, token)
+
+    assert client.delete(f"{API}/turmas/{aluno['turma_id']}").status_code == 200
+
+    assert _me(client, token).status_code == 401
@@ -0,0 +1,115 @@
+"""Operações em lote de tarefas."""
+from uuid import UUID, uuid4
+
+from sqlalchemy import event
+
+from app.models import Tarefa
+from conftest import API
+from database import engine
+
+
+def test_criacao_em_lote_reporta_cada_item(client, nova_tarefa):
+    validas = [nova_tarefa(f"Lote {i}", criar_agora=False) for i in range(2)]
+    sem_aluno = nova_tarefa("Sem aluno", criar_agora=False, aluno_id=str(uuid4()))
+    sem_professor = nova_tarefa("Sem professor", criar_agora=False, professor_id=str(uuid4()))
+
+    resposta = client.post(f"{API}/tarefas/bulk", json=[validas[0], sem_aluno, validas[1], sem_professor])
+
+    assert resposta.status_code == 201, resposta.text
+    corpo = resposta.json()
+    assert (corpo["created"], corpo["failed"]) == (2, 2)
+    assert [item["index"] for item in corpo["results"]] == [0, 1, 2, 3]
+    assert [item["ok"] for item in corpo["results"]] == [True, False, True, False]
+    assert corpo["results"][1]["error"] == "Aluno não encontrado"
+    assert corpo["results"][3]["error"] == "Professor não encontrado"
+    assert corpo["results"][1]["tarefa"] is None
+    criadas = [corpo["results"][0]["tarefa"], corpo["results"][2]["tarefa"]]
+    assert [tarefa["titulo"] for tarefa in criadas] == ["Lote 0", "Lote 1"]
+    assert all(tarefa["status"] == "PENDENTE" for tarefa in criadas)
+
+    for tarefa in criadas:
+        assert client.get(f"{API}/tarefas/{tarefa['id']}").status_code == 200
+
+
+def test_criacao_em_lote_sem_itens_validos(client, nova_tarefa):
+    sem_disciplina = nova_tarefa(criar_agora=False, disciplina_id=str(uuid4()))
+
+    corpo = client.post(f"{API}/tarefas/bulk", json=[sem_disciplina]).json()
+
+    assert (corpo["created"], corpo["failed"]) == (0, 1)
+    assert corpo["results"] == [
+        {"index": 0, "ok": False, "tarefa": None, "error": "Disciplina não encontrada"}
+    ]
+
+
+def test_criacao_em_lote_com_referencia_removida_antes_do_insert(client, referencias, nova_tarefa):
+    validas = [nova_tarefa(f"Corrida {i}", criar_agora=False) for i in range(2)]
+    sem_aluno = nova_tarefa("Sem aluno", criar_agora=False, aluno_id=str(uuid4()))
+    disciplina_id = Tarefa.disciplina_id.type.bind_processor(engine.dialect)(UUID(referencias["disciplina_id"]))
+
+    # Outra transação remove a disciplina entre a validação das FKs e o INSERT
+    def remover_disciplina(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO tarefas"):
+            cursor.execute("DELETE FROM disciplinas WHERE id = ?", (disciplina_id,))
+
+    event.listen(engine, "before_cursor_execute", remover_disciplina)
+    try:
+        resposta = client.post(f"{API}/tarefas/bulk", json=[validas[0], sem_aluno, validas[1]])
+    finally:
+        event.remove(engine, "before_cursor_execute", remover_disciplina)
+
+    assert resposta.status_code == 409, resposta.text
+    corpo = resposta.json()
+    assert (corpo["created"], corpo["failed"]) == (0, 3)
+    assert [item["ok"] for item in corpo["results"]] == [False, False, False]
+    assert corpo["results"][1]["error"] == "Aluno não encontrado"
+    assert corpo["results"][0]["error"] == corpo["results"][2]["error"] == (
+        "Referência removida durante a criação; reenvie o lote"
+    )
+
+
+def test_criacao_em_lote_vazia(client):
+    assert client.post(f"{API}/tarefas/bulk", json=[]).status_code == 422
+
+
+def test_status_em_lote(client, aluno, nova_tarefa):
+    tarefas = [nova_tarefa(f"Tarefa {i}") for i in range(3)]
+    ids = [tarefa["id"] for tarefa in tarefas[:2]]
+
+    resposta = client.post(f"{API}/tarefas/status", json={"status": "CONCLUIDA", "ids": ids})
+
+    assert resposta.status_code == 200, resposta.text
+    assert resposta.json() == {"status": "CONCLUIDA", "updated": 2}
+    for tarefa_id in ids:
+        tarefa = client.get(f"{API}/tarefas/{tarefa_id}").json()
+        assert tarefa["status"] == "CONCLUIDA"
+        assert tarefa["concluida_em"] is not None
+    assert client.get(f"{API}/tarefas/{tarefas[2]['id']}").json()["status"] == "PENDENTE"
+
+    # Tarefas já no status de destino não são tocadas
+    repetida = client.post(f"{API}/tarefas/status", json={"status": "CONCLUIDA", "aluno_id": aluno["id"]})
+    assert repetida.json()["updated"] == 1
+
+
+def test_status_em_lote_exige_criterio(client):
+    resposta = client.post(f"{API}/tarefas/status", json={"status": "CONCLUIDA"})
+    assert resposta.status_code == 400
+    assert resposta.json()["detail"] == "Informe ids ou ao menos um filtro"
+
+
+def test_remocao_em_lote(client, aluno, nova_tarefa):
+    tarefas = [nova_tarefa(f"Tarefa {i}") for i in range(3)]
+
+    resposta = client.delete(f"{API}/tarefas/", params={"ids": [tarefas[0]["id"], tarefas[1]["id"]]})
+
+    assert resposta.status_code == 200, resposta.text
+    assert resposta.json() == {"deleted": 2}
+    assert client.get(f"{API}/tarefas/{tarefas[0]['id']}").status_code == 404
+    restantes = client.get(f"{API}/tarefas/", params={"aluno_id": aluno["id"]}).json()["items"]
+    assert [tarefa["id"] for tarefa in restantes] == [tarefas[2]["id"]]
+
+    assert client.delete(f"{API}/tarefas/", params={"aluno_id": aluno["id"]}).json() == {"deleted": 1}
+
+
+def test_remocao_em_lote_exige_criterio(client):
+    assert client.delete(f"{API}/tarefas/").status_code == 400
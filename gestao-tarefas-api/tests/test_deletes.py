@@ -0,0 +1,56 @@
+"""Remoções com dependentes tratados pelas regras ON DELETE do banco."""
+from uuid import uuid4
+
+import pytest
+
+from conftest import API
+
+
+def test_professor_removido_desvincula_as_tarefas(client, referencias, nova_tarefa):
+    tarefa = nova_tarefa()
+
+    resposta = client.delete(f"{API}/professores/{referencias['professor_id']}")
+
+    assert resposta.status_code == 200, resposta.text
+    assert client.get(f"{API}/professores/{referencias['professor_id']}").status_code == 404
+    depois = client.get(f"{API}/tarefas/{tarefa['id']}").json()
+    assert depois["professor_id"] is None
+    # atualizada_em tocada: os ETags das listagens mudam
+    assert depois["atualizada_em"] > tarefa["atualizada_em"]
+    assert depois["disciplina_id"] == referencias["disciplina_id"]
+
+
+def test_turma_removida_leva_alunos_e_tarefas(client, aluno, referencias, nova_tarefa):
+    tarefa = nova_tarefa()
+
+    resposta = client.delete(f"{API}/turmas/{aluno['turma_id']}")
+
+    assert resposta.status_code == 200, resposta.text
+    assert client.get(f"{API}/turmas/{aluno['turma_id']}").status_code == 404
+    assert client.get(f"{API}/alunos/{aluno['id']}").status_code == 404
+    assert client.get(f"{API}/tarefas/{tarefa['id']}").status_code == 404
+    # Disciplina e professor não dependem da turma
+    assert client.get(f"{API}/disciplinas/{referencias['disciplina_id']}").status_code == 200
+
+
+def test_disciplina_removida_leva_as_tarefas(client, aluno, referencias, nova_tarefa):
+    tarefa = nova_tarefa()
+
+    resposta = client.delete(f"{API}/disciplinas/{referencias['disciplina_id']}")
+
+    assert resposta.status_code == 200, resposta.text
+    assert client.get(f"{API}/disciplinas/{referencias['disciplina_id']}").status_code == 404
+    assert client.get(f"{API}/tarefas/{tarefa['id']}").status_code == 404
+    assert client.get(f"{API}/alunos/{aluno['id']}").status_code == 200
+    assert client.get(f"{API}/professores/{referencias['professor_id']}").status_code == 200
+
+
+@pytest.mark.parametrize("caminho, detalhe", [
+    ("professores", "Professor não encontrado"),
+    ("turmas", "Turma não encontrada"),
+    ("disciplinas", "Disciplina não encontrada"),
+])
+def test_id_inexistente_responde_404(client, caminho, detalhe):
+    resposta = client.delete(f"{API}/{caminho}/{uuid4()}")
+    assert resposta.status_code == 404
+    assert resposta.json()["detail"] == detalhe
@@ -0,0 +1,108 @@
+"""ETag e 304 nas leituras de tarefas, antes e depois de escritas."""
+from conftest import API
+
+
+def _etag(resposta) -> str:
+    assert resposta.status_code == 200, resposta.text
+    return resposta.headers["ETag"]
+
+
+def _condicional(client, url: str, etag: str, **params):
+    return client.get(url, params=params, headers={"If-None-Match": etag})
+
+
+def test_lista_responde_304_sem_mudancas(client, aluno, nova_tarefa):
+    nova_tarefa()
+    url = f"{API}/tarefas/"
+    etag = _etag(client.get(url, params={"aluno_id": aluno["id"]}))
+
+    resposta = _condicional(client, url, etag, aluno_id=aluno["id"])
+
+    assert resposta.status_code == 304
+    assert resposta.content == b""
+    assert resposta.headers["ETag"] == etag
+    assert "Last-Modified" not in resposta.headers
+
+
+def test_lista_muda_depois_de_criar(client, aluno, nova_tarefa):
+    nova_tarefa()
+    url = f"{API}/tarefas/"
+    etag = _etag(client.get(url, params={"aluno_id": aluno["id"]}))
+
+    nova_tarefa("Outra tarefa")
+
+    resposta = _condicional(client, url, etag, aluno_id=aluno["id"])
+    assert resposta.status_code == 200
+    assert resposta.headers["ETag"] != etag
+    assert len(resposta.json()["items"]) == 2
+
+
+def test_lista_muda_depois_de_alterar(client, aluno, nova_tarefa):
+    tarefa = nova_tarefa()
+    url = f"{API}/tarefas/"
+    etag = _etag(client.get(url, params={"aluno_id": aluno["id"]}))
+
+    assert client.put(f"{API}/tarefas/{tarefa['id']}", json={"titulo": "Título novo"}).status_code == 200
+
+    resposta = _condicional(client, url, etag, aluno_id=aluno["id"])
+    assert resposta.status_code == 200
+    assert resposta.json()["items"][0]["titulo"] == "Título novo"
+
+
+def test_lista_muda_depois_de_remover(client, aluno, nova_tarefa):
+    tarefa = nova_tarefa()
+    outra = nova_tarefa("Outra tarefa")
+    url = f"{API}/tarefas/"
+    etag = _etag(client.get(url, params={"aluno_id": aluno["id"]}))
+
+    assert client.delete(f"{API}/tarefas/{tarefa['id']}").status_code == 200
+
+    resposta = _condicional(client, url, etag, aluno_id=aluno["id"])
+    assert resposta.status_code == 200
+    assert [item["id"] for item in resposta.json()["items"]] == [outra["id"]]
+
+
+def test_lista_muda_quando_a_tarefa_sai_do_filtro(client, aluno, nova_tarefa):
+    tarefa = nova_tarefa()
+    url = f"{API}/tarefas/"
+    params = {"aluno_id": aluno["id"], "status": "PENDENTE"}
+    etag = _etag(client.get(url, params=params))
+
+    client.put(f"{API}/tarefas/{tarefa['id']}", json={"status": "CONCLUIDA"})
+
+    resposta = _condicional(client, url, etag, **params)
+    assert resposta.status_code == 200
+    assert resposta.json()["items"] == []
+
+
+def test_tarefa_responde_304_ate_ser_alterada(client, nova_tarefa):
+    tarefa = nova_tarefa()
+    url = f"{API}/tarefas/{tarefa['id']}"
+    etag = _etag(client.get(url))
+
+    assert _condicional(client, url, etag).status_code == 304
+
+    client.put(url, json={"status": "EM_ANDAMENTO"})
+    resposta = _condicional(client, url, etag)
+    assert resposta.status_code == 200
+    assert resposta.headers["ETag"] != etag
+    assert resposta.json()["status"] == "EM_ANDAMENTO"
+
+
+def test_tarefa_removida_responde_404_mesmo_com_etag(client, nova_tarefa):
+    tarefa = nova_tarefa()
+    url = f"{API}/tarefas/{tarefa['id']}"
+    etag = _etag(client.get(url))
+
+    client.delete(url)
+
+    assert _condicional(client, url, etag).status_code == 404
+
+
+def test_etag_depende_dos_campos_pedidos(client, nova_tarefa):
+    tarefa = nova_tarefa()
+    url = f"{API}/tarefas/{tarefa['id']}"
+    completo = _etag(client.get(url))
+    parcial = _etag(client.get(url, params={"fields": "id,titulo"}))
+    assert completo != parcial
+    assert _condicional(client, url, completo, fields="id,titulo").status_code == 200
@@ -0,0 +1,80 @@
+"""Paginação por cursor (keyset): tokens e limites de página."""
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.pagination import decode_cursor, decode_rank_cursor, encode_cursor, encode_rank_cursor
+from conftest import API
+
+
+def test_cursor_ida_e_volta():
+    ordenado_em = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    item_id = uuid4()
+    cursor = encode_cursor(ordenado_em, item_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (ordenado_em, item_id)
+
+
+def test_cursor_de_relevancia_ida_e_volta():
+    item_id = uuid4()
+    assert decode_rank_cursor(encode_rank_cursor(0.0759, item_id)) == (0.0759, item_id)
+
+
+@pytest.mark.parametrize("cursor", ["lixo", "", "W10", encode_rank_cursor(1.0, uuid4())])
+def test_cursor_invalido(cursor):
+    with pytest.raises(HTTPException) as erro:
+        decode_cursor(cursor)
+    assert erro.value.status_code == 400
+
+
+def test_cursor_invalido_na_rota(client):
+    resposta = client.get(f"{API}/tarefas/", params={"cursor": "lixo"})
+    assert resposta.status_code == 400
+    assert resposta.json()["detail"] == "Cursor inválido"
+
+
+def _paginas(client, params: dict) -> list[dict]:
+    paginas, cursor = [], None
+    while True:
+        resposta = client.get(f"{API}/tarefas/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert resposta.status_code == 200, resposta.text
+        paginas.append(resposta.json())
+        cursor = paginas[-1]["next_cursor"]
+        if cursor is None:
+            return paginas
+
+
+def test_paginas_cobrem_tudo_sem_repetir(client, aluno, nova_tarefa):
+    criadas = {nova_tarefa(f"Tarefa {i}")["id"] for i in range(5)}
+
+    paginas = _paginas(client, {"aluno_id": aluno["id"], "limit": 2})
+
+    assert [len(pagina["items"]) for pagina in paginas] == [2, 2, 1]
+    ids = [item["id"] for pagina in paginas for item in pagina["items"]]
+    assert len(ids) == len(set(ids))
+    assert set(ids) == criadas
+
+
+def test_ultima_pagina_cheia_nao_tem_proximo_cursor(client, aluno, nova_tarefa):
+    for i in range(4):
+        nova_tarefa(f"Tarefa {i}")
+
+    paginas = _paginas(client, {"aluno_id": aluno["id"], "limit": 2})
+
+    assert [len(pagina["items"]) for pagina in paginas] == [2, 2]
+    assert paginas[0]["next_cursor"] is not None
+    assert paginas[-1]["next_cursor"] is None
+
+
+def test_limite_maior_que_o_total(client, aluno, nova_tarefa):
+    nova_tarefa()
+    paginas = _paginas(client, {"aluno_id": aluno["id"], "limit": 1000})
+    assert len(paginas) == 1
+    assert len(paginas[0]["items"]) == 1
+
+
+def test_limite_fora_da_faixa(client):
+    assert client.get(f"{API}/tarefas/", params={"limit": 0}).status_code == 422
+    assert client.get(f"{API}/tarefas/", params={"limit": 1001}).status_code == 422
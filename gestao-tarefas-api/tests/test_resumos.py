@@ -0,0 +1,19 @@
+"""Resumos de tarefas: a tabela só é mantida pelos triggers do PostgreSQL."""
+import pytest
+
+from conftest import API
+
+
+@pytest.mark.parametrize("escopo, chave", [
+    ("alunos", "id"),
+    ("turmas", "turma_id"),
+    ("disciplinas", "disciplina_id"),
+])
+def test_sem_triggers_responde_501_em_vez_de_zeros(client, aluno, referencias, nova_tarefa, escopo, chave):
+    nova_tarefa()
+    ids = {**aluno, **referencias}
+
+    resposta = client.get(f"{API}/{escopo}/{ids[chave]}/resumo")
+
+    assert resposta.status_code == 501
+    assert resposta.json()["detail"] == "Resumos exigem PostgreSQL"
@@ -0,0 +1,65 @@
+"""Atribuição de uma tarefa a todos os alunos de uma turma (INSERT ... SELECT)."""
+from uuid import uuid4
+
+import pytest
+
+from conftest import API, criar
+
+TAREFA = {"tipo": "PROJETO", "titulo": "Projeto bimestral", "pontos": 30, "data_entrega": "2026-12-01T10:00:00Z"}
+
+
+def _novo_aluno(client, turma_id: str) -> dict:
+    return criar(client, "alunos/", {
+        "nome": "Colega de turma",
+        "email": f"{uuid4().hex[:12]}@testes.com",
+        "password": "senha-de-testes",
+        "turma_id": turma_id,
+    })
+
+
+def test_cria_uma_tarefa_para_cada_aluno(client, aluno, referencias):
+    colegas = [_novo_aluno(client, aluno["turma_id"]) for _ in range(2)]
+    outra_turma = criar(client, "turmas/", {"nome": "Outra turma"})
+    de_fora = _novo_aluno(client, outra_turma["id"])
+
+    resposta = client.post(f"{API}/turmas/{aluno['turma_id']}/tarefas", json={**TAREFA, **referencias})
+
+    assert resposta.status_code == 201, resposta.text
+    corpo = resposta.json()
+    assert corpo["turma_id"] == aluno["turma_id"]
+    assert corpo["created"] == 3
+    assert {tarefa["aluno_id"] for tarefa in corpo["tarefas"]} == {aluno["id"], *(c["id"] for c in colegas)}
+    assert len({tarefa["id"] for tarefa in corpo["tarefas"]}) == 3
+    for tarefa in corpo["tarefas"]:
+        assert tarefa["status"] == "PENDENTE"
+        assert (tarefa["titulo"], tarefa["pontos"]) == (TAREFA["titulo"], TAREFA["pontos"])
+        assert tarefa["data_entrega"].startswith("2026-12-01T10:00:00")
+        assert client.get(f"{API}/tarefas/{tarefa['id']}").status_code == 200
+    assert client.get(f"{API}/tarefas/", params={"aluno_id": de_fora["id"]}).json()["items"] == []
+
+
+def test_turma_sem_alunos(client, referencias):
+    turma = criar(client, "turmas/", {"nome": "Turma vazia"})
+
+    resposta = client.post(f"{API}/turmas/{turma['id']}/tarefas", json={**TAREFA, **referencias})
+
+    assert resposta.status_code == 201, resposta.text
+    assert resposta.json() == {"turma_id": turma["id"], "created": 0, "tarefas": []}
+
+
+def test_turma_inexistente_responde_404(client, referencias):
+    resposta = client.post(f"{API}/turmas/{uuid4()}/tarefas", json={**TAREFA, **referencias})
+    assert resposta.status_code == 404
+    assert resposta.json()["detail"] == "Turma não encontrada"
+
+
+@pytest.mark.parametrize("campo", ["disciplina_id", "professor_id"])
+def test_referencia_inexistente_responde_400(client, aluno, referencias, campo):
+    resposta = client.post(
+        f"{API}/turmas/{aluno['turma_id']}/tarefas",
+        json={**TAREFA, **referencias, campo: str(uuid4())},
+    )
+
+    assert resposta.status_code == 400
+    assert resposta.json()["detail"] == "Disciplina ou professor não encontrados"
+    assert client.get(f"{API}/tarefas/", params={"aluno_id": aluno["id"]}).json()["items"] == []
@@ -0,0 +1,92 @@
+"""PUTs com um único UPDATE ... RETURNING."""
+from uuid import uuid4
+
+import pytest
+
+from conftest import API, criar
+
+
+def _consultas(resposta) -> int:
+    return int(resposta.headers["X-DB-Query-Count"])
+
+
+def test_tarefa_atualizada_com_uma_query(client, nova_tarefa):
+    tarefa = nova_tarefa()
+
+    resposta = client.put(f"{API}/tarefas/{tarefa['id']}", json={"titulo": "Título novo", "pontos": 7})
+
+    assert resposta.status_code == 200, resposta.text
+    assert _consultas(resposta) == 1
+    atualizada = resposta.json()
+    assert (atualizada["titulo"], atualizada["pontos"]) == ("Título novo", 7)
+    assert atualizada["descricao"] == tarefa["descricao"]
+    assert atualizada["atualizada_em"] > tarefa["atualizada_em"]
+
+
+def test_datas_de_status_preenchidas_uma_vez(client, nova_tarefa):
+    tarefa = nova_tarefa()
+    url = f"{API}/tarefas/{tarefa['id']}"
+
+    iniciada = client.put(url, json={"status": "EM_ANDAMENTO"}).json()
+    assert iniciada["iniciada_em"] is not None
+    assert iniciada["concluida_em"] is None
+
+    concluida = client.put(url, json={"status": "CONCLUIDA"}).json()
+    assert concluida["concluida_em"] is not None
+
+    # Voltar e avançar de novo não sobrescreve as datas já preenchidas
+    client.put(url, json={"status": "EM_ANDAMENTO"})
+    final = client.put(url, json={"status": "CONCLUIDA"}).json()
+    assert final["iniciada_em"] == iniciada["iniciada_em"]
+    assert final["concluida_em"] == concluida["concluida_em"]
+
+
+@pytest.mark.parametrize("caminho, dados, detalhe", [
+    ("tarefas", {"titulo": "Título novo"}, "Tarefa não encontrada"),
+    ("alunos", {"nome": "Nome novo"}, "Aluno não encontrado"),
+    ("turmas", {"nome": "Nome novo"}, "Turma não encontrada"),
+    ("disciplinas", {"nome": "Nome novo"}, "Disciplina não encontrada"),
+    ("professores", {"nome": "Nome novo"}, "Professor não encontrado"),
+])
+def test_id_inexistente_responde_404(client, caminho, dados, detalhe):
+    resposta = client.put(f"{API}/{caminho}/{uuid4()}", json=dados)
+    assert resposta.status_code == 404
+    assert resposta.json()["detail"] == detalhe
+
+
+@pytest.mark.parametrize("caminho, dados", [
+    ("turmas", {"nome": "Turma"}),
+    ("disciplinas", {"nome": "Disciplina", "codigo": "D1"}),
+    ("professores", {"nome": "Professor", "email": "professor@testes.com"}),
+])
+def test_referencias_atualizadas(client, caminho, dados):
+    item = criar(client, f"{caminho}/", dados)
+
+    resposta = client.put(f"{API}/{caminho}/{item['id']}", json={"nome": "Nome novo"})
+
+    assert resposta.status_code == 200, resposta.text
+    assert resposta.json() == {**item, "nome": "Nome novo"}
+    assert client.get(f"{API}/{caminho}/{item['id']}").json()["nome"] == "Nome novo"
+
+
+def test_aluno_atualizado_sem_expor_senha(client, aluno):
+    resposta = client.put(f"{API}/alunos/{aluno['id']}", json={"nome": "Nome novo", "password": "outra-senha-123"})
+
+    assert resposta.status_code == 200, resposta.text
+    assert resposta.json()["nome"] == "Nome novo"
+    assert "senha_hash" not in resposta.json()
+    login = client.post(f"{API}/auth/login", data={"username": aluno["email"], "password": "outra-senha-123"})
+    assert login.status_code == 200
+
+
+def test_aluno_com_email_repetido_responde_400(client, aluno):
+    outro = criar(client, "alunos/", {
+        "nome": "Outro aluno",
+        "email": f"{uuid4().hex[:12]}@testes.com",
+        "password": "senha-de-testes",
+        "turma_id": aluno["turma_id"],
+    })
+
+    resposta = client.put(f"{API}/alunos/{outro['id']}", json={"email": aluno["email"]})
+
+    assert resposta.status_code == 400